@@ -0,0 +1,71 @@
+"""
+Kompakter Artikel-Datensatz für die ganze Pipeline (Parser → Deduplizierung →
+Ranking → Briefing).
+
+Parser liefern Article-Objekte statt fertiger Markdown-Zeilen; Titel und URL
+werden nie wieder per Regex aus einem String gelesen (Klammern im Titel sind
+damit kein Problem mehr). Markdown bzw. HTML entsteht erst beim Rendern.
+"""
+import html
+
+
+class Article:
+    """
+    source: Abschnitt/Newsletter (z.B. "CSIS_Freeman"), title, url wie im Newsletter,
+    canonical_url: normalisierte URL für die Deduplizierung,
+    score: Relevanz-Score des Parsers (falls berechnet), date: Datum der E-Mail (YYYY-MM-DD),
+    extras: weitere Felder einzelner Parser.
+    """
+
+    __slots__ = ("source", "title", "url", "canonical_url", "score", "date", "extras")
+
+    def __init__(self, source, title, url, canonical_url=None, score=None, date=None, extras=None):
+        self.source = source
+        self.title = title
+        self.url = url
+        self.canonical_url = canonical_url if canonical_url is not None else url
+        self.score = score
+        self.date = date
+        self.extras = extras
+
+    def __repr__(self):
+        return f"Article({self.source!r}, {self.title!r}, {self.url!r})"
+
+    def has_web_url(self):
+        return self.url.startswith(("http://", "https://"))
+
+    # --- Cache --------------------------------------------------------------
+    def to_dict(self):
+        """Für JSON-Caches; canonical_url wird beim Laden neu berechnet (Normalisierung kann sich ändern)."""
+        data = {"source": self.source, "title": self.title, "url": self.url}
+        for field in ("score", "date", "extras"):
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data, canonicalize=None):
+        url = data["url"]
+        return cls(
+            data["source"], data["title"], url,
+            canonical_url=canonicalize(url) if canonicalize else None,
+            score=data.get("score"), date=data.get("date"), extras=data.get("extras"),
+        )
+
+    # --- Rendern ------------------------------------------------------------
+    def _suffix(self):
+        if not self.extras:
+            return ""
+        # Quelle in der Themen-Ansicht, in der Artikel mehrerer Think Tanks gemischt stehen
+        suffix = f" – {self.extras['via']}" if self.extras.get("via") else ""
+        # Schon in einem früheren Briefing versendet (REPEAT_MODE = "mark")
+        return suffix + (" (Wiederholung)" if self.extras.get("repeat") else "")
+
+    def to_markdown(self):
+        title = self.title.replace("[", "\\[").replace("]", "\\]")
+        url = self.url.replace("(", "%28").replace(")", "%29")
+        return f"• [{title}]({url}){self._suffix()}"
+
+    def to_html(self):
+        return f'• <a href="{html.escape(self.url, quote=True)}">{html.escape(self.title, quote=False)}</a>{self._suffix()}'
@@ -0,0 +1,477 @@
+"""
+Benchmark für die Newsletter-Parser.
+
+Erzeugt synthetische E-Mails in allen Layouts, die thinktanks.py und
+nikkei_test.py parsen (CSIS em_text4-Tabellen, China-Power-H2, CFR-Boxen,
+PIIE-H2-Listen, nummerierte ASPI-Abschnitte, Hinrich-H3 mit Button, Chatham
+<p class="h1">, Lowy-Linklisten, Nikkei-Newsletter), und misst pro
+Parser Nachrichten/s und MB/s.
+
+Beispiele:
+    python benchmark_parsers.py
+    python benchmark_parsers.py --messages 50 --items 40 --padding-kb 200
+    python benchmark_parsers.py --parser csis --repeat 3
+    python benchmark_parsers.py --dump synthetic_corpus
+    python benchmark_parsers.py --relevance-corpus data/relevance_corpus.csv
+    python benchmark_parsers.py --batch-scoring 5000
+"""
+import argparse
+import atexit
+import csv
+import email
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+
+# Vor dem Import von thinktanks/nikkei_test: Deren Modul-Globals (Seen-Store,
+# Trend-Zähler, Tracking-Links, Matcher-Cache, ...) landen in einem temporären
+# Verzeichnis statt in thinktank_cache/, und weil das Logging hier schon
+# konfiguriert ist, legt thinktanks.py kein thinktanks.log an.
+logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+if not os.getenv("THINKTANK_CACHE_DIR"):
+    _BENCHMARK_CACHE_DIR = tempfile.mkdtemp(prefix="benchmark_cache_")
+    os.environ["THINKTANK_CACHE_DIR"] = _BENCHMARK_CACHE_DIR
+    atexit.register(shutil.rmtree, _BENCHMARK_CACHE_DIR, ignore_errors=True)
+
+import thinktanks
+import nikkei_test
+nikkei_test.setup_pipeline()
+from keyword_matcher import KeywordMatcher, MATCH_MODES
+from relevance_scoring import ScoreCache, ScoringRule
+
+# ============================================================================
+# SYNTHETISCHER KORPUS
+# ============================================================================
+
+CHINA_TITLES = [
+    "How China's Export Controls Reshape Global Semiconductor Supply Chains",
+    "Taiwan Strait Tensions and the Future of U.S.-China Military Dialogue",
+    "Xi Jinping's Third Plenum: What Beijing's Economic Reform Agenda Means",
+    "Hong Kong After the National Security Law: Business Confidence Falters",
+    "Chinese Overseas Investment in Southeast Asia Slows as Risks Mount",
+    "The Renminbi's Role in Sanctions Evasion and Trade Settlement",
+    "South China Sea Disputes: Manila and Beijing Clash Over Second Thomas Shoal",
+    "Sino-Russian Energy Deals and What They Mean for Europe",
+    "PRC Industrial Policy and the Electric Vehicle Overcapacity Debate",
+    "Shanghai Stock Exchange Reforms Draw Cautious Foreign Interest",
+]
+
+OTHER_TITLES = [
+    "Europe's Defense Spending Debate Ahead of the NATO Summit",
+    "The Federal Reserve's Next Move: Inflation, Jobs, and Rate Cuts",
+    "Climate Finance After COP: Who Pays for the Energy Transition?",
+    "India's Digital Public Infrastructure and Its Export Ambitions",
+    "Brazil's Fiscal Framework Under Pressure From Commodity Prices",
+    "What the Sahel Coups Mean for Counterterrorism in West Africa",
+    "Mexico's Nearshoring Boom Meets Infrastructure Bottlenecks",
+    "The Gulf States' Sovereign Wealth Funds Go Global",
+]
+
+FILLER_SENTENCE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt. "
+
+def pick_titles(rng, count, china_share):
+    """Mischt China-relevante und sonstige Titel; Nummer im Titel verhindert Duplikate."""
+    titles = []
+    for i in range(count):
+        pool = CHINA_TITLES if rng.random() < china_share else OTHER_TITLES
+        titles.append(f"{rng.choice(pool)} (Part {i + 1})")
+    return titles
+
+def slug(title):
+    return "-".join(title.lower().replace("'", "").replace(":", "").replace("(", "").replace(")", "").split())[:80]
+
+def filler(padding_kb):
+    """Fließtext-Absätze, um die Mail auf die gewünschte Größe zu bringen."""
+    if padding_kb <= 0:
+        return ""
+    paragraph = f"<p>{FILLER_SENTENCE * 10}</p>\n"
+    return paragraph * max(1, (padding_kb * 1024) // len(paragraph))
+
+def wrap_table_html(rows, padding_kb):
+    return (
+        "<html><head><meta charset=\"utf-8\"></head><body>"
+        "<table width=\"600\" cellpadding=\"0\" cellspacing=\"0\">"
+        f"{''.join(rows)}</table>{filler(padding_kb)}"
+        "<p><a href=\"https://example.org/unsubscribe\">Unsubscribe</a> | "
+        "<a href=\"https://example.org/preferences\">Manage preferences</a></p>"
+        "</body></html>"
+    )
+
+def layout_csis(titles, rng, padding_kb, cta="Read More Here", section="analysis"):
+    """CSIS: Titel in td.em_text4, CTA-Button einige Zellen weiter."""
+    rows = []
+    for title in titles:
+        rows.append(
+            f"<tr><td class=\"em_text4\" style=\"font-size:22px;\">{title}</td></tr>"
+            f"<tr><td class=\"em_text1\">{FILLER_SENTENCE}</td></tr>"
+            f"<tr><td height=\"10\"></td></tr>"
+            f"<tr><td align=\"left\"><table><tr><td class=\"em_btn\">"
+            f"<a href=\"https://www.csis.org/{section}/{slug(title)}\">{cta}</a>"
+            f"</td></tr></table></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_csis_podcast(titles, rng, padding_kb):
+    """CSIS-Podcasts (Geopolitics, Pekingology): CTA "Listen on CSIS.org"."""
+    return layout_csis(titles, rng, padding_kb, cta="Listen on CSIS.org", section="podcasts")
+
+def layout_csis_title_links(titles, rng, padding_kb):
+    """CSIS Trustee Chair: der Titel selbst ist der Link, daneben ein "Read here"-Button."""
+    rows = []
+    for title in titles:
+        url = f"https://www.csis.org/analysis/{slug(title)}"
+        rows.append(
+            f"<tr><td class=\"em_text4\"><a href=\"{url}\">{title}</a></td></tr>"
+            f"<tr><td class=\"em_text1\">{FILLER_SENTENCE}</td></tr>"
+            f"<tr><td class=\"em_btn\"><a href=\"{url}\">Read here</a></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_chinapower(titles, rng, padding_kb):
+    """CSIS China Power: Titel als <h2>, danach Teaser und "Read here"/"Listen here"-Link."""
+    rows = []
+    for title in titles:
+        cta = rng.choice(("Read here", "Listen here"))
+        rows.append(
+            f"<tr><td><h2>{title}</h2>"
+            f"<p>{FILLER_SENTENCE}</p>"
+            f"<p><a href=\"https://chinapower.csis.org/{slug(title)}\">{cta}</a></p></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_cfr(titles, rng, padding_kb):
+    """CFR: Artikel in grauen Boxen (td mit border: 1px solid #969da7)."""
+    rows = []
+    for title in titles:
+        rows.append(
+            f"<tr><td style=\"border: 1px solid #969da7; padding: 12px;\">"
+            f"<a href=\"https://www.cfr.org/article/{slug(title)}\"><img src=\"https://www.cfr.org/img.jpg\" alt=\"\"></a>"
+            f"<a href=\"https://www.cfr.org/photo\">Getty Images/AFP</a>"
+            f"<a href=\"https://www.cfr.org/article/{slug(title)}\">{title}</a>"
+            f"<p>{FILLER_SENTENCE}</p></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_h2_list(titles, rng, padding_kb, domain="www.piie.com"):
+    """PIIE/Brookings: Artikel als verlinkte H2-Überschriften."""
+    rows = ["<tr><td><h2>Recent publications</h2></td></tr>"]
+    for title in titles:
+        rows.append(
+            f"<tr><td><h2><a href=\"https://{domain}/publications/{slug(title)}\">{title}</a></h2>"
+            f"<p>{FILLER_SENTENCE}</p></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_aspi_china5(titles, rng, padding_kb):
+    """ASPI China 5: nummerierte <h2>-Abschnitte ("1. Titel"), Link im Titel oder als "For more"."""
+    rows = []
+    for i, title in enumerate(titles, 1):
+        url = f"https://www.aspistrategist.org.au/{slug(title)}"
+        if i % 2:
+            rows.append(f"<tr><td><h2><a href=\"{url}\">{i}. {title}</a></h2><p>{FILLER_SENTENCE}</p></td></tr>")
+        else:
+            rows.append(f"<tr><td><h2>{i}. {title}</h2><p>{FILLER_SENTENCE}</p>"
+                        f"<p>For more: <a href=\"{url}\">ASPI Strategist</a></p></td></tr>")
+    return wrap_table_html(rows, padding_kb)
+
+def layout_hinrich(titles, rng, padding_kb):
+    """Hinrich Foundation: Titel als <h3>, Beschreibung, dann "READ MORE"-Button."""
+    rows = []
+    for title in titles:
+        rows.append(
+            f"<tr><td><h3>{title}</h3><p>{FILLER_SENTENCE}</p>"
+            f"<a href=\"https://www.hinrichfoundation.com/research/article/{slug(title)}\">READ MORE</a></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_chatham(titles, rng, padding_kb):
+    """Chatham House: Titel als <p class="h1">, danach "Read the expert comment"."""
+    rows = []
+    for title in titles:
+        rows.append(
+            f"<tr><td><p class=\"h1\">{title}</p></td></tr>"
+            f"<tr><td><p>{FILLER_SENTENCE}</p></td></tr>"
+            f"<tr><td><a href=\"https://www.chathamhouse.org/2025/01/{slug(title)}\">Read the expert comment</a></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_links(titles, rng, padding_kb, domain="www.lowyinstitute.org/the-interpreter"):
+    """Lowy/MERICS/CREA: einfache Linkliste mit Autorenzeilen."""
+    rows = []
+    for title in titles:
+        rows.append(
+            f"<tr><td><a href=\"https://{domain}/{slug(title)}\">{title}</a></td></tr>"
+            f"<tr><td><a href=\"https://{domain}/author/jane-doe\">Jane Doe</a></td></tr>"
+        )
+    return wrap_table_html(rows, padding_kb)
+
+def layout_nikkei(titles, rng, padding_kb):
+    """Nikkei Asia: Artikel-Links über den Newsletter-Tracker, dazu Read-more/Abo-Links."""
+    rows = []
+    for i, title in enumerate(titles):
+        rows.append(
+            f"<tr><td><a href=\"https://namail.nikkei.com/c/{i}/{slug(title)}\">{title}</a></td></tr>"
+            f"<tr><td><a href=\"https://namail.nikkei.com/c/{i}/more\">Read more</a></td></tr>"
+        )
+    rows.append("<tr><td><a href=\"https://asia.nikkei.com/subscribe\">Subscribe to Nikkei Asia</a></td></tr>")
+    return wrap_table_html(rows, padding_kb)
+
+# Parser -> (Layout, Absender). Die URLs sind direkte Links, damit kein
+# Tracking-Resolver Netzwerkzugriffe auslöst.
+PARSER_LAYOUTS = {
+    "parse_merics_email": (lambda t, r, p: layout_links(t, r, p, "merics.org/en/report"), "newsletter@merics.de"),
+    "parse_csis_geopolitics_email": (layout_csis_podcast, "geopolitics@csis.org"),
+    "parse_csis_freeman_email": (layout_csis_podcast, "freemanchair@csis.org"),
+    "parse_csis_trustee_email": (layout_csis_title_links, "trusteechair@csis.org"),
+    "parse_csis_japan_email": (layout_csis, "japanchair@csis.org"),
+    "parse_chinapower_email": (layout_chinapower, "chinapower@csis.org"),
+    "parse_korea_chair_email": (layout_csis, "koreachair@csis.org"),
+    "parse_ghpc_email": (layout_csis, "ghpc@csis.org"),
+    "parse_aerospace_email": (layout_csis, "aerospace@csis.org"),
+    "parse_brookings_email": (lambda t, r, p: layout_h2_list(t, r, p, "www.brookings.edu"), "brookings@info.brookings.edu"),
+    "parse_piie_email": (layout_h2_list, "insider@piie.com"),
+    "parse_cfr_daily_brief": (layout_cfr, "dailybrief@cfr.org"),
+    "parse_cfr_eyes_on_asia": (layout_cfr, "eyesonasia@cfr.org"),
+    "parse_aspi_china5": (layout_aspi_china5, "china5@aspi.org.au"),
+    "parse_chatham_house": (layout_chatham, "ch@email-chathamhouse.org"),
+    "parse_lowy_interpreter": (layout_links, "interpreter@lowyinstitute.org"),
+    "parse_hinrich_foundation": (layout_hinrich, "info@hinrichfoundation.com"),
+    "parse_crea_energy": (lambda t, r, p: layout_links(t, r, p, "energyandcleanair.org/china"), "info@energyandcleanair.org"),
+    "nikkei_newsletter": (layout_nikkei, "nikkeiasia-d-nl@namail.nikkei.com"),
+}
+
+def build_message(html, sender, subject):
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["Subject"] = subject
+    msg["Date"] = formatdate(localtime=True)
+    msg["Message-ID"] = make_msgid(domain="benchmark.local")
+    msg.set_content("Bitte HTML-Ansicht verwenden.")
+    msg.add_alternative(html, subtype="html")
+    return msg.as_bytes()
+
+def generate_corpus(name, messages, items, padding_kb, china_share, seed):
+    """Erzeugt `messages` Roh-E-Mails (bytes) im Layout des angegebenen Parsers."""
+    layout, sender = PARSER_LAYOUTS[name]
+    rng = random.Random(f"{seed}-{name}")
+    corpus = []
+    for i in range(messages):
+        titles = pick_titles(rng, items, china_share)
+        corpus.append(build_message(layout(titles, rng, padding_kb), sender, f"Newsletter #{i + 1}: {titles[0]}"))
+    return corpus
+
+def dump_corpus(directory, name, corpus):
+    os.makedirs(directory, exist_ok=True)
+    for i, raw in enumerate(corpus):
+        with open(os.path.join(directory, f"{name}_{i:03d}.eml"), "wb") as f:
+            f.write(raw)
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def nikkei_newsletter(msg):
+    """Nikkei-Pfad ohne URL-Auflösung: HTML-Teil dekodieren und Link-Kandidaten extrahieren."""
+    candidates = []
+    for part in msg.walk():
+        if part.get_content_type() == "text/html":
+            charset = part.get_content_charset() or "utf-8"
+            html_content = part.get_payload(decode=True).decode(charset, errors="replace")
+            candidates.extend(nikkei_test.extract_newsletter_links(html_content))
+    return candidates
+
+def get_parser(name):
+    """Parser ohne Parser-Cache (sonst misst man nur Cache-Treffer)."""
+    if name == "nikkei_newsletter":
+        return nikkei_newsletter
+    parser = getattr(thinktanks, name)
+    return getattr(parser, "__wrapped__", parser)
+
+def run_benchmark(name, corpus, repeat):
+    parser = get_parser(name)
+    total_bytes = sum(len(raw) for raw in corpus) * repeat
+    elapsed = 0.0
+    found = 0
+    for _ in range(repeat):
+        for raw in corpus:
+            # Frisches Message-Objekt pro Lauf, damit der Dekodier-Cache nicht mitgemessen wird
+            msg = email.message_from_bytes(raw)
+            start = time.perf_counter()
+            found += len(parser(msg))
+            elapsed += time.perf_counter() - start
+    count = len(corpus) * repeat
+    if not found:
+        # Dann misst der Lauf nur den frühen Abbruch des Parsers, nicht das Extrahieren
+        logging.warning(f"{name}: 0 Artikel extrahiert – Layout passt nicht zum Parser (oder --china-share zu klein)")
+    return {
+        "parser": name,
+        "messages": count,
+        "mb": total_bytes / (1024 * 1024),
+        "seconds": elapsed,
+        "msgs_per_sec": count / elapsed if elapsed else 0.0,
+        "mb_per_sec": total_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+        "articles": found / repeat,
+    }
+
+def print_report(results):
+    header = f"{'Parser':<32} {'Mails':>6} {'MB':>8} {'Sek.':>8} {'Mails/s':>9} {'MB/s':>8} {'Artikel':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['parser']:<32} {r['messages']:>6} {r['mb']:>8.2f} {r['seconds']:>8.3f} "
+              f"{r['msgs_per_sec']:>9.1f} {r['mb_per_sec']:>8.2f} {r['articles']:>8.0f}")
+
+# ============================================================================
+# BATCH-SCORING (Einzelaufrufe vs. score_batch)
+# ============================================================================
+
+BATCH_RULES = {
+    "CSIS_SCORING": thinktanks.CSIS_SCORING,
+    "THINKTANK_SCORING": thinktanks.THINKTANK_SCORING,
+    "NIKKEI_SCORING": nikkei_test.NIKKEI_SCORING,
+    "CHINA_UP_CLOSE_SCORING": nikkei_test.CHINA_UP_CLOSE_SCORING,
+}
+
+def run_batch_scoring(count, china_share, seed):
+    """Bewertet `count` synthetische Titel einzeln und per score_batch und vergleicht Zeit + Ergebnis."""
+    titles = pick_titles(random.Random(seed), count, china_share)
+    print(f"Batch-Scoring: {count} Titel")
+    print(f"{'Regel':<26} {'einzeln s':>10} {'batch s':>9} {'Faktor':>7} {'Cache s':>8}  Ergebnis")
+    for name, rule in BATCH_RULES.items():
+        disk_cache = rule.cache
+        rule.cache = None  # ohne Score-Cache messen
+        rule.score_batch(titles[:1])  # Gewichtsvektoren aufbauen
+        start = time.perf_counter()
+        single = [rule.score(title) for title in titles]
+        single_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = rule.score_batch(titles)
+        batch_seconds = time.perf_counter() - start
+        factor = single_seconds / batch_seconds if batch_seconds else 0.0
+        # Zweiter Tag mit denselben Titeln: alles aus einem (frischen, nicht gespeicherten) Score-Cache
+        rule.cache = ScoreCache()
+        rule.score_batch(titles)
+        start = time.perf_counter()
+        cached = rule.score_batch(titles)
+        cached_seconds = time.perf_counter() - start
+        rule.cache = disk_cache
+        print(f"{name:<26} {single_seconds:>10.3f} {batch_seconds:>9.3f} {factor:>7.2f} {cached_seconds:>8.3f}  "
+              f"{'gleich' if single == batch == cached else 'ABWEICHUNG'}")
+
+# ============================================================================
+# RELEVANZ-REGRESSION (Substring- vs. Token-Modus)
+# ============================================================================
+
+# Scorer (Funktion oder ScoringRule im Modul) -> (Modul, Matcher-Attribut, Keyword-Kategorien)
+RELEVANCE_SCORERS = {
+    "score_csis_article": (thinktanks, "THINKTANK_MATCHER", thinktanks.THINKTANK_MATCHER.categories),
+    "THINKTANK_SCORING": (thinktanks, "THINKTANK_MATCHER", thinktanks.THINKTANK_MATCHER.categories),
+    "score_nikkei_article": (nikkei_test, "NIKKEI_MATCHER", nikkei_test.NIKKEI_MATCHER.categories),
+    "score_china_up_close_article": (nikkei_test, "NIKKEI_MATCHER", nikkei_test.NIKKEI_MATCHER.categories),
+}
+
+def score_corpus(rows, mode, repeat):
+    """Bewertet alle Zeilen mit Matchern im angegebenen Modus; Rückgabe (Ergebnisse, Sekunden)."""
+    originals = {}
+    replacements = {}
+    for module, attr, keywords in RELEVANCE_SCORERS.values():
+        if (module, attr) not in originals:
+            originals[(module, attr)] = getattr(module, attr)
+            replacements[id(originals[(module, attr)])] = KeywordMatcher(keywords, mode=mode)
+            setattr(module, attr, replacements[id(originals[(module, attr)])])
+    # Die Score-Regeln halten eine eigene Referenz auf ihren Matcher
+    # (und ihren Score-Cache – der würde die Wiederholungen verfälschen)
+    rule_matchers = {name: rule.matcher for name, rule in BATCH_RULES.items()}
+    rule_caches = {name: rule.cache for name, rule in BATCH_RULES.items()}
+    for rule in BATCH_RULES.values():
+        rule.matcher = replacements.get(id(rule.matcher), rule.matcher)
+        rule.cache = None
+    try:
+        calls = [(getattr(RELEVANCE_SCORERS[row["scorer"]][0], row["scorer"]), row) for row in rows]
+        calls = [(scorer.score if isinstance(scorer, ScoringRule) else scorer, row) for scorer, row in calls]
+        results = []
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = [
+                scorer(row["title"], row["description"]) if row["description"] else scorer(row["title"])
+                for scorer, row in calls
+            ]
+        return results, time.perf_counter() - start
+    finally:
+        for (module, attr), matcher in originals.items():
+            setattr(module, attr, matcher)
+        for name, matcher in rule_matchers.items():
+            BATCH_RULES[name].matcher = matcher
+            BATCH_RULES[name].cache = rule_caches[name]
+
+def run_relevance_corpus(path, repeat):
+    """Vergleicht beide Match-Modi auf dem Regressionskorpus: geänderte Scores + Laufzeit."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [row for row in csv.DictReader(f) if row["scorer"] in RELEVANCE_SCORERS]
+
+    outcomes = {mode: score_corpus(rows, mode, repeat) for mode in MATCH_MODES}
+    old_results, old_seconds = outcomes["substring"]
+    new_results, new_seconds = outcomes["token"]
+
+    score_of = lambda result: result[0] if isinstance(result, tuple) else result
+    # Spalte token_score: erwarteter Score im Token-Modus – Änderungen gegenüber
+    # dem Substring-Modus, die ihm entsprechen, sind beabsichtigt
+    expected = lambda row: int(row["token_score"]) if row.get("token_score") else None
+    changed = [(row, old, new) for row, old, new in zip(rows, old_results, new_results) if old != new]
+    unexpected = [(row, new) for row, new in zip(rows, new_results) if expected(row) not in (None, score_of(new))]
+    print(f"{'Scorer':<30} {'substring':>9} {'token':>6}  Titel")
+    print("-" * 100)
+    for row, old, new in changed:
+        note = f"  ({row['note']})" if row.get("note") else ""
+        print(f"{row['scorer']:<30} {score_of(old):>9} {score_of(new):>6}  {row['title'][:50]}{note}")
+    print("-" * 100)
+    intended = sum(1 for row, _, new in changed if expected(row) == score_of(new))
+    print(f"{len(changed)} von {len(rows)} Bewertungen geändert, davon {intended} laut token_score beabsichtigt")
+    for row, new in unexpected:
+        print(f"ABWEICHUNG {row['scorer']}: {row['title'][:50]} – erwartet {expected(row)}, Token-Modus {score_of(new)}")
+    calls = len(rows) * repeat
+    for mode, seconds in (("substring", old_seconds), ("token", new_seconds)):
+        print(f"{mode:<10} {seconds:.3f} s für {calls} Aufrufe ({calls / seconds if seconds else 0:,.0f}/s)")
+    if new_seconds:
+        print(f"Faktor substring/token: {old_seconds / new_seconds:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Durchsatz-Benchmark für die Newsletter-Parser")
+    parser.add_argument("--messages", type=int, default=20, help="E-Mails pro Parser (Standard: 20)")
+    parser.add_argument("--items", type=int, default=15, help="Artikel pro E-Mail (Standard: 15)")
+    parser.add_argument("--padding-kb", type=int, default=30, help="Zusätzlicher Fließtext pro E-Mail in KB (Standard: 30)")
+    parser.add_argument("--china-share", type=float, default=0.5, help="Anteil China-relevanter Titel (Standard: 0.5)")
+    parser.add_argument("--repeat", type=int, default=1, help="Wiederholungen pro Korpus (Standard: 1)")
+    parser.add_argument("--parser", action="append", help="Nur Parser, deren Name diesen Text enthält (mehrfach möglich)")
+    parser.add_argument("--seed", type=int, default=42, help="Zufalls-Seed für reproduzierbare Korpora")
+    parser.add_argument("--dump", metavar="DIR", help="Korpus zusätzlich als .eml-Dateien schreiben")
+    parser.add_argument("--relevance-corpus", metavar="CSV", help="Relevanz-Regressionskorpus: Substring- vs. Token-Scoring vergleichen")
+    parser.add_argument("--batch-scoring", type=int, metavar="N", help="N synthetische Titel einzeln vs. per score_batch bewerten")
+    args = parser.parse_args()
+
+    # Parser-Logging würde die Messung dominieren
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.relevance_corpus:
+        run_relevance_corpus(args.relevance_corpus, max(args.repeat, 200))
+        return
+    if args.batch_scoring:
+        run_batch_scoring(args.batch_scoring, args.china_share, args.seed)
+        return
+
+    names = [n for n in PARSER_LAYOUTS if not args.parser or any(f in n for f in args.parser)]
+    results = []
+    for name in names:
+        corpus = generate_corpus(name, args.messages, args.items, args.padding_kb, args.china_share, args.seed)
+        if args.dump:
+            dump_corpus(args.dump, name, corpus)
+        results.append(run_benchmark(name, corpus, args.repeat))
+    print_report(results)
+
+if __name__ == "__main__":
+    main()
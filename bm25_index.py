@@ -0,0 +1,229 @@
+"""
+Inkrementeller BM25-Index über alle jemals extrahierten Artikel.
+
+Der Index speichert nur die Statistiken, die BM25 braucht: Dokumenthäufigkeit
+pro Term, Anzahl und Gesamtlänge der Dokumente sowie die IDs der bereits
+indexierten Dokumente. Jeder Lauf fügt nur neue Dokumente hinzu; bewertet
+werden ausschließlich die Kandidaten des Tages gegen ein Query-Profil
+(gewichtete Terme aus Lexikon-Kategorien) – die Kosten pro Kandidat hängen
+also nicht von der Größe der Historie ab.
+
+Die Statistik liegt pro Tag der Aufnahme in der Datei (Dokument-IDs, Länge,
+Dokumenthäufigkeiten); nach BM25_INDEX_DAYS Tagen fällt ein Tag samt seinen
+IDs und Termen heraus, wie bei den anderen Caches.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+
+from keyword_matcher import tokenize
+
+logger = logging.getLogger(__name__)
+
+BM25_INDEX_FORMAT = 3  # erhöhen, wenn sich terms() oder das Dateiformat ändert
+BM25_INDEX_DAYS = 90   # so lange zählt ein Dokument in die Statistik (IDF über ein Quartal)
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Funktionswörter aus Phrasen ("in depth") sind keine Query-Terme
+QUERY_STOPWORDS = {"a", "an", "and", "at", "for", "in", "of", "on", "the", "to"}
+
+
+def terms(text):
+    """Terme eines Textes in Reihenfolge (Tokens wie im Matcher, Plural-s abgetrennt)."""
+    tokens, _ = tokenize(text)
+    return [
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in tokens
+    ]
+
+
+def document_id(text):
+    """Stabile ID eines Dokuments: Hash über die normalisierten Terme."""
+    return hashlib.sha1(" ".join(terms(text)).encode("utf-8")).hexdigest()[:16]
+
+
+class QueryProfile:
+    """
+    Gewichtete Query-Terme aus Lexikon-Kategorien, z.B. {"cuc_china": 1.0, "cuc_important": 0.5}.
+    Phrasen ("south china sea") tragen jeden ihrer Terme bei; kommt ein Term in
+    mehreren Kategorien vor, zählt das höchste Gewicht (Funktionswörter zählen
+    nicht). Wird das Lexikon neu geladen, werden die Terme beim nächsten
+    Zugriff neu aufgebaut.
+    """
+
+    def __init__(self, matcher, weights):
+        self.matcher = matcher
+        self.weights = dict(weights)
+        self._terms = None
+        self._terms_version = None
+
+    @property
+    def terms(self):
+        if self._terms is not None and self._terms_version == self.matcher.version:
+            return self._terms
+        query = {}
+        for category, weight in self.weights.items():
+            for keyword in self.matcher.categories.get(category, ()):
+                for term in terms(keyword.rstrip("-")):
+                    if term in QUERY_STOPWORDS:
+                        continue
+                    query[term] = max(query.get(term, 0), weight)
+        self._terms = query
+        self._terms_version = self.matcher.version
+        return self._terms
+
+
+class BM25Index:
+    """
+    BM25-Statistik als JSON-Datei: {"days": {Tag: {"doc_ids", "length", "df"}}}.
+
+    add_documents() nimmt nur noch nicht indexierte Dokumente auf, score()
+    bewertet einen Text gegen ein QueryProfile. doc_ids ordnet jede ID ihrem
+    Tag zu; Gesamtwerte (doc_count, total_length, df) entstehen beim Laden als
+    Summe über die Tage im Zeitfenster. save() schreibt nur, wenn sich etwas
+    geändert hat.
+    """
+
+    def __init__(self, path=None, k1=BM25_K1, b=BM25_B, days=BM25_INDEX_DAYS):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.days = days
+        self.doc_count = 0
+        self.total_length = 0
+        self.df = {}
+        self.doc_ids = {}   # ID → Tag der Aufnahme
+        self.buckets = {}   # Tag → {"doc_ids": [...], "length": n, "df": {Term: n}}
+        self._dirty = False
+        self.load()
+
+    def cutoff(self):
+        return (datetime.now() - timedelta(days=self.days)).strftime("%Y-%m-%d")
+
+    # --- Datei --------------------------------------------------------------
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"BM25-Index unlesbar, starte leer: {str(e)}")
+            return
+        if data.get("format") != BM25_INDEX_FORMAT:
+            logger.info("BM25-Index hat altes Format, starte leer")
+            return
+        for day, bucket in data.get("days", {}).items():
+            self._add_bucket(day, bucket)
+        self.expire()
+
+    def _add_bucket(self, day, bucket):
+        self.buckets[day] = bucket
+        for doc_id in bucket["doc_ids"]:
+            self.doc_ids[doc_id] = day
+        self.doc_count += len(bucket["doc_ids"])
+        self.total_length += bucket["length"]
+        for term, count in bucket["df"].items():
+            self.df[term] = self.df.get(term, 0) + count
+
+    def expire(self):
+        """Nimmt Tage vor dem Zeitfenster samt IDs und Termen aus der Statistik. Rückgabe: entfernte Dokumente."""
+        cutoff = self.cutoff()
+        removed = 0
+        for day in [day for day in self.buckets if day < cutoff]:
+            bucket = self.buckets.pop(day)
+            for doc_id in bucket["doc_ids"]:
+                del self.doc_ids[doc_id]
+            self.doc_count -= len(bucket["doc_ids"])
+            self.total_length -= bucket["length"]
+            for term, count in bucket["df"].items():
+                remaining = self.df[term] - count
+                if remaining > 0:
+                    self.df[term] = remaining
+                else:
+                    del self.df[term]
+            removed += len(bucket["doc_ids"])
+        if removed:
+            self._dirty = True
+            logger.info(f"BM25-Index: {removed} Dokumente älter als {self.days} Tage entfernt")
+        return removed
+
+    def save(self):
+        self.expire()
+        if not self.path or not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format": BM25_INDEX_FORMAT,
+                    "days": {
+                        day: {"doc_ids": sorted(bucket["doc_ids"]), "length": bucket["length"], "df": bucket["df"]}
+                        for day, bucket in sorted(self.buckets.items())
+                    },
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            logger.info(f"BM25-Index gespeichert: {self.doc_count} Dokumente, {len(self.df)} Terme")
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern des BM25-Index: {str(e)}")
+
+    # --- Index --------------------------------------------------------------
+    def add_documents(self, texts, day=None):
+        """Nimmt neue Dokumente auf (bereits bekannte werden übersprungen). Rückgabe: Anzahl neuer Dokumente."""
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        bucket = None
+        added = 0
+        for text in texts:
+            doc_terms = terms(text)
+            if not doc_terms:
+                continue
+            doc_id = document_id(text)
+            if doc_id in self.doc_ids:
+                continue
+            if bucket is None:
+                bucket = self.buckets.setdefault(day, {"doc_ids": [], "length": 0, "df": {}})
+            self.doc_ids[doc_id] = day
+            bucket["doc_ids"].append(doc_id)
+            self.doc_count += 1
+            self.total_length += len(doc_terms)
+            bucket["length"] += len(doc_terms)
+            for term in set(doc_terms):
+                self.df[term] = self.df.get(term, 0) + 1
+                bucket["df"][term] = bucket["df"].get(term, 0) + 1
+            added += 1
+        if added:
+            self._dirty = True
+        return added
+
+    def idf(self, term):
+        # Nicht-negative IDF-Variante (Lucene): seltene Terme zählen mehr, häufige nie negativ
+        df = self.df.get(term, 0)
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def score(self, text, profile):
+        """BM25-Score eines Textes gegen ein QueryProfile."""
+        doc_terms = terms(text)
+        if not doc_terms:
+            return 0.0
+        query = profile.terms
+        avg_length = self.total_length / self.doc_count if self.doc_count else len(doc_terms)
+        norm = self.k1 * (1 - self.b + self.b * len(doc_terms) / avg_length)
+        tf = {}
+        for term in doc_terms:
+            if term in query:
+                tf[term] = tf.get(term, 0) + 1
+        return sum(
+            query[term] * self.idf(term) * count * (self.k1 + 1) / (count + norm)
+            for term, count in tf.items()
+        )
+
+    def score_batch(self, texts, profile):
+        """Scores für alle Texte (gleiche Reihenfolge)."""
+        return [self.score(text, profile) for text in texts]
@@ -0,0 +1,128 @@
+"""
+Fingerabdrücke von Newsletter-Bodies: doppelt zugestellte Ausgaben erkennen.
+
+Newsletter kommen gelegentlich mehrfach an (erneuter Versand, Listen-Dubletten,
+dieselbe Ausgabe über mehrere Absender in email_senders) – jede Kopie mit
+eigener Message-ID, der Parser-Cache greift also nicht. Der Fingerabdruck ist
+ein Hash über die Struktur des dekodierten HTML statt über die Bytes: sichtbarer
+Text (Leerraum zusammengefasst, E-Mail-Adressen entfernt) plus die kanonischen
+Link-Ziele. Empfängerspezifische Tracking-Links zählen nur als Platzhalter,
+Kopf-/Transfer-Encoding und Markup-Details gar nicht.
+
+BodyFingerprints merkt sich pro Parser Fingerabdruck → erste Message-ID und Tag;
+Kopien im selben Lauf werden übersprungen, Kopien früherer Läufe übernehmen das
+gecachte Parser-Ergebnis der ersten Ausgabe.
+"""
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+
+from tracking_links import is_tracking_url
+from url_canonicalizer import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+BODY_FINGERPRINTS_FORMAT = 1
+BODY_FINGERPRINT_DAYS = 14   # wie PARSE_CACHE_MAX_AGE_DAYS: ältere Ausgaben liegen außerhalb jedes Suchfensters
+
+_INVISIBLE = re.compile(r"<(script|style|head)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_HREF = re.compile(r"""\bhref\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_EMAIL_ADDRESS = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def body_fingerprint(html_content):
+    """Struktureller Hash eines HTML-Bodys (None bei leerem Body)."""
+    if not html_content:
+        return None
+    visible = _INVISIBLE.sub(" ", html_content)
+    links = [
+        "tracking" if is_tracking_url(href) else canonicalize_url(html.unescape(href))
+        for href in _HREF.findall(visible)
+        if not href.startswith("mailto:")
+    ]
+    text = _EMAIL_ADDRESS.sub(" ", html.unescape(_TAG.sub(" ", visible)))
+    text = _WHITESPACE.sub(" ", text).strip()
+    if not text and not links:
+        return None
+    digest = hashlib.sha1(text.encode("utf-8"))
+    digest.update("\n".join(links).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class BodyFingerprints:
+    """
+    Persistente Zuordnung als JSON: {"parser:fingerprint": [Message-ID, Tag]}.
+    first() liefert die Message-ID der ersten Ausgabe mit diesem Body,
+    seen_this_run() sagt, ob sie in diesem Lauf schon verarbeitet wurde.
+    """
+
+    def __init__(self, path=None, days=BODY_FINGERPRINT_DAYS):
+        self.path = path
+        self.days = days
+        self.bodies = {}
+        self._this_run = set()
+        self._dirty = False
+        self.duplicates = 0
+        self.load()
+
+    @staticmethod
+    def _key(parser_name, fingerprint):
+        return f"{parser_name}:{fingerprint}"
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Body-Fingerabdrücke unlesbar, starte leer: {str(e)}")
+            return
+        if data.get("format") == BODY_FINGERPRINTS_FORMAT:
+            self.bodies = data.get("bodies", {})
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.days)).strftime("%Y-%m-%d")
+        self.bodies = {key: entry for key, entry in self.bodies.items() if entry[1] >= cutoff}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": BODY_FINGERPRINTS_FORMAT, "bodies": self.bodies}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            logger.info(f"Body-Fingerabdrücke: {self.duplicates} doppelte Ausgaben erkannt, {len(self.bodies)} gespeichert")
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern der Body-Fingerabdrücke: {str(e)}")
+
+    def first(self, parser_name, fingerprint):
+        """Message-ID der ersten Ausgabe mit diesem Body (oder None)."""
+        entry = self.bodies.get(self._key(parser_name, fingerprint))
+        return entry[0] if entry else None
+
+    def seen_this_run(self, parser_name, fingerprint):
+        return self._key(parser_name, fingerprint) in self._this_run
+
+    def add(self, parser_name, fingerprint, message_id):
+        """Merkt den Body; eine bereits bekannte erste Ausgabe bleibt erhalten."""
+        key = self._key(parser_name, fingerprint)
+        self._this_run.add(key)
+        entry = self.bodies.get(key)
+        today = datetime.now().strftime("%Y-%m-%d")
+        if entry is None:
+            self.bodies[key] = [(message_id or "").strip(), today]
+        elif entry[1] != today:
+            entry[1] = today
+        else:
+            return
+        self._dirty = True
@@ -0,0 +1,129 @@
+"""
+Rollierender Deduplizierungs-Index über die letzten N Tage.
+
+Wöchentliche Newsletter (China Up Close, ASPI China 5) und lange
+Suchfenster brauchen ein Gedächtnis über mehr als einen Lauf. Der Index ist
+ein Dict Schlüssel → Tag im Speicher; persistiert (und committet) wird eine
+JSON-Datei mit einem Eintrag pro Zeile, sortiert nach Schlüssel – Git kann
+parallele Läufe so zeilenweise zusammenführen. Abgelaufene Tage fallen beim
+Laden und beim Schreiben heraus.
+
+Bei 30 Tagen sind das wenige tausend Schlüssel: Laden und Schreiben kosten
+Millisekunden. Eine Datenbank daneben lohnt nicht – im Workflow beginnt jeder
+Lauf mit einem frischen Checkout, sie müsste jedes Mal aus der JSON-Datei neu
+aufgebaut werden.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DEDUP_INDEX_DAYS = 30
+DEDUP_SNAPSHOT_FORMAT = 1
+
+
+class RollingDedupIndex:
+    """
+    path: JSON-Datei des Index (None = nur im Speicher).
+    contains() / add() arbeiten auf Schlüsseln (z.B. "url:..." / "title:..."),
+    commit() schreibt alle Einträge der letzten `days` Tage.
+    """
+
+    def __init__(self, path=None, days=DEDUP_INDEX_DAYS):
+        self.path = path
+        self.days = days
+        self._entries = None
+        self._dirty = False
+
+    @staticmethod
+    def today():
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def cutoff(self):
+        return (datetime.now() - timedelta(days=self.days)).strftime("%Y-%m-%d")
+
+    def exists(self):
+        """True, wenn die Index-Datei vorliegt (es also etwas zu lesen gibt)."""
+        return bool(self.path) and os.path.exists(self.path)
+
+    def newer_than(self, path):
+        """True, wenn die Index-Datei neuer ist als die Datei path (oder path fehlt)."""
+        if not self.exists():
+            return False
+        if not path or not os.path.exists(path):
+            return True
+        return os.path.getmtime(self.path) > os.path.getmtime(path)
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self):
+        if not self.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Dedup-Index unlesbar, starte leer: {str(e)}")
+            return {}
+        if data.get("format") != DEDUP_SNAPSHOT_FORMAT:
+            return {}
+        cutoff = self.cutoff()
+        entries = {key: day for key, day in data.get("entries", {}).items() if day >= cutoff}
+        logger.info(f"Dedup-Index: {len(entries)} Einträge geladen")
+        return entries
+
+    def contains(self, key):
+        """True, wenn der Schlüssel innerhalb des Zeitfensters eingetragen wurde."""
+        day = self.entries.get(key)
+        return day is not None and day >= self.cutoff()
+
+    def day(self, key):
+        return self.entries.get(key)
+
+    def add(self, key, day=None):
+        self.add_many([key], day)
+
+    def add_many(self, keys, day=None):
+        """Trägt Schlüssel ein; ein schon vorhandener Schlüssel behält den späteren Tag."""
+        day = day or self.today()
+        entries = self.entries
+        for key in keys:
+            if entries.get(key, "") < day:
+                entries[key] = day
+                self._dirty = True
+
+    def keys(self):
+        """Alle Schlüssel im Zeitfenster mit Tag, älteste zuerst (z.B. zum Neuaufbau eines Bloom-Filters)."""
+        cutoff = self.cutoff()
+        return sorted(((key, day) for key, day in self.entries.items() if day >= cutoff), key=lambda item: item[1])
+
+    def __len__(self):
+        cutoff = self.cutoff()
+        return sum(1 for day in self.entries.values() if day >= cutoff)
+
+    def commit(self):
+        """Schreibt die Einträge im Zeitfenster (abgelaufene Tage fallen dabei heraus)."""
+        if not self._dirty or not self.path:
+            return
+        cutoff = self.cutoff()
+        entries = {key: day for key, day in sorted(self._entries.items()) if day >= cutoff}
+        expired = len(self._entries) - len(entries)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                # Ein Eintrag pro Zeile: Git kann parallele Läufe zeilenweise zusammenführen
+                json.dump({"format": DEDUP_SNAPSHOT_FORMAT, "entries": entries}, f, ensure_ascii=False, indent=0)
+            os.replace(tmp_path, self.path)
+            self._entries = entries
+            self._dirty = False
+            if expired:
+                logger.info(f"Dedup-Index: {expired} abgelaufene Einträge entfernt")
+        except OSError as e:
+            logger.warning(f"Fehler beim Schreiben des Dedup-Index: {str(e)}")
@@ -0,0 +1,139 @@
+"""
+Entitäten-Erkennung über ein Gazetteer und Tagesindex Entität → Artikel.
+
+EntityGazetteer kompiliert alle Aliase (Englisch, Pinyin, Hanzi) einmal zu
+einem KeywordMatcher im Token-Modus: ein Durchlauf über den Titel liefert alle
+Personen, Institutionen, Orte und Unternehmen. EntityIndex hält pro Tag einen
+invertierten Index Entität → Artikel-IDs, damit das Briefing ohne erneutes
+Matching nach Entitäten gruppieren und filtern kann.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+
+from keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+ENTITY_INDEX_FORMAT = 1
+ENTITY_INDEX_DAYS = 30  # so viele Tage bleiben im Index
+
+
+class EntityGazetteer:
+    """
+    Lädt {Typ: {Entität: [Aliase]}} aus einer JSON-Datei.
+
+    Aliase in Kleinschreibung treffen unabhängig von Groß-/Kleinschreibung;
+    Aliase mit Großbuchstaben (Abkürzungen wie "SAFE") treffen nur in genau
+    dieser Schreibweise – "safe" im Fließtext ist keine Behörde.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "r", encoding="utf-8") as f:
+            gazetteer = json.load(f)
+        self.entity_types = {}
+        aliases = {}
+        exact = {}
+        plain = set()
+        for entity_type, entities in gazetteer.items():
+            if entity_type.startswith("_"):
+                continue
+            for name, names in entities.items():
+                if name in self.entity_types:
+                    raise ValueError(f"Entität doppelt im Gazetteer: {name}")
+                self.entity_types[name] = entity_type
+                aliases[name] = names
+                for alias in names:
+                    if alias == alias.lower():
+                        plain.add(alias)
+                    else:
+                        exact.setdefault(alias.lower(), []).append(alias)
+        self.matcher = KeywordMatcher(aliases, mode="token")
+        # Nur Aliase, die ausschließlich mit Großbuchstaben eingetragen sind, werden nachgeprüft
+        self._exact = {
+            alias: re.compile(r"(?<![0-9A-Za-z])(?:" + "|".join(map(re.escape, spellings)) + r")(?![0-9A-Za-z])")
+            for alias, spellings in exact.items()
+            if alias not in plain
+        }
+        logger.info(f"Gazetteer geladen: {len(self.entity_types)} Entitäten, {len(self.matcher.keyword_categories)} Aliase")
+
+    def entities(self, *texts):
+        """Alle im Text genannten Entitäten (kanonische Namen)."""
+        text = " ".join(texts)
+        found = set()
+        for alias in self.matcher.keywords(text):
+            pattern = self._exact.get(alias)
+            if pattern is not None and not pattern.search(text):
+                continue
+            found.update(self.matcher.keyword_categories[alias])
+        return found
+
+
+class EntityIndex:
+    """
+    Invertierter Index pro Tag als JSON-Datei:
+    {Tag: {"articles": {ID: {title, url, section, entities}}, "entities": {Entität: [IDs]}}}.
+    Tage älter als `days` werden beim Speichern entfernt.
+    """
+
+    def __init__(self, path=None, days=ENTITY_INDEX_DAYS):
+        self.path = path
+        self.days = days
+        self.index = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Entitäten-Index unlesbar, starte leer: {str(e)}")
+            return
+        if data.get("format") == ENTITY_INDEX_FORMAT:
+            self.index = data.get("days", {})
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.days)).strftime("%Y-%m-%d")
+        self.index = {day: entry for day, entry in self.index.items() if day >= cutoff}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": ENTITY_INDEX_FORMAT, "days": self.index}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern des Entitäten-Index: {str(e)}")
+
+    def add(self, day, section, title, url, entities):
+        """Nimmt einen Artikel mit seinen Entitäten in den Tagesindex auf; Rückgabe: Artikel-ID."""
+        article_id = hashlib.sha1((url or title).encode("utf-8")).hexdigest()[:12]
+        entry = self.index.setdefault(day, {"articles": {}, "entities": {}})
+        if article_id in entry["articles"]:
+            return article_id
+        entry["articles"][article_id] = {"title": title, "url": url, "section": section, "entities": sorted(entities)}
+        for entity in entities:
+            entry["entities"].setdefault(entity, []).append(article_id)
+        self._dirty = True
+        return article_id
+
+    def articles_for(self, entity, day):
+        """Alle Artikel eines Tages, die die Entität nennen."""
+        entry = self.index.get(day, {"articles": {}, "entities": {}})
+        return [entry["articles"][article_id] for article_id in entry["entities"].get(entity, [])]
+
+    def entity_counts(self, day):
+        """[(Entität, Anzahl Artikel)] eines Tages, häufigste zuerst."""
+        entities = self.index.get(day, {}).get("entities", {})
+        return sorted(((entity, len(ids)) for entity, ids in entities.items()), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,373 @@
+"""
+Gemeinsamer Keyword-Matcher für alle Relevanz-Scorer.
+
+Alle Keyword-Listen werden als Kategorien EINMAL kompiliert; ein Durchlauf
+über den Text liefert alle Treffer mit ihren Kategorien. Zwei Modi:
+
+- "substring": eine Regex (Trie-förmige Alternation), Semantik exakt wie das
+  alte `any(kw in text.lower() for kw in liste)` – also auch "ai" in "said".
+- "token": der Text wird einmal in Tokens und Wortfolgen (Phrasen) zerlegt,
+  jedes Keyword ist ein Set-Lookup und trifft nur ganze Wörter.
+  Keywords mit "-" am Ende ("sino-") treffen das Wort vor dem Bindestrich.
+
+Chinesische Schriftzeichen (Hanzi) sind je ein eigenes Token, ein Hanzi-Keyword
+("习近平") ist also eine Phrase und läuft durch denselben Index wie die
+englischen Keywords. Pinyin mit Tonzeichen wird vorher gefaltet ("Zhōngguó" →
+"zhongguo"); reine ASCII-Texte kostet das nur einen isascii()-Check.
+
+LexiconMatcher lädt die Kategorien aus einer JSON-Datei, cacht die
+kompilierten Artefakte auf der Festplatte und lädt bei Änderungen neu.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+MATCH_MODES = ("substring", "token")
+TOKENIZER_VERSION = 2  # erhöhen, wenn sich tokenize()/fold_diacritics() ändern (geht in die Matcher-Version ein)
+
+# Abkürzungspunkte entfernen ("u.s." → "us"), Possessiv-s abtrennen ("china's" → "china")
+_ABBREVIATION_DOT = re.compile(r"(?<=\b[a-z])\.(?=[a-z]\b|\s|-|$)")
+_POSSESSIVE = re.compile(r"['’]s\b")
+# Kombinierende diakritische Zeichen nach NFKD (Pinyin-Töne, Akzente, Umlaut-Punkte)
+_COMBINING_MARK = re.compile("[\u0300-\u036f]")
+# Wörter aus Buchstaben/Ziffern oder ein einzelnes CJK-Schriftzeichen (Basis, Ext. A, Kompatibilität)
+_TOKEN = re.compile(r"[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+
+def fold_diacritics(text):
+    """Entfernt Tonzeichen/Akzente ("xí jìnpíng" → "xi jinping") und vereinheitlicht Vollbreiten-Zeichen."""
+    if text.isascii():
+        return text
+    return _COMBINING_MARK.sub("", unicodedata.normalize("NFKD", text))
+
+
+def tokenize(text):
+    """
+    Zerlegt einen Text in normalisierte Tokens (kleingeschrieben, ohne
+    Tonzeichen, Abkürzungspunkte und Possessiv-s, Plural-s zusätzlich
+    abgetrennt; jedes Hanzi ist ein Token).
+    Rückgabe: (Liste der Tokens in Reihenfolge, Set der Tokens).
+    """
+    text = fold_diacritics(text.lower())
+    if "." in text:
+        text = _ABBREVIATION_DOT.sub("", text)
+    if "'" in text or "’" in text:
+        text = _POSSESSIVE.sub("", text)
+    tokens = _TOKEN.findall(text)
+    token_set = set(tokens)
+    # Einfache Plural-Faltung: "tariffs" trifft auch "tariff"
+    token_set.update(token[:-1] for token in tokens if len(token) > 3 and token.endswith("s") and not token.endswith("ss"))
+    return tokens, token_set
+
+
+def trie_pattern(keywords):
+    """
+    Baut aus den Keywords eine Regex in Trie-Form (z.B. "chin(?:a|ese)").
+    Geschwister-Zweige beginnen mit verschiedenen Zeichen und optionale
+    Fortsetzungen sind gierig – pro Position wird so der LÄNGSTE Treffer gefunden.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Kompiliert {Kategorie: [Keywords]} zu einem Matcher.
+
+    match(text) liefert {Kategorie: {getroffene Keywords}}. Im Modus
+    "substring" werden Keywords, die an derselben Position als Präfix eines
+    längeren Treffers vorkommen (z.B. "xi" in "xi jinping"), über die
+    Präfix-Hülle mitgezählt; im Modus "token" sind alle Prüfungen Set-Lookups.
+
+    Mit `state` (aus compiled_state()) wird die Kompilierung übersprungen.
+    """
+
+    def __init__(self, categories, mode="substring", state=None):
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unbekannter Match-Modus: {mode}")
+        self.mode = mode
+        self.categories = {
+            name: tuple(dict.fromkeys(fold_diacritics(keyword.lower()) for keyword in keywords))
+            for name, keywords in categories.items()
+        }
+        self.keyword_categories = {}
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                self.keyword_categories.setdefault(keyword, set()).add(name)
+        # Spalten der Term-Inzidenz (incidence()): Keyword → fester Index
+        self.keyword_list = tuple(sorted(self.keyword_categories))
+        self._columns = {keyword: column for column, keyword in enumerate(self.keyword_list)}
+        # Version für Cache-Schlüssel: ändert sich mit jeder Keyword-Liste, dem Modus und der Tokenisierung
+        self.version = hashlib.sha1(
+            json.dumps([mode, TOKENIZER_VERSION, self.categories], sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+        if state is None:
+            state = self._compile()
+        self._load_state(state)
+
+    def _compile(self):
+        """Baut Regex-Muster/Präfix-Hülle bzw. Token- und Phrasen-Index (JSON-serialisierbar)."""
+        keywords = sorted(self.keyword_categories, key=len, reverse=True)
+        if self.mode == "substring":
+            return {
+                "pattern": trie_pattern(keywords) if keywords else None,
+                "prefixes": {
+                    keyword: [other for other in keywords if keyword.startswith(other)]
+                    for keyword in keywords
+                },
+            }
+        # Token-Index: Einzelwort → Keywords; Wortfolgen nach ihrem ersten Wort
+        token_index = {}
+        phrase_index = {}
+        for keyword in keywords:
+            tokens, _ = tokenize(keyword.rstrip("-"))
+            if len(tokens) == 1:
+                token_index.setdefault(tokens[0], []).append(keyword)
+            elif tokens:
+                phrase_index.setdefault(tokens[0], []).append([tokens[1:], keyword])
+        return {"token_index": token_index, "phrase_index": phrase_index}
+
+    def _load_state(self, state):
+        # Treffer zeigen direkt auf Spalten (Index in keyword_list), Keywords entstehen erst in keywords()
+        self._state = state
+        columns = self._columns
+        if self.mode == "substring":
+            self._prefixes = {match: tuple(columns[k] for k in keywords) for match, keywords in state["prefixes"].items()}
+            self._regex = re.compile(f"(?=({state['pattern']}))") if state["pattern"] else None
+        else:
+            self._token_index = {token: tuple(columns[k] for k in keywords) for token, keywords in state["token_index"].items()}
+            self._phrase_index = {
+                token: [(rest, columns[keyword]) for rest, keyword in phrases]
+                for token, phrases in state["phrase_index"].items()
+            }
+
+    def compiled_state(self):
+        """Kompilierte Artefakte für den Disk-Cache."""
+        return self._state
+
+    def normalize(self, *texts):
+        """
+        Kanonische Form des Textes für Cache-Schlüssel: gleiche Form heißt
+        gleiche Treffer (Modus "token": Token-Folge, "substring": kleingeschrieben).
+        """
+        if self.mode == "token":
+            return " ".join(tokenize(" ".join(texts))[0])
+        return fold_diacritics(" ".join(texts).lower())
+
+    def keywords(self, *texts):
+        """Alle im Text enthaltenen Keywords (ein Durchlauf über den Text)."""
+        keyword_list = self.keyword_list
+        return {keyword_list[column] for column in self._row(" ".join(texts))}
+
+    def incidence(self, texts):
+        """
+        Term-Inzidenzmatrix (Texte × Keywords) in einem Durchlauf über alle Texte:
+        Rückgabe (keyword_list, Zeilen), eine Zeile ist das Set der getroffenen
+        Spalten (Index in keyword_list), direkt aus den Trie-/Token-Treffern.
+        """
+        return self.keyword_list, [self._row(text) for text in texts]
+
+    def _row(self, text):
+        if self.mode == "token":
+            return self._token_row(text)
+        found = set()
+        if self._regex is None:
+            return found
+        for match in self._regex.finditer(fold_diacritics(text.lower())):
+            if match.group(1):
+                found.update(self._prefixes[match.group(1)])
+        return found
+
+    def _token_row(self, text):
+        tokens, token_set = tokenize(text)
+        found = set()
+        token_index = self._token_index
+        for token in token_set:
+            columns = token_index.get(token)
+            if columns:
+                found.update(columns)
+        phrase_index = self._phrase_index
+        for i, token in enumerate(tokens):
+            for rest, column in phrase_index.get(token, ()):
+                if tokens[i + 1:i + 1 + len(rest)] == rest:
+                    found.add(column)
+        return found
+
+    def match(self, *texts):
+        """Alle Treffer gruppiert nach Kategorie: {Kategorie: {Keywords}}."""
+        hits = {}
+        for keyword in self.keywords(*texts):
+            for name in self.keyword_categories[keyword]:
+                hits.setdefault(name, set()).add(keyword)
+        return hits
+
+
+# ============================================================================
+# LEXIKON-DATEI (Disk-Cache + Hot Reload)
+# ============================================================================
+
+MATCHER_CACHE_FORMAT = 2   # erhöhen, wenn sich compiled_state() ändert
+MATCHER_CACHE_ENTRIES = 4  # so viele Lexikon-Versionen/Modi bleiben im Cache
+
+
+def flatten_lexicon(lexicon):
+    """
+    {Gruppe: {Kategorie: [Keywords]}} → {Kategorie: [Keywords]} (Kommentar-Schlüssel "_..." ignoriert).
+    Ein Eintrag "@name" übernimmt alle Keywords der Kategorie name (z.B. gemeinsame Hanzi-/Pinyin-Listen).
+    """
+    categories = {}
+    for group, group_categories in lexicon.items():
+        if group.startswith("_"):
+            continue
+        for name, keywords in group_categories.items():
+            if name in categories:
+                raise ValueError(f"Kategorie doppelt im Lexikon: {name}")
+            categories[name] = keywords
+    for name, keywords in categories.items():
+        expanded = []
+        for keyword in keywords:
+            if keyword.startswith("@"):
+                reference = categories.get(keyword[1:])
+                if reference is None:
+                    raise ValueError(f"Unbekannte Kategorie {keyword} in {name}")
+                if any(entry.startswith("@") for entry in reference):
+                    raise ValueError(f"Verschachtelter Verweis {keyword} in {name}")
+                expanded.extend(reference)
+            else:
+                expanded.append(keyword)
+        categories[name] = expanded
+    return categories
+
+
+class LexiconMatcher:
+    """
+    KeywordMatcher aus einer JSON-Lexikondatei.
+
+    Die kompilierten Artefakte werden unter dem Hash der Datei (+ Modus) in
+    cache_path abgelegt, ein Neustart kompiliert also nicht neu. Ändert sich
+    die Datei (mtime, höchstens alle check_interval Sekunden geprüft), wird
+    sie beim nächsten Aufruf neu geladen – ohne Neustart des Prozesses.
+    Bei einer kaputten Datei bleibt der bisherige Matcher aktiv.
+    """
+
+    def __init__(self, path, mode="substring", cache_path=None, check_interval=1.0):
+        self.path = path
+        self.mode = mode
+        self.cache_path = cache_path
+        self.check_interval = check_interval
+        self._matcher = None
+        self._mtime = None
+        self._checked = time.monotonic()
+        self.reload()
+
+    # --- Laden -------------------------------------------------------------
+    def reload(self):
+        mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        categories = flatten_lexicon(json.loads(raw.decode("utf-8")))
+        key = hashlib.sha1(raw + f"|{self.mode}|{MATCHER_CACHE_FORMAT}".encode("utf-8")).hexdigest()
+
+        cache = self._read_cache()
+        state = cache.get(key, {}).get("state")
+        self._matcher = KeywordMatcher(categories, mode=self.mode, state=state)
+        if state is None:
+            cache[key] = {"loaded": time.time(), "state": self._matcher.compiled_state()}
+            self._write_cache(cache)
+            logger.info(f"Keyword-Lexikon kompiliert: {self.path} ({len(categories)} Kategorien)")
+        else:
+            logger.info(f"Keyword-Lexikon aus Cache geladen: {self.path} ({len(categories)} Kategorien)")
+        self._mtime = mtime
+
+    def _read_cache(self):
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Matcher-Cache unlesbar, kompiliere neu: {str(e)}")
+            return {}
+
+    def _write_cache(self, cache):
+        if not self.cache_path:
+            return
+        newest = sorted(cache.items(), key=lambda item: item[1].get("loaded", 0), reverse=True)
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(dict(newest[:MATCHER_CACHE_ENTRIES]), f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern des Matcher-Caches: {str(e)}")
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            self.reload()
+            logger.info(f"Keyword-Lexikon neu geladen: {self.path} (Version {self.version})")
+        except Exception as e:
+            self._mtime = mtime  # nicht bei jedem Aufruf erneut versuchen
+            logger.warning(f"Keyword-Lexikon fehlerhaft, behalte bisherige Version: {str(e)}")
+
+    # --- Matcher-Schnittstelle --------------------------------------------
+    @property
+    def version(self):
+        self._reload_if_changed()
+        return self._matcher.version
+
+    @property
+    def categories(self):
+        return self._matcher.categories
+
+    @property
+    def keyword_categories(self):
+        return self._matcher.keyword_categories
+
+    def incidence(self, texts):
+        # Spalten und Zeilen stammen aus demselben Matcher-Stand (Neuladen nur davor)
+        self._reload_if_changed()
+        return self._matcher.incidence(texts)
+
+    def normalize(self, *texts):
+        return self._matcher.normalize(*texts)
+
+    def keywords(self, *texts):
+        self._reload_if_changed()
+        return self._matcher.keywords(*texts)
+
+    def match(self, *texts):
+        self._reload_if_changed()
+        return self._matcher.match(*texts)
@@ -0,0 +1,174 @@
+"""
+Dekodierung von Mail-Bodies mit gelernten Charset-Profilen pro Absender
+(thinktanks.py, nikkei_test.py).
+
+Pro Absender und deklariertem Charset merkt sich das Profil den Codec, mit dem
+die letzte E-Mail fehlerfrei dekodiert wurde. Liegt ein solcher Codec vor, wird
+nur mit ihm dekodiert – ein Versuch, auch bei Absendern, deren deklariertes
+Charset notorisch falsch ist ("us-ascii" mit UTF-8-Inhalt, "utf-8" mit
+Windows-1252-Inhalt). Erst wenn er scheitert, läuft die volle Kette:
+deklariertes Charset, UTF-8, dann die Einzelbyte-Codecs in der Reihenfolge
+ihrer bisherigen Erfolge beim Absender; der Gewinner wird der neue Codec.
+
+Einzelbyte-Codecs scheitern praktisch nie, auch nicht an UTF-8-Inhalt (sie
+liefern dann Mojibake). Ein gelernter Einzelbyte-Codec gilt deshalb als
+Fehlschlag, sobald der Body UTF-8-Mehrbytefolgen enthält – so wird ein Absender,
+der sein Encoding repariert hat, bei der nächsten E-Mail wieder richtig
+dekodiert und das Profil umgestellt.
+"""
+import codecs
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+DECODING_FALLBACK_CHARSET = "windows-1252"
+# Einzelbyte-Kandidaten nach UTF-8; die Reihenfolge lernt das Profil pro Absender
+DECODING_FALLBACK_CANDIDATES = (DECODING_FALLBACK_CHARSET, "iso-8859-1")
+
+_UTF8_SEQUENCE = re.compile(rb"[\xc2-\xdf][\x80-\xbf]|[\xe0-\xef][\x80-\xbf]{2}|[\xf0-\xf4][\x80-\xbf]{3}")
+
+
+def _normalize_codec(charset):
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+
+def _looks_like_utf8(payload):
+    """True, wenn der Body UTF-8-Mehrbytefolgen enthält (Mojibake-Gefahr bei Einzelbyte-Codecs)."""
+    return _UTF8_SEQUENCE.search(payload) is not None
+
+
+class CharsetProfiles:
+    """
+    Persistente Profile als JSON:
+    {Absender: {"messages", "fallbacks", "transfer_encodings": {...},
+                "fallback_charsets": {Codec: Erfolge},
+                "charsets": {deklariert: {"ok", "failed", "codec"}}}}
+    decode() liefert den Text; "ok"/"failed" zählen, ob das deklarierte Charset
+    gepasst hat, "codec" ist der zuletzt bewährte Codec für dieses Paar.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._profiles = None
+        self._dirty = False
+        self.metrics = {"messages": 0, "proven": 0, "declared_ok": 0, "fallbacks": 0, "replaced": 0}
+
+    @property
+    def profiles(self):
+        if self._profiles is None:
+            self._profiles = self._load()
+        return self._profiles
+
+    def _load(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Dekodier-Profile unlesbar, starte leer: {str(e)}")
+            return {}
+
+    def save(self):
+        """Speichert die Profile und loggt die Fallback-Metriken des Laufs."""
+        metrics = self.metrics
+        if metrics["messages"]:
+            logger.info(
+                f"Dekodierung - {metrics['messages']} E-Mails: {metrics['proven']} direkt mit bewährtem Codec, "
+                f"{metrics['declared_ok']} mit deklariertem Charset, {metrics['fallbacks']} Fallbacks nach Fehler, "
+                f"{metrics['replaced']} davon mit Ersatzzeichen"
+            )
+            for sender, profile in sorted(self.profiles.items()):
+                if profile.get("fallbacks"):
+                    rate = profile["fallbacks"] / max(profile.get("messages", 1), 1)
+                    logger.info(f"Dekodierung - {sender}: Fallback-Quote {rate:.0%} ({profile['fallbacks']}/{profile.get('messages', 0)})")
+        if not self.path or not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._profiles, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern der Dekodier-Profile: {str(e)}")
+
+    def _fallback_order(self, profile):
+        """UTF-8, dann die Einzelbyte-Kandidaten – beim Absender erfolgreichste zuerst."""
+        successes = profile.setdefault("fallback_charsets", {})
+        return ["utf-8"] + sorted(DECODING_FALLBACK_CANDIDATES, key=lambda charset: -successes.get(charset, 0))
+
+    def decode(self, payload, sender, declared, transfer_encoding="7bit"):
+        """Dekodiert einen Body-Payload (bytes) des Absenders mit deklariertem Charset."""
+        declared = (declared or "utf-8").lower()
+        profile = self.profiles.setdefault(
+            sender or "unbekannt", {"messages": 0, "fallbacks": 0, "charsets": {}, "transfer_encodings": {}}
+        )
+        stats = profile["charsets"].setdefault(declared, {"ok": 0, "failed": 0})
+        encoding = (transfer_encoding or "7bit").lower()
+        profile["transfer_encodings"][encoding] = profile["transfer_encodings"].get(encoding, 0) + 1
+        profile["messages"] += 1
+        self.metrics["messages"] += 1
+        self._dirty = True
+        declared_codec = _normalize_codec(declared)
+
+        # 1. Bewährter Codec für dieses Absender/Charset-Paar: ein Versuch
+        # (ein Einzelbyte-Codec nur, wenn der Body nicht nach UTF-8 aussieht)
+        codec = stats.get("codec")
+        tried = set()
+        if codec and (codec == "utf-8" or not _looks_like_utf8(payload)):
+            try:
+                text = payload.decode(codec)
+                self.metrics["proven"] += 1
+                self._count(profile, stats, codec, declared_codec)
+                return text
+            except (UnicodeDecodeError, LookupError):
+                tried.add(codec)
+
+        # 2. Volle Kette: deklariertes Charset, UTF-8, Einzelbyte-Kandidaten
+        if declared_codec and declared_codec not in tried:
+            tried.add(declared_codec)
+            try:
+                text = payload.decode(declared_codec)
+                self.metrics["declared_ok"] += 1
+                stats["codec"] = declared_codec
+                self._count(profile, stats, declared_codec, declared_codec)
+                return text
+            except UnicodeDecodeError:
+                pass
+        self.metrics["fallbacks"] += 1
+        for candidate in self._fallback_order(profile):
+            candidate_codec = _normalize_codec(candidate)
+            if candidate_codec in tried:
+                continue
+            try:
+                text = payload.decode(candidate_codec)
+            except UnicodeDecodeError:
+                continue
+            profile["fallback_charsets"][candidate] = profile["fallback_charsets"].get(candidate, 0) + 1
+            stats["codec"] = candidate_codec
+            self._count(profile, stats, candidate_codec, declared_codec)
+            logger.info(f"Dekodierung - {sender}: {declared} fehlgeschlagen, {candidate} verwendet")
+            return text
+        self.metrics["replaced"] += 1
+        stats.pop("codec", None)
+        self._count(profile, stats, _normalize_codec(DECODING_FALLBACK_CHARSET), declared_codec)
+        logger.info(f"Dekodierung - {sender}: {declared} fehlgeschlagen, {DECODING_FALLBACK_CHARSET} mit Ersatzzeichen verwendet")
+        return payload.decode(DECODING_FALLBACK_CHARSET, errors="replace")
+
+    @staticmethod
+    def _count(profile, stats, used, declared_codec):
+        if used == declared_codec:
+            stats["ok"] += 1
+        else:
+            stats["failed"] += 1
+            profile["fallbacks"] += 1
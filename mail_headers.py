@@ -0,0 +1,67 @@
+"""
+Header-Prefetch für alle Mail-Skripte (thinktanks.py, nikkei_test.py, nikkei_asiabriefing_chinaupclose).
+
+Vor dem Body-Download werden FROM/SUBJECT/DATE/MESSAGE-ID aller gefundenen
+E-Mails in EINEM IMAP-Aufruf geholt. Betreff-Regeln kommen aus dem
+Keyword-Lexikon (config/keyword_lexicon.json) und werden im Token-Modus
+geprüft: ein Keyword trifft nur ganze Wörter bzw. Wortfolgen.
+"""
+import email
+import logging
+from email.header import decode_header
+
+logger = logging.getLogger(__name__)
+
+HEADER_FETCH_FIELDS = "BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE MESSAGE-ID)]"
+
+
+def decode_subject(msg):
+    """Dekodiert den Betreff einer E-Mail (oder eines reinen Header-Blocks)."""
+    subject, encoding = decode_header(msg.get("Subject", "Kein Betreff"))[0]
+    if isinstance(subject, bytes):
+        subject = subject.decode(encoding or "utf-8", errors="replace")
+    return subject
+
+
+def fetch_headers(mail, email_ids):
+    """
+    Holt nur FROM/SUBJECT/DATE/MESSAGE-ID aller E-Mails in einem IMAP-Aufruf.
+    Rückgabe: {email_id: Message}; bei Fehlern ein leeres Dict (dann wird
+    wie bisher jeder Body geladen).
+    """
+    if not email_ids:
+        return {}
+    try:
+        result, data = mail.fetch(b",".join(email_ids), f"({HEADER_FETCH_FIELDS})")
+    except Exception as e:
+        logger.warning(f"Header-Abruf fehlgeschlagen: {str(e)}")
+        return {}
+    if result != "OK":
+        logger.warning(f"Header-Abruf fehlgeschlagen: {result}")
+        return {}
+    headers = {}
+    for item in data:
+        if isinstance(item, tuple) and len(item) == 2:
+            email_id = item[0].split(b" ", 1)[0]
+            headers[email_id] = email.message_from_bytes(item[1])
+    return headers
+
+
+def filter_by_subject(mail, email_ids, matcher, category):
+    """
+    Verwirft E-Mails, deren Betreff ein Keyword der Lexikon-Kategorie enthält,
+    ohne den Body zu laden. matcher sollte im Token-Modus arbeiten (ganze Wörter).
+    Rückgabe: (verbleibende IDs in Originalreihenfolge, [(ID, Betreff)] der verworfenen).
+    """
+    headers = fetch_headers(mail, email_ids)
+    kept = []
+    skipped = []
+    for email_id in email_ids:
+        header = headers.get(email_id)
+        if header is not None:
+            subject = decode_subject(header)
+            if category in matcher.match(subject):
+                skipped.append((email_id, subject))
+                continue
+        kept.append(email_id)
+    return kept, skipped
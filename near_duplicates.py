@@ -0,0 +1,108 @@
+"""
+Erkennung fast gleicher Titel über MinHash-Signaturen und LSH-Buckets.
+
+Derselbe Bericht wird von MERICS, Brookings und CFR oft mit leicht
+unterschiedlichen Schlagzeilen angekündigt – exakte Titel-Vergleiche finden
+das nicht. Jeder Titel wird auf seine Term-Menge (ohne Funktionswörter)
+reduziert und per MinHash signiert; die Signatur wird in Bänder zerlegt, und
+nur Titel, die in mindestens einem Band-Bucket zusammenfallen, werden
+überhaupt verglichen (statt jeder mit jedem). Die Entscheidung fällt auf der
+exakten Jaccard-Ähnlichkeit der Term-Mengen.
+"""
+import random
+import zlib
+
+from bm25_index import terms
+
+NEAR_DUPLICATE_THRESHOLD = 0.7  # Jaccard-Ähnlichkeit der Term-Mengen
+MINHASH_PERMUTATIONS = 64
+MINHASH_MIN_TERMS = 3           # kürzere Titel sind zu unspezifisch für Fast-Duplikate
+TITLE_STOPWORDS = {
+    "a", "about", "after", "amid", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "in", "into", "is", "it", "its", "of", "on", "or", "over", "the", "to", "what", "why", "with",
+}
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def title_terms(title):
+    """Term-Menge eines Titels für den Ähnlichkeitsvergleich."""
+    return frozenset(term for term in terms(title) if term not in TITLE_STOPWORDS)
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def lsh_bands(threshold, permutations):
+    """
+    Wählt Bänder × Zeilen (= permutations): den Wendepunkt der S-Kurve
+    (1/Bänder)^(1/Zeilen) so nah wie möglich UNTER der Schwelle, damit echte
+    Fast-Duplikate fast sicher Kandidaten werden – verglichen wird ohnehin exakt.
+    """
+    best = (1, permutations)
+    for rows in range(1, permutations + 1):
+        if permutations % rows:
+            continue
+        bands = permutations // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Index über bereits akzeptierte Titel. find() liefert den ähnlichsten
+    bekannten Titel oberhalb der Schwelle, add() nimmt einen Titel auf.
+    Der Index lebt nur für einen Deduplizierungs-Lauf (keine Datei).
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD, permutations=MINHASH_PERMUTATIONS, seed=1):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_bands(threshold, permutations)
+        rng = random.Random(seed)
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(permutations)]
+        self._buckets = [{} for _ in range(self.bands)]
+        self._entries = []
+        self.comparisons = 0
+
+    def signature(self, term_set):
+        hashes = [zlib.crc32(term.encode("utf-8")) for term in term_set]
+        return tuple(
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._coefficients
+        )
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows] for band in range(self.bands)]
+
+    def find(self, title):
+        """(Ähnlichkeit, Wert) des ähnlichsten aufgenommenen Titels ab der Schwelle, sonst None."""
+        term_set = title_terms(title)
+        if len(term_set) < MINHASH_MIN_TERMS:
+            return None
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(self.signature(term_set))):
+            candidates.update(bucket.get(key, ()))
+        best = None
+        for entry_id in candidates:
+            self.comparisons += 1
+            other_terms, value = self._entries[entry_id]
+            similarity = jaccard(term_set, other_terms)
+            if similarity >= self.threshold and (best is None or similarity > best[0]):
+                best = (similarity, value)
+        return best
+
+    def add(self, title, value):
+        """Nimmt einen Titel auf; value wird von find() zurückgegeben (z.B. Abschnitt + Titel)."""
+        term_set = title_terms(title)
+        if len(term_set) < MINHASH_MIN_TERMS:
+            return
+        entry_id = len(self._entries)
+        self._entries.append((term_set, value))
+        for bucket, key in zip(self._buckets, self._band_keys(self.signature(term_set))):
+            bucket.setdefault(key, []).append(entry_id)
@@ -7,12 +7,71 @@ import requests
 from bs4 import BeautifulSoup
 import smtplib
 from email.mime.text import MIMEText
-import urllib.parse
+
+from keyword_matcher import LexiconMatcher
+from relevance_scoring import ScoreCache, ScoringRule
+from bm25_index import BM25Index, QueryProfile
+from topk_selector import TopKSelector
+from entity_index import EntityGazetteer
+from trending import TrendingCounters
+from url_canonicalizer import canonicalize_url
+from seen_store import SeenStore
+from mail_headers import filter_by_subject
+from mail_decoding import CharsetProfiles
+from title_normalizer import TitleNormalizer
 
 # ~~~ SUCHPARAMETER ~~~
 EMAIL_NIKKEI_ASIA = "nikkeiasia-d-nl@namail.nikkei.com"  # E-Mail-Adresse für Nikkei Asia Newsletter
 EMAIL_CHINA_UP_CLOSE = "nikkeiasia-w-nl@namail.nikkei.com"  # E-Mail-Adresse für China Up Close Newsletter
 SEARCH_DAYS = 7  # Zeitfenster für die Suche (letzte 7 Tage)
+TOP_K = 5  # so viele Artikel kommen in die E-Mail
+SECTION_TOP_K = 3  # höchstens so viele aus einem Newsletter (Nikkei Asia / China Up Close)
+CHINA_UP_CLOSE_SKIP_TITLES = ("This week's China Up Close focuses on", "Read Katsuji Nakazawa's analysis here")  # Intro-Links ohne Artikel
+
+# ~~~ RELEVANZ-KEYWORDS (gemeinsames Lexikon mit thinktanks.py) ~~~
+RELEVANCE_MATCH_MODE = "token"  # "token": nur ganze Wörter ("us" trifft nicht "focus"); "substring": altes Verhalten
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+KEYWORD_LEXICON_FILE = os.path.join(BASE_DIR, "config", "keyword_lexicon.json")
+# Gemeinsames Cache-Verzeichnis mit thinktanks.py (THINKTANK_CACHE_DIR lenkt es um, z.B. im Benchmark)
+CACHE_DIR = os.getenv("THINKTANK_CACHE_DIR") or os.path.join(BASE_DIR, "thinktank_cache")
+MATCHER_CACHE_FILE = os.path.join(CACHE_DIR, "keyword_matcher.json")
+SCORE_CACHE_FILE = os.path.join(CACHE_DIR, "nikkei_score_cache.json")
+# Rangfolge der Kandidaten: BM25 gegen das China-Profil über alle bisherigen Artikel (gemeinsamer Index mit thinktanks.py)
+BM25_INDEX_FILE = os.path.join(CACHE_DIR, "bm25_index.json")
+# Ausgewählte Artikel zählen in die gemeinsamen Trend-Zähler (Begriffe + Entitäten) mit thinktanks.py
+TRENDING_FILE = os.path.join(CACHE_DIR, "trending.json")
+ENTITY_GAZETTEER_FILE = os.path.join(BASE_DIR, "config", "entity_gazetteer.json")
+# Bereits versendete Artikel (30 Tage): China Up Close ist wöchentlich, das Suchfenster 7 Tage
+SEEN_BLOOM_FILE = os.path.join(CACHE_DIR, "nikkei_seen_bloom.json")
+SEEN_INDEX_FILE = os.path.join(CACHE_DIR, "nikkei_seen.json")
+DECODING_PROFILE_FILE = os.path.join(CACHE_DIR, "nikkei_decoding_profiles.json")
+# Titel-Schlüssel für das Versand-Gedächtnis (Leerraum, Satzzeichen, Groß-/Kleinschreibung)
+TITLE_NORMALIZER = TitleNormalizer()
+
+# Matcher, Scorer und Stores entstehen erst in setup_pipeline() (main(), Benchmark):
+# ein bloßer Import – etwa beim Einsammeln durch pytest – legt nichts im Cache an.
+NIKKEI_MATCHER = None       # Kategorien nikkei_* / cuc_* (Scorer) und nikkei_subject_skip (Werbe-, Abo- und Umfrage-Mails)
+SCORE_CACHE = None          # Scores pro normalisiertem Titel + Regel-/Lexikon-Version
+NIKKEI_SCORING = None
+CHINA_UP_CLOSE_SCORING = None
+NIKKEI_QUERY = None
+SEEN_STORE = None
+DECODING_PROFILES = None    # bewährter Codec pro Newsletter-Absender (gemeinsamer Helfer mit thinktanks.py)
+
+def setup_pipeline():
+    """Baut Matcher, Score-Regeln und Stores einmal auf (idempotent)."""
+    global NIKKEI_MATCHER, SCORE_CACHE, NIKKEI_SCORING, CHINA_UP_CLOSE_SCORING, NIKKEI_QUERY, SEEN_STORE, DECODING_PROFILES
+    if NIKKEI_MATCHER is not None:
+        return
+    NIKKEI_MATCHER = LexiconMatcher(KEYWORD_LEXICON_FILE, mode=RELEVANCE_MATCH_MODE, cache_path=MATCHER_CACHE_FILE)
+    SCORE_CACHE = ScoreCache(SCORE_CACHE_FILE)
+    NIKKEI_SCORING = ScoringRule(NIKKEI_MATCHER, per_category={"nikkei_china": 5, "nikkei_japan": -3},
+                                 none_of=("nikkei_china", "nikkei_japan"), none_penalty=1, cache=SCORE_CACHE)
+    CHINA_UP_CLOSE_SCORING = ScoringRule(NIKKEI_MATCHER, per_category={
+        "cuc_china": 5, "cuc_important": 3, "cuc_indepth": 3, "cuc_nonchina": -2, "cuc_footer": -5}, cache=SCORE_CACHE)
+    NIKKEI_QUERY = QueryProfile(NIKKEI_MATCHER, {"nikkei_china": 1.0, "cuc_china": 1.0, "cuc_important": 0.5, "cuc_indepth": 0.5})
+    SEEN_STORE = SeenStore(SEEN_BLOOM_FILE, SEEN_INDEX_FILE)
+    DECODING_PROFILES = CharsetProfiles(DECODING_PROFILE_FILE)
 
 def send_warning_email(subject, body):
     """Sendet eine Warn-E-Mail an hadobrockmeyer@gmail.com."""
@@ -35,11 +94,6 @@ def send_warning_email(subject, body):
     except Exception as e:
         print(f"❌ ERROR - send_warning_email: Fehler beim Senden der Warn-E-Mail: {str(e)}")
 
-def normalize_url(url):
-    """Entfernt Tracking-Parameter aus der URL."""
-    parsed = urllib.parse.urlparse(url)
-    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-
 def resolve_url(url):
     """Löst die ursprüngliche URL zu einer asia.nikkei.com-URL auf."""
     try:
@@ -51,47 +105,45 @@ def resolve_url(url):
     except Exception:
         return None
 
+def extract_newsletter_links(html_content, skip_titles=()):
+    """Liefert (Titel, href) aller Artikel-Kandidaten eines Newsletters – ohne URL-Auflösung."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    candidates = []
+    for link in soup.find_all("a", href=True):
+        href = link.get("href")
+        title = link.get_text(strip=True)
+        if not title or len(title) < 10 or "read more" in title.lower() or "subscribe" in title.lower():
+            continue
+        if any(skip in title for skip in skip_titles):
+            continue
+        candidates.append((title, href))
+    return candidates
+
 def score_nikkei_article(title):
     """Bewertet einen Artikel auf China-Relevanz."""
-    score = 0
-    china_keywords = ["china", "chinese", "hong kong", "taiwan", "xi jinping", "beijing", "shanghai"]
-    japan_keywords = ["japan", "japanese", "tokyo"]
-    has_china = any(keyword in title.lower() for keyword in china_keywords)
-    has_japan = any(keyword in title.lower() for keyword in japan_keywords)
-    
-    if has_china:
-        score += 5
-    if has_japan:
-        score -= 3
-    if not has_china and not has_japan:
-        score -= 1
+    hits = NIKKEI_MATCHER.match(title)
+    has_china = "nikkei_china" in hits
+    has_japan = "nikkei_japan" in hits
+    score = NIKKEI_SCORING.score_hits(hits)  # China +5, Japan -3, keins von beiden -1
     return score, has_china, has_japan
 
 def score_china_up_close_article(title):
     """Bewertet einen China Up Close-Artikel."""
-    score = 0
-    is_china = any(keyword in title.lower() for keyword in ["china", "chinese", "hong kong", "taiwan", "xi jinping"])
-    is_important = any(keyword in title.lower() for keyword in ["xi jinping", "politburo", "policy"])
-    is_indepth = any(keyword in title.lower() for keyword in ["analysis", "in depth", "cover"])
-    is_nonchina = any(keyword in title.lower() for keyword in ["japan", "india", "us", "europe"])
-    is_footer = any(keyword in title.lower() for keyword in ["subscribe", "newsletter", "app"])
-    
-    if is_china:
-        score += 5
-    if is_important:
-        score += 3
-    if is_indepth:
-        score += 3
-    if is_nonchina:
-        score -= 2
-    if is_footer:
-        score -= 5
+    hits = NIKKEI_MATCHER.match(title)
+    is_china = "cuc_china" in hits
+    is_important = "cuc_important" in hits
+    is_indepth = "cuc_indepth" in hits
+    is_nonchina = "cuc_nonchina" in hits
+    is_footer = "cuc_footer" in hits
+    score = CHINA_UP_CLOSE_SCORING.score_hits(hits)  # China +5, wichtig +3, Analyse +3, andere Länder -2, Footer -5
     return score, is_china, is_important, is_indepth, is_nonchina, is_footer
 
 def fetch_combined_china_articles():
-    """Holt die Top-5 China-Artikel aus Nikkei Asia und China Up Close."""
+    """Holt die Top-5 China-Artikel aus Nikkei Asia und China Up Close: [(Titel, URL, Link-Schlüssel)]."""
     seen_posts = set()
-    articles = []
+    # Rangfolge (BM25, Keyword-Score); schwächere Kandidaten werden vor dem Auflösen der URL verworfen
+    relevance_index = BM25Index(BM25_INDEX_FILE)
+    selector = TopKSelector(TOP_K, SECTION_TOP_K)
     substack_mail = os.getenv("SUBSTACK_MAIL")
     
     if not substack_mail:
@@ -118,35 +170,42 @@ def fetch_combined_china_articles():
         print(f"Nikkei Asia: {len(data[0].split())} E-Mails gefunden")
         nikkei_count = 0
         
-        for eid in data[0].split():
+        email_ids, skipped = filter_by_subject(mail, data[0].split(), NIKKEI_MATCHER, "nikkei_subject_skip")
+        for eid, subject in skipped:
+            print(f"Nikkei Asia: Betreff übersprungen (kein Body-Download): {subject}")
+        for eid in email_ids:
             result, msg_data = mail.fetch(eid, "(RFC822)")
             msg = email.message_from_bytes(msg_data[0][1])
             for part in msg.walk():
                 if part.get_content_type() == "text/html":
-                    charset = part.get_content_charset() or 'utf-8'
-                    try:
-                        html_content = part.get_payload(decode=True).decode(charset)
-                    except UnicodeDecodeError:
-                        html_content = part.get_payload(decode=True).decode('windows-1252', errors='replace')
-                    soup = BeautifulSoup(html_content, "html.parser")
-                    links = soup.find_all("a", href=True)
-                    
-                    for link in links:
-                        href = link.get("href")
-                        title = link.get_text(strip=True)
-                        if not title or len(title) < 10 or "read more" in title.lower() or "subscribe" in title.lower():
+                    html_content = DECODING_PROFILES.decode(
+                        part.get_payload(decode=True) or b"", EMAIL_NIKKEI_ASIA, part.get_content_charset(),
+                        part.get("Content-Transfer-Encoding"),
+                    )
+                    candidates = extract_newsletter_links(html_content)
+                    # Alle Kandidaten in einem Aufruf bewerten; URLs nur für relevante auflösen
+                    # (Score > 0 heißt bei Nikkei immer China-Bezug)
+                    scores = NIKKEI_SCORING.score_batch(title for title, href in candidates)
+                    relevant = [(title, href, score) for (title, href), score in zip(candidates, scores) if score > 0]
+                    relevance_index.add_documents(title for title, href, score in relevant)
+                    bm25_scores = relevance_index.score_batch([title for title, href, score in relevant], NIKKEI_QUERY)
+                    for (title, href, score), bm25_score in zip(relevant, bm25_scores):
+                        rank = (bm25_score, score)
+                        if not selector.accepts("Nikkei Asia", rank):
+                            continue
+                        # Bereits versendet? Erst Link und Titel prüfen, nur unbekannte Links auflösen (HTTP)
+                        link_key = canonicalize_url(href)
+                        if link_key in seen_posts or SEEN_STORE.seen(link_key, TITLE_NORMALIZER.key(title)):
                             continue
                         final_url = resolve_url(href)
                         if not final_url or "asia.nikkei.com" not in final_url:
                             continue
-                        normalized_url = normalize_url(final_url)
-                        if normalized_url in seen_posts:
+                        normalized_url = canonicalize_url(final_url)
+                        if normalized_url in seen_posts or SEEN_STORE.seen(normalized_url):
                             continue
-                        score, is_china, is_japan = score_nikkei_article(title)
-                        if score > 0 and is_china:
-                            articles.append((title, final_url, score, "Nikkei Asia"))
-                            seen_posts.add(normalized_url)
-                            nikkei_count += 1
+                        selector.offer("Nikkei Asia", rank, (title, final_url, link_key))
+                        seen_posts.update((link_key, normalized_url))
+                        nikkei_count += 1
         print(f"Nikkei Asia: {nikkei_count} Artikel hinzugefügt")
     except Exception as e:
         print(f"❌ ERROR - fetch_combined_china_articles: Fehler bei Nikkei Asia: {str(e)}")
@@ -158,37 +217,40 @@ def fetch_combined_china_articles():
         print(f"China Up Close: {len(data[0].split())} E-Mails gefunden")
         china_up_close_count = 0
         
-        for eid in data[0].split():
+        email_ids, skipped = filter_by_subject(mail, data[0].split(), NIKKEI_MATCHER, "nikkei_subject_skip")
+        for eid, subject in skipped:
+            print(f"China Up Close: Betreff übersprungen (kein Body-Download): {subject}")
+        for eid in email_ids:
             result, msg_data = mail.fetch(eid, "(RFC822)")
             msg = email.message_from_bytes(msg_data[0][1])
             for part in msg.walk():
                 if part.get_content_type() == "text/html":
-                    charset = part.get_content_charset() or 'utf-8'
-                    try:
-                        html_content = part.get_payload(decode=True).decode(charset)
-                    except UnicodeDecodeError:
-                        html_content = part.get_payload(decode=True).decode('windows-1252', errors='replace')
-                    soup = BeautifulSoup(html_content, "html.parser")
-                    links = soup.find_all("a", href=True)
-                    
-                    for link in links:
-                        href = link.get("href")
-                        title = link.get_text(strip=True)
-                        if not title or len(title) < 10 or "read more" in title.lower() or "subscribe" in title.lower():
+                    html_content = DECODING_PROFILES.decode(
+                        part.get_payload(decode=True) or b"", EMAIL_CHINA_UP_CLOSE, part.get_content_charset(),
+                        part.get("Content-Transfer-Encoding"),
+                    )
+                    candidates = extract_newsletter_links(html_content, CHINA_UP_CLOSE_SKIP_TITLES)
+                    scores = CHINA_UP_CLOSE_SCORING.score_batch(title for title, href in candidates)
+                    relevant = [(title, href, score) for (title, href), score in zip(candidates, scores) if score > 0]
+                    relevance_index.add_documents(title for title, href, score in relevant)
+                    bm25_scores = relevance_index.score_batch([title for title, href, score in relevant], NIKKEI_QUERY)
+                    for (title, href, score), bm25_score in zip(relevant, bm25_scores):
+                        rank = (bm25_score, score)
+                        if not selector.accepts("China Up Close", rank):
                             continue
-                        if "This week's China Up Close focuses on" in title or "Read Katsuji Nakazawa's analysis here" in title:
+                        # Bereits versendet? Erst Link und Titel prüfen, nur unbekannte Links auflösen (HTTP)
+                        link_key = canonicalize_url(href)
+                        if link_key in seen_posts or SEEN_STORE.seen(link_key, TITLE_NORMALIZER.key(title)):
                             continue
                         final_url = resolve_url(href)
                         if not final_url or "asia.nikkei.com" not in final_url:
                             continue
-                        normalized_url = normalize_url(final_url)
-                        if normalized_url in seen_posts:
+                        normalized_url = canonicalize_url(final_url)
+                        if normalized_url in seen_posts or SEEN_STORE.seen(normalized_url):
                             continue
-                        score, is_china, is_important, is_indepth, is_nonchina, is_footer = score_china_up_close_article(title)
-                        if score > 0:
-                            articles.append((title, final_url, score, "China Up Close"))
-                            seen_posts.add(normalized_url)
-                            china_up_close_count += 1
+                        selector.offer("China Up Close", rank, (title, final_url, link_key))
+                        seen_posts.update((link_key, normalized_url))
+                        china_up_close_count += 1
         print(f"China Up Close: {china_up_close_count} Artikel hinzugefügt")
     except Exception as e:
         print(f"❌ ERROR - fetch_combined_china_articles: Fehler bei China Up Close: {str(e)}")
@@ -196,19 +258,25 @@ def fetch_combined_china_articles():
 
     mail.logout()
     
-    # Sortiere nach Score (absteigend) und wähle die Top-5
-    articles.sort(key=lambda x: x[2], reverse=True)
-    articles = articles[:5]
-    print(f"Top-5 Artikel ausgewählt")
-    return [f"• <a href=\"{url}\">{title}</a>" for title, url, score, source in articles]
+    relevance_index.save()
+    SCORE_CACHE.save()
+    # Beste zuerst: BM25-Relevanz, bei Gleichstand Keyword-Score
+    articles = [article for source, rank, article in selector.ranked()]
+    trending = TrendingCounters(TRENDING_FILE)
+    gazetteer = EntityGazetteer(ENTITY_GAZETTEER_FILE)
+    for title, url, link_key in articles:
+        trending.add_item(title, gazetteer.entities(title))
+    trending.save()
+    print(f"Top-{TOP_K} Artikel ausgewählt ({selector.offered} angeboten, {selector.discarded} verdrängt)")
+    return articles
 
 def send_article_email(china_articles):
-    """Sendet eine kombinierte E-Mail mit den Top-5 China-Artikeln."""
+    """Sendet eine kombinierte E-Mail mit den Top-5 China-Artikeln [(Titel, URL, Link-Schlüssel)]. Rückgabe: True bei Erfolg."""
     try:
         substack_mail = os.getenv("SUBSTACK_MAIL")
         if not substack_mail:
             print("❌ ERROR - send_article_email: SUBSTACK_MAIL nicht gesetzt")
-            return
+            return False
         user_part, pass_part = substack_mail.split(";")
         email_user = user_part.split("=")[1]
         email_password = pass_part.split("=")[1]
@@ -216,7 +284,7 @@ def send_article_email(china_articles):
         
         china_section = "<p><strong>## 📜 Nikkei Top Artikel:</strong></p>\n<ul>\n"
         if china_articles:
-            china_section += "".join(f"<li>{article}</li>\n" for article in china_articles)
+            china_section += "".join(f"<li>• <a href=\"{url}\">{title}</a></li>\n" for title, url, _ in china_articles)
         else:
             china_section += "<li>Keine Nikkei-Artikel gefunden.</li>\n"
         china_section += "</ul>\n"
@@ -230,14 +298,22 @@ def send_article_email(china_articles):
             server.login(email_user, email_password)
             server.send_message(msg)
         print(f"Kombinierte E-Mail gesendet: {subject}")
+        return True
     except Exception as e:
         print(f"❌ ERROR - send_article_email: Fehler beim Senden der kombinierten E-Mail: {str(e)}")
         send_warning_email("Fehler beim Senden der Nikkei Top Artikel-E-Mail", f"Unerwarteter Fehler: {str(e)}")
+        return False
 
 def main():
     print(f"Starte Nikkei Top Artikel um {datetime.now()}")
+    setup_pipeline()
     china_articles = fetch_combined_china_articles()
-    send_article_email(china_articles)
+    DECODING_PROFILES.save()
+    if send_article_email(china_articles):
+        for title, url, link_key in china_articles:
+            SEEN_STORE.mark(canonicalize_url(url), TITLE_NORMALIZER.key(title))
+            SEEN_STORE.mark(link_key)  # Newsletter-Link: beim nächsten Lauf ohne Auflösen erkannt
+        SEEN_STORE.save()
     print(f"Fertig um {datetime.now()}")
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+"""
+Lineare Relevanz-Scores über Keyword-Kategorien – einzeln oder als Batch.
+
+Eine ScoringRule beschreibt einen Scorer (CSIS, Think Tanks, Nikkei, ...) als
+Gewichtsvektor über die Keywords eines KeywordMatcher. score() bewertet einen
+einzelnen Text, score_batch() alle Kandidaten eines Tages auf einmal: gleiche
+Texte nur einmal, und die Zeilen der Term-Inzidenzmatrix (Spalten-Sets aus
+KeywordMatcher.incidence()) werden direkt mit vorberechneten Spaltengewichten
+summiert, ohne Treffer-Dict pro Text. Eine NumPy/SciPy-Variante brachte
+gegenüber dieser Schleife keinen messbaren Gewinn (das Matching dominiert).
+
+Mit einem ScoreCache werden Scores pro normalisiertem Titel und Regel-Version
+(inkl. Lexikon-Version) auf der Festplatte gemerkt – dieselbe Schlagzeile aus
+mehreren Newslettern oder an mehreren Tagen wird nur einmal bewertet.
+"""
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SCORE_CACHE_FORMAT = 1
+SCORE_CACHE_MAX_ENTRIES = 20000  # älteste (zuletzt ungenutzte) Einträge fliegen beim Speichern raus
+
+
+class ScoreCache:
+    """
+    Kompakter Disk-Cache für Scores: "<Regel-Version>:<Hash des normalisierten Textes>" → Score.
+    LRU-Reihenfolge (Treffer rücken ans Ende); Einträge alter Lexikon-Versionen
+    werden nicht mehr getroffen und altern so heraus.
+    """
+
+    def __init__(self, path=None, max_entries=SCORE_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def key(version, normalized_text):
+        return f"{version}:{hashlib.sha1(normalized_text.encode('utf-8')).hexdigest()[:16]}"
+
+    def get(self, key):
+        score = self.entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        self.entries[key] = score
+        self.entries.move_to_end(key)
+        self._dirty = True
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Score-Cache unlesbar, starte leer: {str(e)}")
+            return
+        if data.get("format") == SCORE_CACHE_FORMAT:
+            self.entries = OrderedDict(data.get("entries", {}))
+
+    def save(self):
+        if self.hits or self.misses:
+            logger.info(f"Score-Cache: {self.hits} Treffer, {self.misses} neu bewertet")
+        if not self.path or not self._dirty:
+            return
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": SCORE_CACHE_FORMAT, "entries": self.entries}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern des Score-Caches: {str(e)}")
+
+
+class ScoringRule:
+    """
+    score = base
+            + Σ per_keyword[k] · (Anzahl getroffener Keywords der Kategorie k)
+            + Σ per_category[k] · (Kategorie k getroffen)
+            - none_penalty, falls keine Kategorie aus none_of getroffen wurde
+
+    gate: ohne Treffer in dieser Kategorie ist der Score 0.
+    floor: Untergrenze des Scores (None = keine).
+    cache: optionaler ScoreCache, wird vor jeder Berechnung gefragt.
+    """
+
+    def __init__(self, matcher, base=0, per_keyword=None, per_category=None,
+                 gate=None, none_of=(), none_penalty=0, floor=None, cache=None):
+        self.matcher = matcher
+        self.base = base
+        self.per_keyword = dict(per_keyword or {})
+        self.per_category = dict(per_category or {})
+        self.gate = gate
+        self.none_of = tuple(none_of)
+        self.none_penalty = none_penalty
+        self.floor = floor
+        self.cache = cache
+        self._vectors = None
+        self._vectors_key = None
+
+    @property
+    def version(self):
+        """Version für Cache-Schlüssel: Matcher-Version + Gewichte der Regel."""
+        rule = (self.base, sorted(self.per_keyword.items()), sorted(self.per_category.items()),
+                self.gate, self.none_of, self.none_penalty, self.floor)
+        return hashlib.sha1(f"{self.matcher.version}:{rule!r}".encode("utf-8")).hexdigest()[:12]
+
+    # ------------------------------------------------------------------
+    # Einzeln
+    # ------------------------------------------------------------------
+    def score_hits(self, hits):
+        """Score aus einem Ergebnis von KeywordMatcher.match()."""
+        if self.gate and self.gate not in hits:
+            return 0
+        score = self.base
+        for category, weight in self.per_keyword.items():
+            score += weight * len(hits.get(category, ()))
+        for category, weight in self.per_category.items():
+            if category in hits:
+                score += weight
+        if self.none_of and not any(category in hits for category in self.none_of):
+            score -= self.none_penalty
+        if self.floor is not None:
+            score = max(score, self.floor)
+        return score
+
+    def score(self, *texts):
+        if self.cache is None:
+            return self.score_hits(self.matcher.match(*texts))
+        key = self.cache.key(self.version, self.matcher.normalize(*texts))
+        score = self.cache.get(key)
+        if score is None:
+            score = self.score_hits(self.matcher.match(*texts))
+            self.cache.put(key, score)
+        return score
+
+    # ------------------------------------------------------------------
+    # Batch
+    # ------------------------------------------------------------------
+    def _build_vectors(self, keyword_list):
+        """Gewicht und Regel-Kategorien pro Spalte (pro Matcher-Stand einmal)."""
+        if self._vectors is not None and self._vectors_key is keyword_list:
+            return self._vectors
+        relevant = set(self.per_category) | set(self.none_of) | ({self.gate} if self.gate else set())
+        keyword_categories = self.matcher.keyword_categories
+        weights = []
+        categories = []
+        for keyword in keyword_list:
+            names = keyword_categories.get(keyword, ())
+            weights.append(sum(self.per_keyword.get(name, 0) for name in names))
+            categories.append(frozenset(name for name in names if name in relevant))
+        self._vectors = (weights, categories)
+        self._vectors_key = keyword_list
+        return self._vectors
+
+    def score_batch(self, texts):
+        """
+        Scores für alle Texte in einem Aufruf (Liste, gleiche Reihenfolge).
+        Ein Text darf auch ein Tupel sein, z.B. (Titel, Beschreibung).
+        """
+        texts = [text if isinstance(text, str) else " ".join(text) for text in texts]
+        if not texts:
+            return []
+        if self.cache is None:
+            return self._score_batch(texts)
+
+        # Nur Texte ohne Cache-Eintrag werden berechnet (gleiche Texte einmal)
+        version = self.version
+        keys = [self.cache.key(version, self.matcher.normalize(text)) for text in texts]
+        scores = [self.cache.get(key) for key in keys]
+        missing = {}
+        for key, text, score in zip(keys, texts, scores):
+            if score is None:
+                missing.setdefault(key, text)
+        if missing:
+            for key, score in zip(missing, self._score_batch(list(missing.values()))):
+                self.cache.put(key, score)
+            scores = [self.cache.entries[key] if score is None else score for key, score in zip(keys, scores)]
+        return scores
+
+    def _score_batch(self, texts):
+        keyword_list, rows = self.matcher.incidence(texts)
+        weights, column_categories = self._build_vectors(keyword_list)
+        scores = []
+        for row in rows:
+            present = set()
+            score = self.base
+            for column in row:
+                score += weights[column]
+                present |= column_categories[column]
+            if self.gate and self.gate not in present:
+                scores.append(0)
+                continue
+            for category in present:
+                score += self.per_category.get(category, 0)
+            if self.none_of and present.isdisjoint(self.none_of):
+                score -= self.none_penalty
+            if self.floor is not None:
+                score = max(score, self.floor)
+            scores.append(score)
+        return scores
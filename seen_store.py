@@ -0,0 +1,191 @@
+"""
+Tagesübergreifendes Gedächtnis bereits versendeter Artikel.
+
+Mit einem Suchfenster von mehreren Tagen tauchen die Artikel von gestern
+heute wieder auf. SeenStore merkt sich kanonische URLs und Titel-Fingerprints
+aller versendeten Artikel:
+
+- Ein rollierender Bloom-Filter (eine Generation pro Woche) beantwortet
+  "sicher neu" ohne weiteren Plattenzugriff – das ist der Normalfall.
+- Nur wenn der Filter "vielleicht gesehen" sagt, lädt SeenStore den
+  exakten Index (dedup_index.RollingDedupIndex, JSON) und bestätigt;
+  Fehlalarme des Filters kosten also keine Artikel.
+
+Abgelaufene Generationen werden verworfen, abgelaufene Tage im Index beim
+Schreiben gelöscht. Committet wird nur der Index; der Bloom-Filter ist eine
+lokale Arbeitskopie und wird aus dem Index neu aufgebaut, wenn er fehlt oder
+älter ist.
+"""
+import base64
+import hashlib
+import json
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+
+from dedup_index import RollingDedupIndex
+
+logger = logging.getLogger(__name__)
+
+SEEN_STORE_FORMAT = 1
+SEEN_DAYS = 30               # so lange gilt ein Artikel als bereits versendet
+SEEN_GENERATION_DAYS = 7     # Laufzeit einer Bloom-Generation
+SEEN_CAPACITY = 4000         # Schlüssel pro Generation
+SEEN_FALSE_POSITIVE = 0.01   # Ziel-Fehlalarmrate pro Generation
+
+
+def fingerprint(kind, value):
+    return f"{kind}:{hashlib.sha1(value.encode('utf-8')).hexdigest()[:16]}"
+
+
+class BloomFilter:
+    """Bit-Array mit k Positionen pro Schlüssel (Double Hashing über SHA-1)."""
+
+    def __init__(self, size, hashes, bits=None):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray((size + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, false_positive):
+        size = math.ceil(-capacity * math.log(false_positive) / math.log(2) ** 2)
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes)
+
+    def _positions(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SeenStore:
+    """
+    bloom_path: JSON mit den Bloom-Generationen [{start, bits}],
+    index_path: JSON-Datei des exakten Index (Schlüssel → Tag).
+    """
+
+    def __init__(self, bloom_path=None, index_path=None, days=SEEN_DAYS, generation_days=SEEN_GENERATION_DAYS,
+                 capacity=SEEN_CAPACITY, false_positive=SEEN_FALSE_POSITIVE):
+        self.bloom_path = bloom_path
+        self.days = days
+        self.generation_days = generation_days
+        self.capacity = capacity
+        self.false_positive = false_positive
+        self.index = RollingDedupIndex(index_path, days=days)
+        self.generations = []  # [(Starttag, BloomFilter)], älteste zuerst
+        self._dirty = False
+        self.bloom_negatives = 0
+        self.exact_lookups = 0
+        self.load()
+
+    @staticmethod
+    def today():
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def _generation_end(self, start):
+        return (datetime.strptime(start, "%Y-%m-%d") + timedelta(days=self.generation_days)).strftime("%Y-%m-%d")
+
+    def _new_generation(self, start):
+        self.generations.append((start, BloomFilter.for_capacity(self.capacity, self.false_positive)))
+        self._dirty = True
+
+    # --- Datei --------------------------------------------------------------
+    def load(self):
+        if self.bloom_path:
+            try:
+                with open(self.bloom_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("format") == SEEN_STORE_FORMAT:
+                    size, hashes = data["size"], data["hashes"]
+                    self.generations = [
+                        (generation["start"], BloomFilter(size, hashes, base64.b64decode(generation["bits"])))
+                        for generation in data.get("generations", [])
+                    ]
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Bloom-Filter unlesbar, wird aus dem Index neu aufgebaut: {str(e)}")
+                self.generations = []
+        if self.generations and self.index.newer_than(self.bloom_path):
+            # Index aus einem anderen Lauf (git pull): der lokale Filter kennt dessen Schlüssel nicht
+            self.generations = []
+        if not self.generations and self.index.exists():
+            self._rebuild_from_index()
+        self._rotate(self.today())
+
+    def _rebuild_from_index(self):
+        keys = self.index.keys()
+        for key, day in keys:
+            if not self.generations or day >= self._generation_end(self.generations[-1][0]):
+                self._new_generation(day)
+            self.generations[-1][1].add(key)
+        logger.info(f"Bloom-Filter aus dem Index aufgebaut: {len(keys)} Schlüssel")
+
+    def _rotate(self, today):
+        """Verwirft abgelaufene Generationen und beginnt bei Bedarf eine neue."""
+        cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=self.days)).strftime("%Y-%m-%d")
+        expired = [start for start, _ in self.generations if self._generation_end(start) <= cutoff]
+        if expired:
+            self.generations = self.generations[len(expired):]
+            self._dirty = True
+        if not self.generations or today >= self._generation_end(self.generations[-1][0]):
+            self._new_generation(today)
+
+    def save(self):
+        self.index.commit()
+        if not self.bloom_path or not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.bloom_path) or ".", exist_ok=True)
+            size, hashes = self.generations[-1][1].size, self.generations[-1][1].hashes
+            tmp_path = self.bloom_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format": SEEN_STORE_FORMAT,
+                    "size": size,
+                    "hashes": hashes,
+                    "generations": [
+                        {"start": start, "bits": base64.b64encode(bytes(bloom.bits)).decode("ascii")}
+                        for start, bloom in self.generations
+                    ],
+                }, f)
+            os.replace(tmp_path, self.bloom_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern des Bloom-Filters: {str(e)}")
+
+    # --- Abfragen -----------------------------------------------------------
+    def _keys(self, url, title):
+        keys = []
+        if url:
+            keys.append(fingerprint("url", url))
+        if title:
+            keys.append(fingerprint("title", title))
+        return keys
+
+    def seen(self, url=None, title=None):
+        """True, wenn URL (kanonisch) oder Titel (normalisiert) schon versendet wurde."""
+        maybe = [key for key in self._keys(url, title) if any(key in bloom for _, bloom in self.generations)]
+        if not maybe:
+            self.bloom_negatives += 1
+            return False
+        self.exact_lookups += 1
+        return any(self.index.contains(key) for key in maybe)
+
+    def mark(self, url=None, title=None, day=None):
+        """Merkt sich einen versendeten Artikel."""
+        keys = self._keys(url, title)
+        bloom = self.generations[-1][1]
+        for key in keys:
+            bloom.add(key)
+        self.index.add_many(keys, day)
+        self._dirty = True
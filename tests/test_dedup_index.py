@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_index import RollingDedupIndex
+
+
+def days_ago(days):
+    return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def test_existing_key_keeps_the_later_day():
+    index = RollingDedupIndex(days=30)
+    index.add("url:a", days_ago(5))
+    index.add("url:a", days_ago(10))
+    assert index.day("url:a") == days_ago(5)
+    index.add("url:a", days_ago(1))
+    assert index.day("url:a") == days_ago(1)
+
+
+def test_contains_and_len_only_count_the_retention_window():
+    index = RollingDedupIndex(days=30)
+    index.add_many(["url:new", "title:new"], days_ago(2))
+    index.add("url:old", days_ago(45))
+    assert index.contains("url:new")
+    assert not index.contains("url:old")
+    assert not index.contains("url:unknown")
+    assert len(index) == 2
+    assert [key for key, _ in index.keys()] == ["url:new", "title:new"]
+
+
+def test_commit_writes_one_sorted_entry_per_line_without_expired_days(tmp_path):
+    path = tmp_path / "seen_articles.json"
+    index = RollingDedupIndex(str(path), days=30)
+    index.add("url:b", days_ago(1))
+    index.add("url:a", days_ago(3))
+    index.add("url:expired", days_ago(31))
+    index.commit()
+
+    entry_lines = [line for line in path.read_text(encoding="utf-8").splitlines() if line.startswith('"url:')]
+    assert entry_lines == [f'"url:a": "{days_ago(3)}",', f'"url:b": "{days_ago(1)}"']
+
+
+def test_reload_drops_expired_entries_from_the_file(tmp_path):
+    path = tmp_path / "seen_articles.json"
+    path.write_text(json.dumps({"format": 1, "entries": {"url:a": days_ago(1), "url:old": days_ago(90)}}), encoding="utf-8")
+    index = RollingDedupIndex(str(path), days=30)
+    assert index.contains("url:a")
+    assert index.day("url:old") is None
+    assert len(index) == 1
+
+
+def test_unreadable_or_foreign_file_starts_empty(tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json", encoding="utf-8")
+    assert len(RollingDedupIndex(str(broken))) == 0
+    foreign = tmp_path / "foreign.json"
+    foreign.write_text(json.dumps({"format": 99, "entries": {"url:a": days_ago(1)}}), encoding="utf-8")
+    assert not RollingDedupIndex(str(foreign)).contains("url:a")
+
+
+def test_commit_without_changes_does_not_write(tmp_path):
+    path = tmp_path / "seen_articles.json"
+    index = RollingDedupIndex(str(path))
+    assert not index.contains("url:a")
+    index.commit()
+    assert not path.exists()
@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_duplicates import NearDuplicateIndex, jaccard, lsh_bands, title_terms
+
+
+def test_band_selection_puts_the_s_curve_just_below_the_threshold():
+    for threshold in (0.5, 0.7, 0.9):
+        bands, rows = lsh_bands(threshold, 64)
+        assert bands * rows == 64
+        assert (1 / bands) ** (1 / rows) <= threshold
+        # die nächstgrößere Zeilenzahl läge schon über der Schwelle
+        larger = [r for r in range(rows + 1, 65) if 64 % r == 0]
+        assert all((1 / (64 // r)) ** (1 / r) > threshold for r in larger)
+    assert lsh_bands(0.7, 64) == (16, 4)
+
+
+def test_title_terms_drop_stopwords_and_plural_s():
+    assert title_terms("The Future of China's Tariffs") == frozenset({"future", "china", "tariff"})
+    assert jaccard(frozenset({"a", "b"}), frozenset({"b", "c"})) == 1 / 3
+    assert jaccard(frozenset(), frozenset({"a"})) == 0.0
+
+
+def test_reworded_headline_is_found_and_unrelated_one_is_not():
+    index = NearDuplicateIndex()
+    index.add("China Export Controls Reshape Global Semiconductor Supply Chains", "MERICS")
+    match = index.find("How China's Export Controls Reshape the Global Semiconductor Supply Chain")
+    assert match is not None
+    similarity, value = match
+    assert similarity >= index.threshold
+    assert value == "MERICS"
+    assert index.find("Japan Election Results and the Future of the LDP") is None
+
+
+def test_short_titles_are_never_near_duplicates():
+    index = NearDuplicateIndex()
+    index.add("China Trade", "a")
+    assert index.find("China Trade") is None
+
+
+def test_signatures_are_deterministic_per_seed():
+    terms = title_terms("Beijing weighs new stimulus for property sector")
+    assert NearDuplicateIndex(seed=1).signature(terms) == NearDuplicateIndex(seed=1).signature(terms)
+    assert NearDuplicateIndex(seed=1).signature(terms) != NearDuplicateIndex(seed=2).signature(terms)
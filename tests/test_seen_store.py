@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seen_store import BloomFilter, SeenStore, fingerprint
+
+
+def make_store(tmp_path, **kwargs):
+    return SeenStore(str(tmp_path / "seen_bloom.json"), str(tmp_path / "seen_articles.json"), **kwargs)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter.for_capacity(500, 0.01)
+    keys = [f"url:{i}" for i in range(500)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"title:{i}" in bloom for i in range(2000))
+    assert false_positives < 100
+
+
+def test_unseen_article_is_answered_by_the_bloom_filter(tmp_path):
+    store = make_store(tmp_path)
+    assert not store.seen("https://example.org/a", "a title")
+    assert store.bloom_negatives == 1
+    assert store.exact_lookups == 0
+
+
+def test_marked_article_is_seen_by_url_or_title_after_reload(tmp_path):
+    store = make_store(tmp_path)
+    store.mark("https://example.org/a", "china trade talks")
+    store.save()
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.seen("https://example.org/a")
+    assert reloaded.seen(None, "china trade talks")
+    assert reloaded.seen("https://example.org/other", "china trade talks")
+    assert not reloaded.seen("https://example.org/b", "another title")
+    assert reloaded.exact_lookups == 3
+
+
+def test_bloom_false_positive_is_rejected_by_the_exact_index(tmp_path):
+    store = make_store(tmp_path)
+    saturated = BloomFilter(64, 3, b"\xff" * 8)  # jeder Schlüssel ist "vielleicht gesehen"
+    store.generations = [(store.today(), saturated)]
+    assert not store.seen("https://example.org/never-sent")
+    assert store.exact_lookups == 1
+    assert store.bloom_negatives == 0
+
+
+def test_missing_bloom_file_is_rebuilt_from_the_index(tmp_path):
+    store = make_store(tmp_path)
+    store.mark("https://example.org/a")
+    store.save()
+    os.remove(tmp_path / "seen_bloom.json")
+
+    rebuilt = make_store(tmp_path)
+    assert rebuilt.seen("https://example.org/a")
+
+
+def test_index_from_another_run_replaces_the_local_bloom_filter(tmp_path):
+    local = make_store(tmp_path)
+    local.save()
+    # Ein anderer Lauf hat den Index geschrieben (z.B. per git pull übernommen)
+    index_path = tmp_path / "seen_articles.json"
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"format": 1, "entries": {fingerprint("url", "https://example.org/remote"): local.today()}}, f)
+    later = time.time() + 10
+    os.utime(index_path, (later, later))
+
+    store = make_store(tmp_path)
+    assert store.seen("https://example.org/remote")
+
+
+def test_generations_expire_after_the_retention_window(tmp_path):
+    store = make_store(tmp_path, days=30, generation_days=7)
+    store.generations = []
+    store._new_generation("2000-01-01")
+    store._rotate(store.today())
+    assert [start for start, _ in store.generations] == [store.today()]
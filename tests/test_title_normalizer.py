@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from title_normalizer import TitleNormalizer
+
+CONFIG = {
+    "_comment": "ignoriert",
+    "*": {"prefixes": ["Fwd: "], "suffixes": [" | Brookings"]},
+    "MERICS": {"prefixes": ["MERICS China Essentials: ", "MERICS "]},
+}
+
+
+def make_normalizer(tmp_path):
+    path = tmp_path / "title_prefixes.json"
+    path.write_text(json.dumps(CONFIG), encoding="utf-8")
+    return TitleNormalizer(str(path))
+
+
+def test_longest_source_prefix_and_global_affixes_are_removed(tmp_path):
+    normalizer = make_normalizer(tmp_path)
+    assert normalizer.clean("MERICS China Essentials: Beijing's new export rules", "MERICS") == "Beijing's new export rules"
+    assert normalizer.clean("MERICS Briefing on Taiwan", "MERICS") == "Briefing on Taiwan"
+    assert normalizer.clean("Fwd: China's growth outlook | Brookings", "Brookings") == "China's growth outlook"
+
+
+def test_source_prefixes_only_apply_to_their_source(tmp_path):
+    normalizer = make_normalizer(tmp_path)
+    assert normalizer.clean("MERICS Briefing on Taiwan", "Lowy") == "MERICS Briefing on Taiwan"
+
+
+def test_a_title_that_is_only_a_prefix_is_kept(tmp_path):
+    normalizer = make_normalizer(tmp_path)
+    assert normalizer.clean("MERICS ", "MERICS") == "MERICS"
+
+
+def test_whitespace_and_fullwidth_characters_are_normalized():
+    normalizer = TitleNormalizer()
+    assert normalizer.clean("  China　trade\n talks  ") == "China trade talks"
+    assert normalizer.clean("ＣＨＩＮＡ") == "CHINA"
+
+
+def test_key_folds_case_apostrophes_and_punctuation():
+    normalizer = TitleNormalizer()
+    assert normalizer.key("China’s US–China Policy") == normalizer.key("china's us-china policy") == "chinas us china policy"
+    assert normalizer.key("Trade: what next?") == "trade what next"
+
+
+def test_version_changes_with_the_configuration(tmp_path):
+    assert make_normalizer(tmp_path).version != TitleNormalizer().version
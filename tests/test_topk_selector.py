@@ -0,0 +1,59 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topk_selector import TopKSelector
+
+
+def test_section_limit_evicts_the_weakest_entry_of_that_section():
+    selector = TopKSelector(limit=10, section_limit=2)
+    selector.offer("CSIS", 1.0, "a")
+    selector.offer("CSIS", 3.0, "b")
+    assert selector.offer("CSIS", 2.0, "c")
+    assert selector.by_section() == {"CSIS": ["b", "c"]}
+    assert selector.discarded == 1
+
+
+def test_global_limit_evicts_across_sections():
+    selector = TopKSelector(limit=2, section_limit=5)
+    selector.offer("CSIS", 1.0, "a")
+    selector.offer("MERICS", 2.0, "b")
+    selector.offer("Lowy", 3.0, "c")
+    assert selector.ranked() == [("Lowy", 3.0, "c"), ("MERICS", 2.0, "b")]
+    assert selector.by_section() == {"MERICS": ["b"], "Lowy": ["c"]}
+
+
+def test_on_a_tie_the_earlier_offer_stays():
+    selector = TopKSelector(limit=2)
+    selector.offer("A", 1.0, "first")
+    selector.offer("B", 1.0, "second")
+    assert not selector.accepts("C", 1.0)
+    assert not selector.offer("C", 1.0, "third")
+    assert selector.offer("C", 1.5, "fourth")
+    assert [item for _, _, item in selector.ranked()] == ["fourth", "first"]
+
+
+def test_accepts_does_not_change_the_selection():
+    selector = TopKSelector(limit=1)
+    selector.offer("A", 2.0, "kept")
+    assert not selector.accepts("A", 1.0)
+    assert selector.accepts("B", 3.0)
+    assert selector.ranked() == [("A", 2.0, "kept")]
+    assert selector.offered == 1
+
+
+def test_section_order_follows_the_offer_order_and_tuple_scores_compare():
+    selector = TopKSelector(limit=None, section_limit=3, section_limits={"Nikkei": 1})
+    selector.offer("CSIS", (0.5, 7), "late-high")
+    selector.offer("CSIS", (0.5, 5), "low")
+    selector.offer("CSIS", (1.0, 0), "high")
+    selector.offer("Nikkei", (0.1, 1), "n1")
+    selector.offer("Nikkei", (0.2, 0), "n2")
+    assert selector.by_section() == {"CSIS": ["late-high", "low", "high"], "Nikkei": ["n2"]}
+
+
+def test_zero_limit_accepts_nothing():
+    selector = TopKSelector(limit=5, section_limits={"Muted": 0})
+    assert not selector.offer("Muted", 100.0, "x")
+    assert selector.ranked() == []
@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracking_links import TrackingResolver, link_key
+from url_canonicalizer import canonicalize_url
+
+DYNAMICS_BASE = "https://assets-eur.mkt.dynamics.com/x/digitalassets/c"
+
+
+def dynamics_link(target):
+    query = urllib.parse.urlencode({
+        "msdynmkt_target": json.dumps({"TargetUrl": target}),
+        "msdynmkt_trackingcontext": "recipient-123",
+    })
+    return f"{DYNAMICS_BASE}?{query}"
+
+
+def test_query_only_tracking_links_keep_separate_destinations(tmp_path):
+    first = dynamics_link("https://example.org/articles/one")
+    second = dynamics_link("https://example.org/articles/two")
+    targets = {first: "https://example.org/articles/one", second: "https://example.org/articles/two"}
+    calls = []
+
+    def resolve(url):
+        calls.append(url)
+        return targets[url]
+
+    resolver = TrackingResolver(str(tmp_path / "tracking_links.json"), resolve=resolve)
+    assert link_key(first) != link_key(second)
+    assert canonicalize_url(first) != canonicalize_url(second)
+    assert resolver.destination(first) == "https://example.org/articles/one"
+    assert resolver.destination(second) == "https://example.org/articles/two"
+    assert calls == [first, second]
+
+    resolver.save()
+    reloaded = TrackingResolver(str(tmp_path / "tracking_links.json"), resolve=resolve)
+    assert reloaded.known(first) == "https://example.org/articles/one"
+    assert reloaded.known(second) == "https://example.org/articles/two"
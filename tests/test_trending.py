@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trending import TrendingCounters, _decay
+
+
+def test_decay_halves_per_half_life():
+    assert _decay(8.0, 2.0, 2.0) == pytest.approx(4.0)
+    assert _decay(8.0, 4.0, 2.0) == pytest.approx(2.0)
+    assert _decay(8.0, 0.0, 2.0) == 8.0
+    assert _decay(8.0, -1.0, 2.0) == 8.0
+
+
+def test_increment_catches_up_on_decay_lazily():
+    counters = TrendingCounters(half_lives=(2.0, 14.0))
+    counters.increment("term:tariff", now=100.0)
+    counters.increment("term:tariff", now=102.0)
+    fast, slow, day = counters.counters["term:tariff"]
+    assert fast == pytest.approx(1.5)
+    assert slow == pytest.approx(1 + 0.5 ** (2 / 14))
+    assert day == 102.0
+
+
+def test_each_article_is_counted_once():
+    counters = TrendingCounters()
+    assert counters.add_item("China Tariffs Rise", ["PBoC"], now=100.0)
+    assert not counters.add_item("China tariffs rise", ["PBoC"], now=101.0)
+    assert set(counters.counters) == {"term:china", "term:tariff", "term:rise", "entity:PBoC"}
+    assert counters.label("term:tariff") == "tariffs"
+    assert counters.label("entity:PBoC") == "PBoC"
+
+
+def test_a_burst_is_hot_and_a_steady_term_is_not():
+    counters = TrendingCounters()
+    for day in range(60):
+        counters.increment("term:economy", now=100.0 + day)
+    for _ in range(5):
+        counters.increment("term:chip", now=159.0)
+    hot = counters.trending(now=159.0)
+    assert [key for key, _ in hot] == ["term:chip"]
+    assert counters.heat("term:economy", now=159.0) < 1.5
+
+
+def test_a_burst_cools_off_over_time():
+    counters = TrendingCounters()
+    for _ in range(5):
+        counters.increment("term:chip", now=100.0)
+    assert counters.heat("term:chip", now=100.0) > counters.heat("term:chip", now=104.0)
+    assert counters.heat("term:chip", now=120.0) == 0.0
+
+
+def test_save_prunes_faded_counters_and_reload_keeps_the_rest(tmp_path):
+    path = str(tmp_path / "trending.json")
+    counters = TrendingCounters(path)
+    now = counters.now()
+    counters.increment("term:fresh", now=now)
+    counters.increment("term:faded", now=now - 200)
+    counters.save()
+    reloaded = TrendingCounters(path)
+    assert set(reloaded.counters) == {"term:fresh"}
@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from url_canonicalizer import canonicalize_url
+
+
+def test_scheme_host_port_fragment_and_trailing_slash_are_normalized():
+    assert canonicalize_url("HTTPS://WWW.Example.ORG:443/Reports/China/#summary") == "https://www.example.org/Reports/China"
+    assert canonicalize_url("http://example.org:80/a/") == "http://example.org/a"
+    assert canonicalize_url("https://example.org:8443/a") == "https://example.org:8443/a"
+
+
+def test_tracking_parameters_are_dropped():
+    assert canonicalize_url("https://example.org/a?utm_source=newsletter&utm_medium=email") == "https://example.org/a"
+    assert canonicalize_url("https://example.org/a?_hsenc=abc&_hsmi=1") == canonicalize_url("https://example.org/a")
+
+
+def test_identity_parameters_are_kept_in_fixed_order():
+    first = "https://merics.us1.list-manage.com/track/click?u=recipient1&id=article42&e=mail1"
+    second = "https://merics.us1.list-manage.com/track/click?e=mail2&id=article42&u=recipient2"
+    assert canonicalize_url(first) == canonicalize_url(second) == "https://merics.us1.list-manage.com/track/click?id=article42"
+    assert canonicalize_url("https://www.youtube.com/watch?v=abc&t=30s") == "https://www.youtube.com/watch?v=abc"
+    assert canonicalize_url("https://youtube.com/watch?v=abc") != canonicalize_url("https://youtube.com/watch?v=xyz")
+
+
+def test_non_http_values_are_returned_unchanged():
+    assert canonicalize_url("mailto:someone@example.org") == "mailto:someone@example.org"
+    assert canonicalize_url("") == ""
+    assert canonicalize_url("  https://example.org/a/  ") == "https://example.org/a"
+    assert canonicalize_url("https://example.org:notaport/a") == "https://example.org:notaport/a"
@@ -5,17 +5,40 @@ from email.utils import parsedate_to_datetime
 from datetime import datetime, timedelta
 import os
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 import smtplib
 from email.mime.text import MIMEText
 import urllib.parse
 import re
 import logging
 import json
-
-# Logging-Konfiguration
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
-                    handlers=[logging.FileHandler('thinktanks.log'), logging.StreamHandler()])
+import hashlib
+import inspect
+import functools
+import bisect
+import weakref
+
+from keyword_matcher import LexiconMatcher
+from relevance_scoring import ScoreCache, ScoringRule
+from bm25_index import BM25Index, QueryProfile
+from topk_selector import TopKSelector
+from entity_index import EntityGazetteer, EntityIndex
+from trending import TrendingCounters
+from article import Article
+from near_duplicates import NEAR_DUPLICATE_THRESHOLD, NearDuplicateIndex
+from seen_store import SeenStore
+from url_canonicalizer import canonicalize_url
+from tracking_links import TrackingResolver, is_tracking_url
+from title_normalizer import TitleNormalizer
+from topic_clusters import TopicClusterer
+from body_fingerprints import BodyFingerprints, body_fingerprint
+from mail_headers import decode_subject, fetch_headers
+from mail_decoding import CharsetProfiles
+
+# Logging-Konfiguration (nur wenn der Aufrufer, z.B. der Benchmark, noch keine eingerichtet hat)
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.FileHandler('thinktanks.log'), logging.StreamHandler()])
 logger = logging.getLogger(__name__)
 
 # Basisverzeichnis
@@ -24,8 +47,35 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Globale Zeitfenster-Einstellung für ALLE Think Tanks
 GLOBAL_THINKTANK_DAYS = 2  # Test: 2 Tage
 
+# Briefing-Budget: höchstens so viele Artikel insgesamt bzw. pro Abschnitt (Think Tank / CSIS-Chair / CFR-Newsletter)
+BRIEFING_TOP_K = 40
+BRIEFING_SECTION_TOP_K = 6
+
+# Persistente Caches (werden vom Workflow mit committet); THINKTANK_CACHE_DIR lenkt sie um (z.B. im Benchmark)
+CACHE_DIR = os.getenv("THINKTANK_CACHE_DIR") or os.path.join(BASE_DIR, "thinktank_cache")
+PARSE_CACHE_FILE = os.path.join(CACHE_DIR, "parse_cache.json")
+PARSE_CACHE_MAX_AGE_DAYS = 14  # Einträge älter als das Suchfenster + Puffer werden verworfen
+DECODING_PROFILE_FILE = os.path.join(CACHE_DIR, "decoding_profiles.json")
+MATCHER_CACHE_FILE = os.path.join(CACHE_DIR, "keyword_matcher.json")
+KEYWORD_LEXICON_FILE = os.path.join(BASE_DIR, "config", "keyword_lexicon.json")
+TITLE_PREFIXES_FILE = os.path.join(BASE_DIR, "config", "title_prefixes.json")
+BM25_INDEX_FILE = os.path.join(CACHE_DIR, "bm25_index.json")
+SCORE_CACHE_FILE = os.path.join(CACHE_DIR, "score_cache.json")
+ENTITY_GAZETTEER_FILE = os.path.join(BASE_DIR, "config", "entity_gazetteer.json")
+ENTITY_INDEX_FILE = os.path.join(CACHE_DIR, "entity_index.json")
+FOCUS_ENTITY_LIMIT = 8  # so viele Entitäten stehen in der "Im Fokus"-Zeile des Briefings
+TRENDING_FILE = os.path.join(CACHE_DIR, "trending.json")  # gemeinsam mit nikkei_test.py
+TRENDING_LIMIT = 6  # so viele Begriffe stehen in der "Im Trend"-Zeile des Briefings
+TOPIC_CLUSTER_FILE = os.path.join(CACHE_DIR, "topic_clusters.json")
+BRIEFING_VIEW = "source"  # Briefing-Ansicht: "source" (nach Think Tank) oder "topic" (nach Themen-Clustern)
+SEEN_BLOOM_FILE = os.path.join(CACHE_DIR, "seen_bloom.json")
+SEEN_INDEX_FILE = os.path.join(CACHE_DIR, "seen_articles.json")
+TRACKING_LINKS_FILE = os.path.join(CACHE_DIR, "tracking_links.json")
+BODY_FINGERPRINTS_FILE = os.path.join(CACHE_DIR, "body_fingerprints.json")
+REPEAT_MODE = "suppress"  # bereits versendete Artikel: "suppress" (weglassen) oder "mark" (als Wiederholung kennzeichnen)
+
 def send_email(subject, body, email_user, email_password, to_email="hadobrockmeyer@gmail.com"):
-    """Sendet eine E-Mail."""
+    """Sendet eine E-Mail. Rückgabe: True bei Erfolg."""
     try:
         msg = MIMEText(body, "html")
         msg['Subject'] = subject
@@ -35,8 +85,10 @@ def send_email(subject, body, email_user, email_password, to_email="hadobrockmey
             server.login(email_user, email_password)
             server.send_message(msg)
         logger.info(f"E-Mail erfolgreich an {to_email} gesendet: {subject}")
+        return True
     except Exception as e:
         logger.error(f"Fehler beim Senden der E-Mail an {to_email}: {str(e)}")
+        return False
 
 def load_thinktanks():
     """Lädt Think Tanks aus thinktanks.json."""
@@ -87,23 +139,596 @@ def resolve_tracking_url(url):
         logger.warning(f"Fehler beim Auflösen der URL {url}: {str(e)}")
         return url
 
-def clean_merics_title(subject):
-    """Bereinigt MERICS E-Mail-Betreff für Titel."""
-    prefixes = [
-        "MERICS China Security & Risk Tracker: ",
-        "MERICS China Essentials Special Issue: ",
-        "MERICS China Essentials: ",
-        "MERICS ",
+# ============================================================================
+# MAIL-DEKODIERUNG (Charset-Profile pro Absender)
+# ============================================================================
+
+# Gelernte Codecs pro Absender/Charset-Paar (siehe mail_decoding.py)
+DECODING_PROFILES = CharsetProfiles(DECODING_PROFILE_FILE)
+_decoded_html = weakref.WeakKeyDictionary()
+
+def save_decoding_profiles():
+    """Speichert die Dekodier-Profile und loggt die Fallback-Metriken des Laufs."""
+    DECODING_PROFILES.save()
+
+def get_html_content(msg):
+    """
+    Liefert den dekodierten HTML-Teil einer E-Mail (oder None).
+
+    Dekodiert wird mit dem Codec, der sich beim Absender für das deklarierte
+    Charset bewährt hat (ein Versuch); erst wenn er scheitert, kommen das
+    deklarierte Charset und die Fallbacks dran. Das Ergebnis wird pro
+    Message-Objekt gemerkt.
+    """
+    if msg in _decoded_html:
+        return _decoded_html[msg]
+
+    html_content = None
+    for part in msg.walk():
+        if part.get_content_type() != "text/html":
+            continue
+        sender = extract_email_address(msg.get("From", "")).lower()
+        html_content = DECODING_PROFILES.decode(
+            part.get_payload(decode=True) or b"", sender, part.get_content_charset(),
+            part.get("Content-Transfer-Encoding"),
+        )
+        break
+
+    _decoded_html[msg] = html_content
+    return html_content
+
+# ============================================================================
+# ARTIKEL (strukturierte Datensätze statt Markdown-Zeilen)
+# ============================================================================
+
+# Titel-Normalisierung (NFKC, Leerraum, Präfixe/Suffixe pro Quelle aus config/title_prefixes.json)
+TITLE_NORMALIZER = TitleNormalizer(TITLE_PREFIXES_FILE)
+
+def make_article(source, title, url, **fields):
+    """
+    Artikel-Datensatz eines Parsers; Anzeigetitel und kanonische URL für die
+    Deduplizierung werden einmal hier berechnet.
+    """
+    return Article(source, TITLE_NORMALIZER.clean(title, source), url, canonical_url=canonicalize_url(url), **fields)
+
+def title_key(article):
+    """Normalisierter Titel für Deduplizierung und Versand-Gedächtnis (siehe title_normalizer.py)."""
+    return TITLE_NORMALIZER.key(article.title, article.source)
+
+def message_date(msg):
+    """Datum einer E-Mail als YYYY-MM-DD (None, wenn der Date-Header fehlt oder unlesbar ist)."""
+    try:
+        return parsedate_to_datetime(msg.get("Date")).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+# ============================================================================
+# PARSER-CACHE (Message-ID + Parser-Version)
+# ============================================================================
+
+_parse_cache = None
+_parse_cache_dirty = False
+
+def parser_version(parser, depends_on=()):
+    """
+    Berechnet die Version eines Parsers als Hash über seinen Quellcode
+    (inkl. Hilfsfunktionen, deren Regeln das Ergebnis beeinflussen).
+    Keyword-Matcher/Score-Regeln in depends_on zählen über parser_cache_version().
+    """
+    digest = hashlib.sha1()
+    for func in (parser, *depends_on):
+        if not callable(func):
+            continue
+        func = inspect.unwrap(func)
+        try:
+            digest.update(inspect.getsource(func).encode("utf-8"))
+        except (OSError, TypeError):
+            digest.update(func.__qualname__.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+def parser_cache_version(parser):
+    """
+    Aktuelle Cache-Version eines Parsers: Quellcode-Version plus Version der
+    Keyword-Regeln (die sich per Hot Reload des Lexikons zur Laufzeit ändern kann).
+    """
+    rules = getattr(parser, "cache_rules", ())
+    if not rules:
+        return parser.cache_version
+    rule_versions = "|".join(rule.version for rule in rules)
+    return f"{parser.cache_version}-{hashlib.sha1(rule_versions.encode('utf-8')).hexdigest()[:8]}"
+
+def load_parse_cache():
+    """Lädt den Parser-Cache von der Festplatte (einmal pro Lauf)."""
+    global _parse_cache
+    if _parse_cache is not None:
+        return _parse_cache
+    try:
+        with open(PARSE_CACHE_FILE, "r", encoding="utf-8") as f:
+            _parse_cache = json.load(f)
+        logger.info(f"Parser-Cache geladen: {sum(len(p.get('entries', {})) for p in _parse_cache.values())} Einträge")
+    except FileNotFoundError:
+        _parse_cache = {}
+    except Exception as e:
+        logger.warning(f"Parser-Cache unlesbar, starte leer: {str(e)}")
+        _parse_cache = {}
+    return _parse_cache
+
+def save_parse_cache():
+    """Schreibt den Parser-Cache zurück und verwirft veraltete Einträge."""
+    global _parse_cache_dirty
+    if _parse_cache is None or not _parse_cache_dirty:
+        return
+    cutoff = (datetime.now() - timedelta(days=PARSE_CACHE_MAX_AGE_DAYS)).strftime("%Y-%m-%d")
+    for parser_cache in _parse_cache.values():
+        entries = parser_cache.get("entries", {})
+        for message_id in [mid for mid, entry in entries.items() if entry.get("date", "") < cutoff]:
+            del entries[message_id]
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = PARSE_CACHE_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_parse_cache, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, PARSE_CACHE_FILE)
+        _parse_cache_dirty = False
+        logger.info(f"Parser-Cache gespeichert: {PARSE_CACHE_FILE}")
+    except Exception as e:
+        logger.warning(f"Fehler beim Speichern des Parser-Caches: {str(e)}")
+
+def _parser_cache_bucket(parser_name, version):
+    """Liefert die Cache-Einträge eines Parsers; bei neuer Version werden nur DIESE verworfen."""
+    global _parse_cache_dirty
+    cache = load_parse_cache()
+    bucket = cache.get(parser_name)
+    if not bucket or bucket.get("version") != version:
+        if bucket:
+            logger.info(f"Parser-Cache - {parser_name}: neue Version {version}, {len(bucket.get('entries', {}))} Einträge verworfen")
+        bucket = {"version": version, "entries": {}}
+        cache[parser_name] = bucket
+        _parse_cache_dirty = True
+    return bucket["entries"]
+
+def get_cached_parse(parser, message_id):
+    """Gibt das gecachte Parser-Ergebnis für eine Message-ID zurück (oder None)."""
+    if not message_id or not hasattr(parser, "cache_version"):
+        return None
+    entry = _parser_cache_bucket(parser.__name__, parser_cache_version(parser)).get(message_id.strip())
+    if entry is None or not all(isinstance(article, dict) for article in entry["articles"]):
+        return None
+    return [Article.from_dict(article, canonicalize_url) for article in entry["articles"]]
+
+def store_cached_parse(parser, message_id, articles):
+    """Speichert ein Parser-Ergebnis unter Message-ID + Parser-Version."""
+    global _parse_cache_dirty
+    if not message_id or not hasattr(parser, "cache_version"):
+        return
+    entries = _parser_cache_bucket(parser.__name__, parser_cache_version(parser))
+    entries[message_id.strip()] = {
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "articles": [article.to_dict() for article in articles],
+    }
+    _parse_cache_dirty = True
+
+def cached_parser(parser=None, *, depends_on=()):
+    """
+    Decorator für parse_*-Funktionen: Ergebnisse werden pro Message-ID auf der
+    Festplatte gecacht. Ändert sich der Code des Parsers (oder seiner Regeln in
+    depends_on), werden nur die Einträge dieser Quelle ungültig.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(msg):
+            message_id = msg.get("Message-ID")
+            cached = get_cached_parse(wrapper, message_id)
+            if cached is not None:
+                logger.info(f"Parser-Cache - {func.__name__}: Treffer für {message_id.strip()[:60]}")
+                return cached
+            articles = func(msg)
+            date = message_date(msg)
+            for article in articles:
+                if article.date is None:
+                    article.date = date
+            store_cached_parse(wrapper, message_id, articles)
+            return articles
+        wrapper.cache_version = parser_version(func, depends_on)
+        # Alle Parser-Titel laufen über make_article() und damit über TITLE_NORMALIZER
+        wrapper.cache_rules = [TITLE_NORMALIZER] + [dep for dep in depends_on if not callable(dep)]
+        return wrapper
+
+    if parser is not None:
+        return decorate(parser)
+    return decorate
+
+# ============================================================================
+# RELEVANZ-KEYWORDS (ein kompilierter Matcher für alle Scorer)
+# ============================================================================
+
+# "token": nur ganze Wörter/Wortfolgen ("ai" trifft nicht "said"); "substring": altes Verhalten
+RELEVANCE_MATCH_MODE = "token"
+
+# Alle Keyword-Listen (China, wichtige Themen, andere Regionen, Events/Footer)
+# stehen im Lexikon; Änderungen werden ohne Neustart übernommen.
+THINKTANK_MATCHER = LexiconMatcher(KEYWORD_LEXICON_FILE, mode=RELEVANCE_MATCH_MODE, cache_path=MATCHER_CACHE_FILE)
+
+# Score-Regeln als Gewichte über Kategorien (einzeln oder per score_batch für viele Kandidaten);
+# Ergebnisse werden pro normalisiertem Titel + Regel-/Lexikon-Version gecacht
+SCORE_CACHE = ScoreCache(SCORE_CACHE_FILE)
+CSIS_SCORING = ScoringRule(THINKTANK_MATCHER, gate="csis_china", base=5, per_keyword={"csis_topic": 2}, floor=0,
+                           cache=SCORE_CACHE)
+THINKTANK_SCORING = ScoringRule(THINKTANK_MATCHER, gate="thinktank_china", base=5, per_keyword={"thinktank_topic": 2}, floor=0,
+                                cache=SCORE_CACHE)
+
+# BM25 über alle bisher extrahierten Artikel: China-Terme voll, Themen halb gewichtet
+RELEVANCE_INDEX = BM25Index(BM25_INDEX_FILE)
+THINKTANK_QUERY = QueryProfile(THINKTANK_MATCHER, {
+    "thinktank_china": 1.0, "csis_china": 1.0, "thinktank_topic": 0.5, "csis_topic": 0.5})
+NO_RELEVANCE = (0.0, 0)  # (BM25-Score, Keyword-Score) für Artikel ohne Bewertung
+
+def index_thinktank_articles(think_tank_data):
+    """
+    Nimmt die Artikel des Tages in den BM25-Index auf (nur neue) und bewertet
+    sie gegen das China-Query-Profil; bei gleichem BM25-Score (z.B. 0 ohne
+    China-Terme) entscheidet der Keyword-Score (THINKTANK_SCORING, ein
+    score_batch-Aufruf für alle Titel). Rückgabe: {Article: (BM25-Score, Keyword-Score)}.
+    """
+    articles = [article for section in think_tank_data.values() for article in section]
+    titles = [article.title for article in articles]
+    added = RELEVANCE_INDEX.add_documents(titles)
+    RELEVANCE_INDEX.save()
+    scores = dict(zip(articles, zip(RELEVANCE_INDEX.score_batch(titles, THINKTANK_QUERY),
+                                    THINKTANK_SCORING.score_batch(titles))))
+    SCORE_CACHE.save()
+    logger.info(f"BM25-Index: {added} neue Artikel, {RELEVANCE_INDEX.doc_count} insgesamt")
+    for article, (score, keyword_score) in sorted(scores.items(), key=lambda item: item[1], reverse=True)[:5]:
+        logger.info(f"BM25 {score:5.2f} / Keywords {keyword_score:2}: {article.title[:60]}")
+    return scores
+
+def select_briefing_articles(think_tank_data, scores):
+    """
+    Wendet das Briefing-Budget an: pro Abschnitt und global nur die besten
+    Artikel nach (BM25-Score, Keyword-Score). Innerhalb eines Abschnitts bleibt die Reihenfolge
+    des Newsletters erhalten; bei Gleichstand gewinnt der frühere Abschnitt.
+    """
+    selector = TopKSelector(BRIEFING_TOP_K, BRIEFING_SECTION_TOP_K)
+    for section, articles in think_tank_data.items():
+        for article in articles:
+            selector.offer(section, scores.get(article, NO_RELEVANCE), article)
+    selected = selector.by_section()
+    if selector.discarded:
+        logger.info(f"Briefing-Budget: {selector.discarded} von {selector.offered} Artikeln verworfen")
+    return {section: selected.get(section, []) for section in think_tank_data}
+
+# ============================================================================
+# BEREITS VERSENDETE ARTIKEL (tagesübergreifend, Bloom-Filter + JSON-Index)
+# ============================================================================
+
+SEEN_STORE = SeenStore(SEEN_BLOOM_FILE, SEEN_INDEX_FILE)
+
+def filter_seen_articles(think_tank_data, mode=REPEAT_MODE):
+    """
+    Entfernt Artikel, die schon in einem früheren Briefing standen (mode="suppress"),
+    oder kennzeichnet sie als Wiederholung (mode="mark").
+    """
+    result = {}
+    repeats = 0
+    for section, articles in think_tank_data.items():
+        kept = []
+        for article in articles:
+            url = article.canonical_url if article.has_web_url() else None
+            if SEEN_STORE.seen(url, title_key(article)):
+                repeats += 1
+                if mode != "mark":
+                    logger.info(f"Bereits versendet - {section}: {article.title[:60]}...")
+                    continue
+                article.extras = {**(article.extras or {}), "repeat": True}
+            kept.append(article)
+        result[section] = kept
+    logger.info(f"Bereits versendet: {repeats} Artikel ({'gekennzeichnet' if mode == 'mark' else 'entfernt'}), "
+                f"{SEEN_STORE.bloom_negatives} per Bloom-Filter sicher neu, {SEEN_STORE.exact_lookups} exakt geprüft")
+    return result
+
+def mark_sent_articles(think_tank_data):
+    """Merkt sich alle Artikel eines versendeten Briefings."""
+    for articles in think_tank_data.values():
+        for article in articles:
+            SEEN_STORE.mark(article.canonical_url if article.has_web_url() else None, title_key(article))
+    SEEN_STORE.save()
+
+# ============================================================================
+# ENTITÄTEN (Personen, Institutionen, Orte, Unternehmen)
+# ============================================================================
+
+ENTITY_GAZETTEER = EntityGazetteer(ENTITY_GAZETTEER_FILE)
+ENTITY_INDEX = EntityIndex(ENTITY_INDEX_FILE)
+
+def index_article_entities(think_tank_data, day=None):
+    """
+    Taggt alle Artikel des Briefings mit ihren Entitäten und pflegt den
+    Tagesindex Entität → Artikel. Rückgabe: [(Entität, Anzahl)], häufigste zuerst.
+    """
+    day = day or datetime.now().strftime("%Y-%m-%d")
+    for section, articles in think_tank_data.items():
+        for article in articles:
+            ENTITY_INDEX.add(day, section, article.title, article.url, ENTITY_GAZETTEER.entities(article.title))
+    ENTITY_INDEX.save()
+    counts = ENTITY_INDEX.entity_counts(day)
+    if counts:
+        logger.info("Entitäten heute: " + ", ".join(f"{entity} ({count})" for entity, count in counts[:FOCUS_ENTITY_LIMIT]))
+    return counts
+
+# ============================================================================
+# TRENDS (abklingende Zähler über Think-Tank- und Nikkei-Artikel)
+# ============================================================================
+
+TRENDING = TrendingCounters(TRENDING_FILE)
+
+def update_trending(think_tank_data):
+    """
+    Zählt Terme und Entitäten der neuen Artikel in die Trend-Zähler (nur neue
+    Artikel, alte Zähler klingen lazy ab). Rückgabe: [(Begriff, Heat)], heißeste zuerst.
+    """
+    added = 0
+    for articles in think_tank_data.values():
+        for article in articles:
+            added += TRENDING.add_item(article.title, ENTITY_GAZETTEER.entities(article.title))
+    TRENDING.save()
+    trends = [(TRENDING.label(key), heat) for key, heat in TRENDING.trending(TRENDING_LIMIT)]
+    logger.info(f"Trends: {added} neue Artikel gezählt, {len(TRENDING.counters)} Zähler")
+    if trends:
+        logger.info("Im Trend: " + ", ".join(f"{name} ({heat:.1f}x)" for name, heat in trends))
+    return trends
+
+# ============================================================================
+# THEMEN-CLUSTER (optionale Briefing-Ansicht "nach Thema")
+# ============================================================================
+
+# IDF aus der BM25-Historie: Terme, die in fast jedem Titel stehen ("china"), prägen keinen Cluster
+TOPIC_CLUSTERER = TopicClusterer(TOPIC_CLUSTER_FILE, idf=RELEVANCE_INDEX.idf)
+
+def cluster_topics(think_tank_data, scores):
+    """
+    Gruppiert die Artikel des Briefings nach Thema (TF-IDF über die Titel, siehe
+    topic_clusters.py). Die relevantesten Artikel eröffnen die Cluster.
+    Rückgabe: [(Name oder None für "Weitere Themen", [(Abschnitt, Article)])].
+    """
+    items = sorted(
+        ((section, article) for section, articles in think_tank_data.items() for article in articles),
+        key=lambda item: scores.get(item[1], NO_RELEVANCE), reverse=True,
+    )
+    topics = [
+        (label, [items[index] for index in members])
+        for label, members in TOPIC_CLUSTERER.cluster([article.title for _, article in items])
     ]
-    
-    cleaned = subject
-    for prefix in prefixes:
-        if cleaned.startswith(prefix):
-            cleaned = cleaned[len(prefix):]
-            break
-    
-    return cleaned.strip()
+    logger.info(f"Themen-Cluster: {sum(1 for label, _ in topics if label)} Themen aus {len(items)} Artikeln")
+    return topics
+
+# ============================================================================
+# HEADER-PREFETCH (Betreff-Regeln + Cache vor dem Body-Download)
+# ============================================================================
+
+# Betreff-Kategorie (Keyword-Lexikon) pro Parser: Treffer werden schon nach
+# dem Header-Abruf verworfen, der Body wird gar nicht erst geladen.
+SUBJECT_SKIP_RULES = {
+    "parse_csis_geopolitics_email": "csis_event",
+    "parse_csis_freeman_email": "csis_event",
+    "parse_csis_trustee_email": "csis_event",
+    "parse_csis_japan_email": "csis_event",
+    "parse_chinapower_email": "chinapower_event",
+    "parse_korea_chair_email": "csis_event",
+    "parse_ghpc_email": "csis_event",
+    "parse_aerospace_email": "csis_event",
+}
+
+# Doppelt zugestellte Ausgaben (gleicher Body, andere Message-ID), siehe body_fingerprints.py
+BODY_FINGERPRINTS = BodyFingerprints(BODY_FINGERPRINTS_FILE)
+
+def parse_emails(mail, email_ids, parser, label):
+    """
+    Liefert die Parser-Ergebnisse (eine Artikelliste pro E-Mail). Vor dem
+    Body-Download werden die Header geprüft: Betreff-Regeln der Quelle und
+    Parser-Cache-Treffer (Message-ID) kommen ohne RFC822-Abruf aus. Nach dem
+    Download werden doppelt zugestellte Ausgaben am Body-Fingerabdruck erkannt:
+    im selben Lauf übersprungen, aus früheren Läufen aus dem Parser-Cache der
+    ersten Ausgabe übernommen.
+    """
+    headers = fetch_headers(mail, email_ids)
+    skip_category = SUBJECT_SKIP_RULES.get(parser.__name__)
+    skipped = cached = duplicates = 0
+
+    for email_id in email_ids:
+        header = headers.get(email_id)
+        if header is not None:
+            subject = decode_subject(header)
+            if skip_category and skip_category in THINKTANK_MATCHER.match(subject):
+                logger.info(f"{label} - Betreff-Regel, Body nicht geladen: {subject}")
+                skipped += 1
+                continue
+            articles = get_cached_parse(parser, header.get("Message-ID"))
+            if articles is not None:
+                logger.info(f"{label} - Parser-Cache-Treffer, Body nicht geladen: {subject}")
+                cached += 1
+                yield articles
+                continue
+
+        result, msg_data = mail.fetch(email_id, "(RFC822)")
+        if result != "OK":
+            logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
+            continue
+        msg = email.message_from_bytes(msg_data[0][1])
+        message_id = msg.get("Message-ID")
+        fingerprint = body_fingerprint(get_html_content(msg))
+        if fingerprint is not None:
+            if BODY_FINGERPRINTS.seen_this_run(parser.__name__, fingerprint):
+                logger.info(f"{label} - Doppelte Ausgabe im selben Lauf übersprungen: {decode_subject(msg)}")
+                duplicates += 1
+                continue
+            first_id = BODY_FINGERPRINTS.first(parser.__name__, fingerprint)
+            if first_id and first_id != (message_id or "").strip():
+                articles = get_cached_parse(parser, first_id)
+                if articles is not None:
+                    logger.info(f"{label} - Doppelte Ausgabe, Ergebnis der ersten übernommen: {decode_subject(msg)}")
+                    BODY_FINGERPRINTS.add(parser.__name__, fingerprint, first_id)
+                    duplicates += 1
+                    yield articles
+                    continue
+            BODY_FINGERPRINTS.add(parser.__name__, fingerprint, message_id)
+        yield parser(msg)
+
+    BODY_FINGERPRINTS.duplicates += duplicates
+    if skipped or cached or duplicates:
+        logger.info(f"{label} - Header-Prefetch: {skipped} per Betreff übersprungen, {cached} aus dem Cache, {len(email_ids) - skipped - cached} Bodies geladen, {duplicates} davon doppelt")
+
+# ============================================================================
+# DOM-INDEX (Positionen in Dokumentreihenfolge)
+# ============================================================================
+
+HEADING_TAGS = ("h1", "h2", "h3")
+
+class DocumentIndex:
+    """
+    Einmal pro E-Mail aufgebauter Index über das HTML-Dokument.
+
+    Jedes Tag erhält seine Position in Dokumentreihenfolge sowie die Position
+    seines letzten Nachfahren. Pro Tag-Name (und pro registriertem Prädikat,
+    z.B. CFRs graue Boxen) liegt eine sortierte Positionsliste vor. Damit wird
+    "nächster passender Link nach Knoten X" zur Binärsuche statt zu einem
+    erneuten find_next()-Durchlauf über den Baum.
+    """
+
+    def __init__(self, soup, predicates=None):
+        self.elements = []   # Tags in Dokumentreihenfolge
+        self.ends = []       # Position des letzten Nachfahren je Tag
+        self.parents = []    # Position des Eltern-Tags (-1 = Wurzel)
+        self._positions = {}
+        self._categories = {}
+        self._children = {}
+
+        stack = [(soup, -1, iter(soup.children))]
+        while stack:
+            node, node_pos, children = stack[-1]
+            child = next((c for c in children if isinstance(c, Tag)), None)
+            if child is None:
+                stack.pop()
+                if node_pos >= 0:
+                    self.ends[node_pos] = len(self.elements) - 1
+                continue
+            pos = len(self.elements)
+            self.elements.append(child)
+            self.ends.append(pos)
+            self.parents.append(node_pos)
+            self._positions[id(child)] = pos
+            self._categories.setdefault(child.name, []).append(pos)
+            self._children.setdefault(node_pos, []).append(pos)
+            stack.append((child, pos, iter(child.children)))
+
+        # Überschriften inkl. <p class="h1"> (Chatham House)
+        self._categories["heading"] = [
+            pos for pos, el in enumerate(self.elements)
+            if el.name in HEADING_TAGS or (el.name == "p" and "h1" in (el.get("class") or []))
+        ]
+        for name, predicate in (predicates or {}).items():
+            self._categories[name] = [pos for pos, el in enumerate(self.elements) if predicate(el)]
+
+    def position(self, node):
+        """Position eines Tags in Dokumentreihenfolge."""
+        return self._positions[id(node)]
+
+    def category(self, categories):
+        """Alle Tags der Kategorien (Tag-Namen oder registrierte Prädikate) in Dokumentreihenfolge."""
+        return [self.elements[pos] for pos in self._positions_between(categories, -1, len(self.elements) - 1)]
+
+    def _positions_between(self, categories, start, end):
+        """Positionen der Kategorien im offenen Intervall (start, end], sortiert."""
+        if isinstance(categories, str):
+            categories = (categories,)
+        result = []
+        for name in categories:
+            positions = self._categories.get(name, [])
+            lo = bisect.bisect_right(positions, start)
+            hi = bisect.bisect_right(positions, end)
+            result.extend(positions[lo:hi])
+        if len(categories) > 1:
+            result.sort()
+        return result
+
+    def first_after(self, node, categories):
+        """Nächstes Tag einer Kategorie nach node (oder None)."""
+        positions = self._positions_between(categories, self.position(node), len(self.elements))
+        return self.elements[positions[0]] if positions else None
+
+    def after(self, node, categories, until=None, limit=None):
+        """
+        Tags der Kategorien nach node, optional bis Position until (inklusive)
+        und höchstens limit Stück.
+        """
+        end = len(self.elements) - 1 if until is None else until
+        positions = self._positions_between(categories, self.position(node), end)
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.elements[pos] for pos in positions]
+
+    def following(self, node, steps):
+        """Die nächsten `steps` Tags nach node (wie find_all_next(limit=steps))."""
+        pos = self.position(node)
+        return self.elements[pos + 1:pos + 1 + steps]
+
+    def inside(self, node, categories):
+        """Tags der Kategorien innerhalb von node (Nachfahren)."""
+        pos = self.position(node)
+        return [self.elements[p] for p in self._positions_between(categories, pos, self.ends[pos])]
+
+    def first_inside(self, node, categories, predicate=None):
+        """Erstes Tag der Kategorien innerhalb von node, das predicate erfüllt."""
+        for el in self.inside(node, categories):
+            if predicate is None or predicate(el):
+                return el
+        return None
+
+    def span_end(self, node, steps, categories=None):
+        """
+        Letzte Position, die von den nächsten `steps` Elementen nach node
+        (optional nur einer Kategorie) inklusive ihrer Nachfahren abgedeckt wird.
+        Entspricht der Reichweite einer find_next()-Schleife mit `steps` Schritten.
+        """
+        pos = self.position(node)
+        if categories is None:
+            window = range(pos + 1, min(pos + steps, len(self.elements) - 1) + 1)
+        else:
+            window = self._positions_between(categories, pos, len(self.elements))[:steps]
+        return max((self.ends[p] for p in window), default=pos)
+
+    def next_siblings(self, node, limit=None):
+        """Nachfolgende Geschwister-Tags von node (über die Eltern-Kinderliste)."""
+        pos = self.position(node)
+        siblings = self._children.get(self.parents[pos], [])
+        start = bisect.bisect_right(siblings, pos)
+        stop = None if limit is None else start + limit
+        return [self.elements[p] for p in siblings[start:stop]]
+
+def find_cta_link(index, node, steps, link_matches, container_tags=("td",), nested_matches=None):
+    """
+    Sucht den ersten Call-to-Action-Link in den nächsten `steps` Elementen nach node.
+
+    Ein Treffer ist entweder ein <a>, das link_matches erfüllt, oder ein Container
+    (td/p/div), der einen Link enthält, der nested_matches erfüllt – je nachdem,
+    was in Dokumentreihenfolge zuerst kommt (wie die frühere find_next()-Schleife).
+    """
+    pos = index.position(node)
+    window_end = pos + steps
+    for el in index.after(node, ("a",) + tuple(container_tags), until=window_end):
+        if el.name == "a":
+            if link_matches(el):
+                return el.get("href")
+        elif nested_matches is not None:
+            link = index.first_inside(el, "a", nested_matches)
+            if link is not None:
+                return link.get("href")
+    return None
+
+def clean_merics_title(subject):
+    """Bereinigt MERICS E-Mail-Betreff für Titel (Präfixe in config/title_prefixes.json)."""
+    return TITLE_NORMALIZER.clean(subject, "MERICS")
 
+@cached_parser(depends_on=[clean_merics_title, resolve_tracking_url])
 def parse_merics_email(msg):
     """
     Spezialisierter Parser für MERICS E-Mails.
@@ -123,15 +748,7 @@ def parse_merics_email(msg):
         date = datetime.now()
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         return articles
@@ -192,7 +809,7 @@ def parse_merics_email(msg):
     # Wenn ein Link gefunden wurde, erstelle Artikel
     if found_link:
         title = clean_merics_title(subject)
-        formatted_article = f"• [{title}]({found_link})"
+        formatted_article = make_article("MERICS", title, found_link)
         articles.append(formatted_article)
     
     return articles
@@ -230,23 +847,12 @@ def fetch_merics_emails(mail, email_user, email_password, days=None):
             email_ids = data[0].split()
             email_count += len(email_ids)
             
-            for email_id in email_ids:
-                result, msg_data = mail.fetch(email_id, "(RFC822)")
-                if result != "OK":
-                    logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                    continue
-
-                msg = email.message_from_bytes(msg_data[0][1])
-                
-                # Nutze den spezialisierten Parser
-                articles = parse_merics_email(msg)
+            for articles in parse_emails(mail, email_ids, parse_merics_email, "MERICS"):
                 
                 # Duplikate filtern
                 for article in articles:
-                    # Extrahiere URL aus Markdown-Link
-                    url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                    if url_match:
-                        url = url_match.group(1)
+                    if article.has_web_url():
+                        url = article.url
                         if url not in seen_urls:
                             all_articles.append(article)
                             seen_urls.add(url)
@@ -260,47 +866,14 @@ def fetch_merics_emails(mail, email_user, email_password, days=None):
 
 def score_csis_article(title, description=""):
     """Bewertet einen CSIS-Artikel auf China-Relevanz."""
-    title_lower = title.lower()
-    desc_lower = description.lower()
-    content = f"{title_lower} {desc_lower}"
-    
-    # MUSS China-Bezug haben
-    china_keywords = [
-        "china", "chinese", "xi jinping", "xi", "beijing", "shanghai",
-        "taiwan", "hong kong", "prc", "ccp", "communist party",
-        "sino-", "u.s.-china", "us-china", "asean"
-    ]
-    
-    if not any(kw in content for kw in china_keywords):
-        return 0
-    
-    score = 5  # Basis-Score für China-Erwähnung
-    
-    # Wichtige Themen
-    important_topics = [
-        "technology", "trade", "security", "military", "defense",
-        "economy", "tariff", "semiconductor", "ai", "geopolitics",
-        "indo-pacific", "south china sea", "strait"
-    ]
-    
-    for topic in important_topics:
-        if topic in content:
-            score += 2
-    
-    # Negative Keywords (andere Regionen ohne China-Bezug)
-    negative_keywords = [
-        "venezuela", "gaza", "israel", "palestine", "ukraine", "russia",
-        "europe", "africa", "middle east"
-    ]
-    
-    # Nur abziehen wenn China NICHT erwähnt wird
-    if not any(kw in content for kw in china_keywords):
-        for neg in negative_keywords:
-            if neg in content:
-                score -= 5
-    
-    return max(score, 0)
+    # MUSS China-Bezug haben; Basis 5 + 2 pro wichtigem Thema (CSIS_SCORING)
+    return CSIS_SCORING.score(title, description)
 
+def score_csis_articles(titles):
+    """Wie score_csis_article, für alle Kandidaten eines Newsletters in einem score_batch-Aufruf."""
+    return CSIS_SCORING.score_batch(titles)
+
+@cached_parser(depends_on=[score_csis_articles, CSIS_SCORING])
 def parse_csis_geopolitics_email(msg):
     """
     Spezialisierter Parser für CSIS Geopolitics & Foreign Policy Newsletter.
@@ -316,29 +889,23 @@ def parse_csis_geopolitics_email(msg):
     logger.info(f"Geopolitics - Betreff: {subject}")
     
     # Event-Invites überspringen
-    if any(keyword in subject.lower() for keyword in ["event invite", "join us", "register here", "rsvp"]):
+    if "csis_event" in THINKTANK_MATCHER.match(subject):
         logger.info("Geopolitics - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CSIS Geopolitics E-Mail gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
     
     # Finde alle em_text4 Elemente (Titel)
     all_em_text4 = soup.find_all("td", class_="em_text4")
+    candidates = []  # (Titel, Link) – bewertet wird danach in einem Batch
     
     logger.info(f"Geopolitics Parser - {len(all_em_text4)} em_text4 Elemente gefunden")
     
@@ -359,45 +926,37 @@ def parse_csis_geopolitics_email(msg):
         logger.info(f"Geopolitics Parser - Gefundener Titel: {title_text}")
         
         # Suche nach dem nächsten "Listen Here" Link NACH diesem em_text4
-        current = title_cell
+        # (innerhalb der nächsten 10 td-Zellen, per Binärsuche im DOM-Index)
         found_link = None
+        span_end = index.span_end(title_cell, 10, categories="td")
         
-        # Suche in den nächsten 10 Geschwister-Elementen
-        for _ in range(10):
-            current = current.find_next("td")
-            if not current:
-                break
-            
-            # Suche nach einem Link mit "Listen Here" Text
-            links = current.find_all("a", href=True)
-            for link in links:
-                link_text = link.get_text(strip=True).lower()
-                href = link.get("href", "")
-                
-                if "listen here" in link_text or "listen on csis" in link_text:
-                    if "csis.org" in href or "pardot.csis.org" in href:
-                        found_link = href
-                        logger.info(f"Geopolitics Parser - Link gefunden: {href[:60]}...")
-                        break
+        for link in index.after(title_cell, "a", until=span_end):
+            link_text = link.get_text(strip=True).lower()
+            href = link.get("href", "")
             
-            if found_link:
-                break
+            if "listen here" in link_text or "listen on csis" in link_text:
+                if "csis.org" in href or "pardot.csis.org" in href:
+                    found_link = href
+                    logger.info(f"Geopolitics Parser - Link gefunden: {href[:60]}...")
+                    break
         
         if not found_link:
             logger.info(f"Geopolitics Parser - Kein Link für Titel gefunden: {title_text[:50]}...")
             continue
         
-        # Score berechnen
-        score = score_csis_article(title_text, "")
+        candidates.append((title_text, found_link))
+    
+    # Scores aller Kandidaten in einem Aufruf berechnen (CSIS_SCORING)
+    for (title_text, found_link), score in zip(candidates, score_csis_articles(title for title, _ in candidates)):
         logger.info(f"Geopolitics Parser - Score: {score}")
         
         if score > 0:
             # Duplikats-Check
-            if title_text in [art.split('](')[0].split('[')[1] for art in articles]:
+            if title_text in [art.title for art in articles]:
                 logger.info(f"Geopolitics Parser - Duplikat übersprungen")
                 continue
             
-            formatted_article = f"• [{title_text}]({found_link})"
+            formatted_article = make_article("CSIS_Geopolitics", title_text, found_link, score=score)
             articles.append(formatted_article)
             logger.info(f"Geopolitics Parser - Artikel hinzugefügt: {title_text[:50]}...")
         else:
@@ -437,32 +996,17 @@ def fetch_csis_geopolitics_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"Geopolitics - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            # Betreff loggen
-            subject = decode_header(msg.get("Subject", "Kein Betreff"))[0][0]
-            if isinstance(subject, bytes):
-                subject = subject.decode()
-            logger.info(f"Geopolitics - Betreff: {subject}")
-            
-            articles = parse_csis_geopolitics_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_csis_geopolitics_email, "Geopolitics"):
             logger.info(f"Geopolitics - {len(articles)} Artikel aus dieser E-Mail extrahiert")
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
-                        logger.info(f"Geopolitics - Artikel hinzugefügt: {article[:80]}...")
+                        logger.info(f"Geopolitics - Artikel hinzugefügt: {article.title[:80]}...")
         
         logger.info(f"CSIS Geopolitics: {len(all_articles)} Artikel gefunden")
         return all_articles, len(email_ids)
@@ -471,6 +1015,7 @@ def fetch_csis_geopolitics_emails(mail, email_user, email_password, days=None):
         logger.error(f"Fehler in fetch_csis_geopolitics_emails: {str(e)}")
         return [], 0
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_csis_freeman_email(msg):
     """
     Spezialisierter Parser für CSIS Freeman Chair Newsletter (Pekingology Podcast).
@@ -486,20 +1031,12 @@ def parse_csis_freeman_email(msg):
     logger.info(f"Freeman Chair - Betreff: {subject}")
     
     # Event-Invites überspringen
-    if any(keyword in subject.lower() for keyword in ["event invite", "join us", "register here", "rsvp"]):
+    if "csis_event" in THINKTANK_MATCHER.match(subject):
         logger.info("Freeman Chair - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CSIS Freeman E-Mail gefunden")
@@ -571,7 +1108,7 @@ def parse_csis_freeman_email(msg):
     
     if found_link:
         title = f"Pekingology: {subject}"
-        formatted_article = f"• [{title}]({found_link})"
+        formatted_article = make_article("CSIS_Freeman", title, found_link)
         articles.append(formatted_article)
         logger.info(f"Freeman Chair - Artikel erstellt: {title}")
     else:
@@ -579,6 +1116,7 @@ def parse_csis_freeman_email(msg):
     
     return articles
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_csis_trustee_email(msg):
     """
     Spezialisierter Parser für CSIS Trustee Chair Newsletter.
@@ -595,20 +1133,12 @@ def parse_csis_trustee_email(msg):
     logger.info(f"Trustee Chair - Betreff: {subject}")
     
     # Event-Invites überspringen
-    if any(keyword in subject.lower() for keyword in ["event invite", "join us", "register here", "rsvp"]):
+    if "csis_event" in THINKTANK_MATCHER.match(subject):
         logger.info("Trustee Chair - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CSIS Trustee E-Mail gefunden")
@@ -747,7 +1277,7 @@ def parse_csis_trustee_email(msg):
         # Resolve Tracking URL
         resolved_url = resolve_tracking_url(href)
         
-        formatted_article = f"• [{title}]({resolved_url})"
+        formatted_article = make_article("CSIS_Trustee", title, resolved_url)
         articles.append(formatted_article)
         logger.info(f"Trustee Chair - ✅ ARTIKEL HINZUGEFÜGT: {title[:50]}... | URL: {resolved_url[:60]}")
     
@@ -757,7 +1287,7 @@ def parse_csis_trustee_email(msg):
     
     for article in articles:
         # Erkenne Video/Podcast-Links
-        if any(domain in article.lower() for domain in ["youtube.com", "youtu.be", "podcasts.apple.com", "spotify.com"]):
+        if any(domain in article.url.lower() for domain in ["youtube.com", "youtu.be", "podcasts.apple.com", "spotify.com"]):
             video_articles.append(article)
         else:
             text_articles.append(article)
@@ -768,9 +1298,10 @@ def parse_csis_trustee_email(msg):
     logger.info(f"Trustee Chair Parser - {len(sorted_articles)} Artikel extrahiert ({len(text_articles)} Text, {len(video_articles)} Video/Podcast)")
     logger.info(f"Trustee Chair - FINALE ARTIKEL-LISTE:")
     for idx, article in enumerate(sorted_articles, 1):
-        logger.info(f"  {idx}. {article[:80]}...")
+        logger.info(f"  {idx}. {article.title[:60]} | {article.url[:60]}")
     return sorted_articles
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_csis_japan_email(msg):
     """
     Spezialisierter Parser für CSIS Japan Chair Newsletter.
@@ -786,30 +1317,31 @@ def parse_csis_japan_email(msg):
     logger.info(f"Japan Chair - Betreff: {subject}")
     
     # Event-Invites überspringen
-    if any(keyword in subject.lower() for keyword in ["event invite", "join us", "register here", "rsvp"]):
+    if "csis_event" in THINKTANK_MATCHER.match(subject):
         logger.info("Japan Chair - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CSIS Japan Chair E-Mail gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
     
     # Finde alle em_text4 Titel (große Schrift)
     title_elements = soup.find_all("td", class_=lambda x: x and "em_text4" in x)
     
+    # Erweiterte Link-Keywords
+    link_keywords = [
+        "read more", "read here", "read on csis", 
+        "read full", "learn more", "view"
+    ]
+    analysis_pattern = re.compile(r"csis\.org/analysis")
+    fallback_pattern = re.compile(r"csis\.org/(analysis|commentary)")
+    
     logger.info(f"Japan Chair Parser - {len(title_elements)} em_text4 Elemente gefunden")
     
     seen_titles = set()
@@ -835,45 +1367,18 @@ def parse_csis_japan_email(msg):
         
         # Suche nach Link NACH diesem Titel
         # Finde die nächste Zeile mit einem CTA-Button
-        next_link = None
-        
         # Methode 1: Suche in nachfolgenden Elementen (max 15 Schritte)
-        current = title_element
-        for _ in range(15):
-            current = current.find_next()
-            if not current:
-                break
-            
-            # Suche nach Links mit relevanten Texten
-            if current.name == "a":
-                link_text = current.get_text(strip=True).lower()
-                href = current.get("href")
-                
-                # Erweiterte Link-Keywords
-                link_keywords = [
-                    "read more", "read here", "read on csis", 
-                    "read full", "learn more", "view"
-                ]
-                
-                if href and "csis.org" in href and any(kw in link_text for kw in link_keywords):
-                    next_link = href
-                    break
-            
-            # Suche innerhalb von td-Elementen
-            if current.name == "td":
-                # Versuche jeden Link zu csis.org/analysis zu finden
-                link = current.find("a", href=re.compile(r"csis\.org/analysis"))
-                if link:
-                    next_link = link.get("href")
-                    break
+        next_link = find_cta_link(
+            index, title_element, 15,
+            link_matches=lambda a: a.get("href") and "csis.org" in a["href"]
+                and any(kw in a.get_text(strip=True).lower() for kw in link_keywords),
+            nested_matches=lambda a: a.get("href") and analysis_pattern.search(a["href"]),
+        )
         
         # Methode 2: Wenn kein spezifischer Link gefunden, suche nach JEDEM csis.org/analysis Link
         if not next_link:
-            # Suche im gesamten E-Mail-Bereich nach dem Titel nach Links
-            all_links = soup.find_all("a", href=re.compile(r"csis\.org/(analysis|commentary)"))
-            for link in all_links:
-                # Prüfe ob der Link nach dem Titel kommt
-                if link.get("href"):
+            for link in index.category("a"):
+                if link.get("href") and fallback_pattern.search(link["href"]):
                     next_link = link.get("href")
                     logger.info(f"Japan Chair - Fallback-Link gefunden: {next_link[:60]}...")
                     break
@@ -885,13 +1390,14 @@ def parse_csis_japan_email(msg):
         # Resolve Tracking URL
         resolved_url = resolve_tracking_url(next_link)
         
-        formatted_article = f"• [{title_text}]({resolved_url})"
+        formatted_article = make_article("CSIS_Japan", title_text, resolved_url)
         articles.append(formatted_article)
         logger.info(f"Japan Chair - Artikel: {title_text[:50]}...")
     
     logger.info(f"Japan Chair Parser - {len(articles)} Artikel extrahiert")
     return articles
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_chinapower_email(msg):
     """
     Spezialisierter Parser für CSIS China Power Newsletter.
@@ -907,29 +1413,23 @@ def parse_chinapower_email(msg):
     logger.info(f"China Power - Betreff: {subject}")
     
     # Skip Event Invites
-    if "event invite" in subject.lower() or "join us" in subject.lower():
+    if "chinapower_event" in THINKTANK_MATCHER.match(subject):
         logger.info("China Power - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in China Power E-Mail gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
     
     # Finde alle h2 Titel (Artikel-Überschriften)
-    h2_elements = soup.find_all("h2")
+    h2_elements = index.category("h2")
+    cta_keywords = ["read here", "listen here", "watch here", "watch the recording"]
     
     logger.info(f"China Power Parser - {len(h2_elements)} h2 Elemente gefunden")
     
@@ -963,34 +1463,17 @@ def parse_chinapower_email(msg):
         
         # Suche nach "Read here" / "Listen here" / "Watch here" Links
         # Diese sind normalerweise in der Nähe des h2
-        next_link = None
-        
-        # Suche in nachfolgenden Elementen (max 10 Schritte)
-        current = h2
-        for _ in range(10):
-            current = current.find_next()
-            if not current:
-                break
-            
-            # Suche nach Links mit relevanten Texten
-            if current.name == "a":
-                link_text = current.get_text(strip=True).lower()
-                href = current.get("href")
-                
-                if href and "csis.org" in href and any(keyword in link_text for keyword in ["read here", "listen here", "watch here", "watch the recording"]):
-                    next_link = href
-                    logger.debug(f"China Power - Link gefunden: {href[:60]}...")
-                    break
-            
-            # Suche auch in verschachtelten Elementen
-            if current.name in ["p", "td", "div"]:
-                link = current.find("a", href=True, string=lambda x: x and any(kw in x.lower() for kw in ["read here", "listen here", "watch here", "watch the recording"]))
-                if link:
-                    href = link.get("href")
-                    if href and "csis.org" in href:
-                        next_link = href
-                        logger.debug(f"China Power - Verschachtelter Link gefunden: {href[:60]}...")
-                        break
+        # Suche in nachfolgenden Elementen (max 10 Schritte), auch in p/td/div
+        next_link = find_cta_link(
+            index, h2, 10,
+            link_matches=lambda a: a.get("href") and "csis.org" in a["href"]
+                and any(keyword in a.get_text(strip=True).lower() for keyword in cta_keywords),
+            container_tags=("p", "td", "div"),
+            nested_matches=lambda a: a.get("href") and "csis.org" in a["href"]
+                and a.string and any(kw in a.string.lower() for kw in cta_keywords),
+        )
+        if next_link:
+            logger.debug(f"China Power - Link gefunden: {next_link[:60]}...")
         
         if not next_link:
             logger.debug(f"China Power - Kein Link für Titel gefunden: {title_text[:40]}...")
@@ -999,7 +1482,7 @@ def parse_chinapower_email(msg):
         # Resolve Tracking URL
         resolved_url = resolve_tracking_url(next_link)
         
-        formatted_article = f"• [{title_text}]({resolved_url})"
+        formatted_article = make_article("CSIS_ChinaPower", title_text, resolved_url)
         articles.append(formatted_article)
         logger.info(f"China Power - Artikel: {title_text[:50]}...")
     
@@ -1035,21 +1518,12 @@ def fetch_csis_freeman_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"Freeman Chair - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            articles = parse_csis_freeman_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_csis_freeman_email, "Freeman Chair"):
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
@@ -1090,21 +1564,12 @@ def fetch_csis_trustee_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"Trustee Chair - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            articles = parse_csis_trustee_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_csis_trustee_email, "Trustee Chair"):
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
@@ -1145,21 +1610,12 @@ def fetch_csis_japan_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"Japan Chair - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            articles = parse_csis_japan_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_csis_japan_email, "Japan Chair"):
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
@@ -1200,21 +1656,12 @@ def fetch_chinapower_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"China Power - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            articles = parse_chinapower_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_chinapower_email, "ChinaPower"):
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
@@ -1226,6 +1673,7 @@ def fetch_chinapower_emails(mail, email_user, email_password, days=None):
         logger.error(f"Fehler in fetch_chinapower_emails: {str(e)}")
         return [], 0
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_korea_chair_email(msg):
     """
     Spezialisierter Parser für CSIS Korea Chair Newsletter.
@@ -1241,20 +1689,12 @@ def parse_korea_chair_email(msg):
     logger.info(f"Korea Chair - Betreff: {subject}")
     
     # Event-Invites überspringen
-    if any(keyword in subject.lower() for keyword in ["event invite", "join us", "register here", "rsvp"]):
+    if "csis_event" in THINKTANK_MATCHER.match(subject):
         logger.info("Korea Chair - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in Korea Chair E-Mail gefunden")
@@ -1285,16 +1725,10 @@ def parse_korea_chair_email(msg):
                 final_url = resolve_tracking_url(href)
                 
                 # China-Relevanz prüfen
-                title_lower = title.lower()
-                china_keywords = [
-                    "china", "chinese", "beijing", "xi jinping", "taiwan", "hong kong",
-                    "south china sea", "dprk", "north korea", "asia", "indo-pacific"
-                ]
-                
-                is_china_relevant = any(keyword in title_lower for keyword in china_keywords)
+                is_china_relevant = "korea_china" in THINKTANK_MATCHER.match(title)
                 
                 if is_china_relevant:
-                    formatted_article = f"• [{title}]({final_url})"
+                    formatted_article = make_article("CSIS_Korea", title, final_url)
                     articles.append(formatted_article)
                     logger.info(f"Korea Chair - Artikel hinzugefügt: {title[:50]}...")
                 else:
@@ -1333,21 +1767,12 @@ def fetch_korea_chair_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"Korea Chair - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            articles = parse_korea_chair_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_korea_chair_email, "Korea Chair"):
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
@@ -1359,6 +1784,7 @@ def fetch_korea_chair_emails(mail, email_user, email_password, days=None):
         logger.error(f"Fehler in fetch_korea_chair_emails: {str(e)}")
         return [], 0
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_ghpc_email(msg):
     """
     Spezialisierter Parser für CSIS Global Health Policy Center Newsletter.
@@ -1374,26 +1800,20 @@ def parse_ghpc_email(msg):
     logger.info(f"GHPC - Betreff: {subject}")
     
     # Event-Invites überspringen
-    if any(keyword in subject.lower() for keyword in ["event invite", "join us", "register here", "rsvp"]):
+    if "csis_event" in THINKTANK_MATCHER.match(subject):
         logger.info("GHPC - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in GHPC E-Mail gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
+    content_pattern = re.compile(r"csis\.org/(analysis|commentary|events|videos)")
     
     # Finde alle großen Titel (em_text4, em_text3, em_text5)
     title_elements = soup.find_all("td", class_=lambda x: x and any(cls in x for cls in ["em_text4", "em_text3", "em_text5"]))
@@ -1419,62 +1839,38 @@ def parse_ghpc_email(msg):
         seen_titles.add(title)
         
         # China-Relevanz prüfen
-        title_lower = title.lower()
-        china_keywords = [
-            "china", "chinese", "beijing", "xi jinping", "taiwan", "hong kong",
-            "south china sea", "dprk", "north korea", "asia", "indo-pacific",
-            "fentanyl", "pandemic"
-        ]
-        
-        is_china_relevant = any(keyword in title_lower for keyword in china_keywords)
+        is_china_relevant = "ghpc_china" in THINKTANK_MATCHER.match(title)
         
         if not is_china_relevant:
             logger.info(f"GHPC - Nicht China-relevant: {title[:50]}...")
             continue
         
         # Suche nach Links (flexibel für verschiedene Typen)
-        next_link = None
-        
-        # Methode 1: Suche nach spezifischen Button-Texten
-        current = title_element
-        for _ in range(15):
-            current = current.find_next()
-            if not current:
-                break
-            
-            if current.name == "a":
-                link_text = current.get_text(strip=True).lower()
-                href = current.get("href")
-                
-                # Erweiterte Link-Keywords (inkl. Videos & Transcripts)
-                link_keywords = [
-                    "read", "watch", "view", "listen", "download",
-                    "transcript", "video", "learn more"
-                ]
-                
-                if href and "csis.org" in href and any(kw in link_text for kw in link_keywords):
-                    next_link = href
-                    break
-            
-            # Suche in td-Elementen
-            if current.name == "td":
-                link = current.find("a", href=re.compile(r"csis\.org/(analysis|commentary|events|videos)"))
-                if link:
-                    next_link = link.get("href")
-                    break
+        # Methode 1: Suche nach spezifischen Button-Texten (max 15 Schritte), sonst td mit CSIS-Link
+        # Erweiterte Link-Keywords (inkl. Videos & Transcripts)
+        link_keywords = [
+            "read", "watch", "view", "listen", "download",
+            "transcript", "video", "learn more"
+        ]
+        next_link = find_cta_link(
+            index, title_element, 15,
+            link_matches=lambda a: a.get("href") and "csis.org" in a["href"]
+                and any(kw in a.get_text(strip=True).lower() for kw in link_keywords),
+            nested_matches=lambda a: a.get("href") and content_pattern.search(a["href"]),
+        )
         
         # Methode 2: Fallback - suche nach beliebigem CSIS-Link
         if not next_link:
-            all_links = soup.find_all("a", href=re.compile(r"csis\.org/(analysis|commentary|events|videos)"))
-            if all_links:
-                next_link = all_links[0].get("href")
+            fallback = next((a for a in index.category("a") if a.get("href") and content_pattern.search(a["href"])), None)
+            if fallback:
+                next_link = fallback.get("href")
                 logger.info(f"GHPC - Fallback-Link gefunden")
         
         if next_link:
             # Pardot-URL auflösen
             final_url = resolve_tracking_url(next_link)
             
-            formatted_article = f"• [{title}]({final_url})"
+            formatted_article = make_article("CSIS_GHPC", title, final_url)
             articles.append(formatted_article)
             logger.info(f"GHPC - Artikel hinzugefügt: {title[:50]}...")
         else:
@@ -1512,21 +1908,12 @@ def fetch_ghpc_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"GHPC - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            articles = parse_ghpc_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_ghpc_email, "GHPC"):
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
@@ -1538,6 +1925,7 @@ def fetch_ghpc_emails(mail, email_user, email_password, days=None):
         logger.error(f"Fehler in fetch_ghpc_emails: {str(e)}")
         return [], 0
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_aerospace_email(msg):
     """
     Spezialisierter Parser für CSIS Aerospace Security Project Newsletter.
@@ -1553,26 +1941,20 @@ def parse_aerospace_email(msg):
     logger.info(f"Aerospace - Betreff: {subject}")
     
     # Event-Invites überspringen
-    if any(keyword in subject.lower() for keyword in ["event invite", "join us", "register here", "rsvp"]):
+    if "csis_event" in THINKTANK_MATCHER.match(subject):
         logger.info("Aerospace - Event Invite übersprungen")
         return articles
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in Aerospace E-Mail gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
+    content_pattern = re.compile(r"csis\.org/(analysis|commentary|events|videos)")
     
     # Finde alle großen Titel (em_text4, em_text3, em_text5)
     title_elements = soup.find_all("td", class_=lambda x: x and any(cls in x for cls in ["em_text4", "em_text3", "em_text5"]))
@@ -1598,61 +1980,38 @@ def parse_aerospace_email(msg):
         seen_titles.add(title)
         
         # China-Relevanz prüfen
-        title_lower = title.lower()
-        china_keywords = [
-            "china", "chinese", "beijing", "xi jinping", "taiwan", "hong kong",
-            "south china sea", "pla", "people's liberation army", "asia", "indo-pacific"
-        ]
-        
-        is_china_relevant = any(keyword in title_lower for keyword in china_keywords)
+        is_china_relevant = "aerospace_china" in THINKTANK_MATCHER.match(title)
         
         if not is_china_relevant:
             logger.info(f"Aerospace - Nicht China-relevant: {title[:50]}...")
             continue
         
         # Suche nach Links (flexibel für verschiedene Typen)
-        next_link = None
-        
-        # Methode 1: Suche nach spezifischen Button-Texten
-        current = title_element
-        for _ in range(15):
-            current = current.find_next()
-            if not current:
-                break
-            
-            if current.name == "a":
-                link_text = current.get_text(strip=True).lower()
-                href = current.get("href")
-                
-                # Erweiterte Link-Keywords
-                link_keywords = [
-                    "read", "watch", "view", "listen", "download",
-                    "register", "learn more", "rsvp"
-                ]
-                
-                if href and "csis.org" in href and any(kw in link_text for kw in link_keywords):
-                    next_link = href
-                    break
-            
-            # Suche in td-Elementen
-            if current.name == "td":
-                link = current.find("a", href=re.compile(r"csis\.org/(analysis|commentary|events|videos)"))
-                if link:
-                    next_link = link.get("href")
-                    break
+        # Methode 1: Suche nach spezifischen Button-Texten (max 15 Schritte), sonst td mit CSIS-Link
+        # Erweiterte Link-Keywords
+        link_keywords = [
+            "read", "watch", "view", "listen", "download",
+            "register", "learn more", "rsvp"
+        ]
+        next_link = find_cta_link(
+            index, title_element, 15,
+            link_matches=lambda a: a.get("href") and "csis.org" in a["href"]
+                and any(kw in a.get_text(strip=True).lower() for kw in link_keywords),
+            nested_matches=lambda a: a.get("href") and content_pattern.search(a["href"]),
+        )
         
         # Methode 2: Fallback - suche nach beliebigem CSIS-Link
         if not next_link:
-            all_links = soup.find_all("a", href=re.compile(r"csis\.org/(analysis|commentary|events|videos)"))
-            if all_links:
-                next_link = all_links[0].get("href")
+            fallback = next((a for a in index.category("a") if a.get("href") and content_pattern.search(a["href"])), None)
+            if fallback:
+                next_link = fallback.get("href")
                 logger.info(f"Aerospace - Fallback-Link gefunden")
         
         if next_link:
             # Pardot-URL auflösen
             final_url = resolve_tracking_url(next_link)
             
-            formatted_article = f"• [{title}]({final_url})"
+            formatted_article = make_article("CSIS_Aerospace", title, final_url)
             articles.append(formatted_article)
             logger.info(f"Aerospace - Artikel hinzugefügt: {title[:50]}...")
         else:
@@ -1690,21 +2049,12 @@ def fetch_aerospace_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"Aerospace - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                logger.warning(f"Fehler beim Abrufen der E-Mail {email_id}: {result}")
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            
-            articles = parse_aerospace_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_aerospace_email, "Aerospace"):
             
             # Duplikate filtern
             for article in articles:
-                url_match = re.search(r'\((https?://[^\)]+)\)', article)
-                if url_match:
-                    url = url_match.group(1)
+                if article.has_web_url():
+                    url = article.url
                     if url not in seen_urls:
                         all_articles.append(article)
                         seen_urls.add(url)
@@ -1720,6 +2070,7 @@ def fetch_aerospace_emails(mail, email_user, email_password, days=None):
 # BROOKINGS CHINA CENTER PARSER
 # ============================================================================
 
+@cached_parser(depends_on=[THINKTANK_MATCHER])
 def parse_brookings_email(msg):
     """
     Spezialisierter Parser für Brookings China Center Newsletter.
@@ -1734,15 +2085,7 @@ def parse_brookings_email(msg):
     logger.info(f"Brookings - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in Brookings E-Mail gefunden")
@@ -1798,12 +2141,7 @@ def parse_brookings_email(msg):
         seen_urls.add(url)
         
         # China-Relevanz-Check
-        china_keywords = [
-            "china", "chinese", "xi jinping", "beijing", "taiwan",
-            "hong kong", "us-china", "sino-", "prc", "communist party"
-        ]
-        
-        is_china_relevant = any(keyword in title.lower() for keyword in china_keywords)
+        is_china_relevant = "brookings_china" in THINKTANK_MATCHER.match(title)
         
         if not is_china_relevant:
             if current_section and any(kw in current_section.lower() for kw in ["china", "us-china"]):
@@ -1813,7 +2151,7 @@ def parse_brookings_email(msg):
             logger.info(f"Brookings - Nicht China-relevant: {title}")
             continue
         
-        formatted_article = f"• [{title}]({url})"
+        formatted_article = make_article("Brookings", title, url)
         articles.append(formatted_article)
         logger.info(f"Brookings - Artikel hinzugefügt: {title[:50]}...")
     
@@ -1850,13 +2188,7 @@ def fetch_brookings_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"Brookings - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            articles = parse_brookings_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_brookings_email, "Brookings"):
             all_articles.extend(articles)
         
         logger.info(f"Brookings China Center: {len(all_articles)} Artikel gefunden")
@@ -1874,6 +2206,7 @@ def fetch_brookings_emails(mail, email_user, email_password, days=None):
 # PIIE (PETERSON INSTITUTE) PARSER
 # ============================================================================
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_piie_email(msg):
     """
     Spezialisierter Parser für PIIE Insider Newsletter.
@@ -1889,15 +2222,7 @@ def parse_piie_email(msg):
     logger.info(f"PIIE - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in PIIE E-Mail gefunden")
@@ -1927,12 +2252,9 @@ def parse_piie_email(msg):
             continue
         
         # Event-Filter (sehr wichtig!)
-        event_keywords = [
-            "event", "watch", "join us", "register", "rsvp",
-            "rebuilding and realignment", "is it time for africa"
-        ]
+        hits = THINKTANK_MATCHER.match(title)
         
-        if any(kw in title.lower() for kw in event_keywords):
+        if "piie_event" in hits:
             logger.info(f"PIIE - Event gefiltert: {title[:50]}...")
             continue
         
@@ -1964,13 +2286,7 @@ def parse_piie_email(msg):
         seen_titles.add(title)
         
         # China-Relevanz prüfen
-        china_keywords = [
-            "china", "chinese", "xi jinping", "beijing", "taiwan",
-            "hong kong", "us-china", "sino-", "prc", "yuan",
-            "renminbi", "shanghai", "asia", "indo-pacific"
-        ]
-        
-        is_china_relevant = any(keyword in title.lower() for keyword in china_keywords)
+        is_china_relevant = "piie_china" in hits
         
         if not is_china_relevant:
             logger.info(f"PIIE - Nicht China-relevant: {title[:50]}...")
@@ -1980,7 +2296,7 @@ def parse_piie_email(msg):
         final_url = resolve_tracking_url(url)
         
         # Formatiere Artikel (ohne Autor)
-        formatted_article = f"• [{title}]({final_url})"
+        formatted_article = make_article("PIIE", title, final_url)
         
         articles.append(formatted_article)
         logger.info(f"PIIE - Artikel hinzugefügt: {title[:50]}...")
@@ -2017,13 +2333,7 @@ def fetch_piie_emails(mail, email_user, email_password, days=None):
         
         logger.info(f"PIIE - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            articles = parse_piie_email(msg)
+        for articles in parse_emails(mail, email_ids, parse_piie_email, "PIIE"):
             all_articles.extend(articles)
         
         logger.info(f"PIIE: {len(all_articles)} Artikel gefunden")
@@ -2041,6 +2351,12 @@ def fetch_piie_emails(mail, email_user, email_password, days=None):
 # CFR (COUNCIL ON FOREIGN RELATIONS) PARSER - DAILY BRIEF
 # ============================================================================
 
+def is_cfr_bordered_box(tag):
+    """Erkennt CFRs graue Artikel-Boxen (td mit border: 1px solid #969da7)."""
+    style = tag.get("style") if tag.name == "td" else None
+    return bool(style) and "border" in style and "#969da7" in style
+
+@cached_parser(depends_on=[resolve_tracking_url, is_cfr_bordered_box, THINKTANK_MATCHER])
 def parse_cfr_daily_brief(msg):
     """
     Parser für CFR Daily News Brief.
@@ -2057,15 +2373,7 @@ def parse_cfr_daily_brief(msg):
     logger.info(f"CFR Daily Brief - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CFR Daily Brief gefunden")
@@ -2075,7 +2383,8 @@ def parse_cfr_daily_brief(msg):
     
     # Finde graue Boxen (border: 1px solid #969da7)
     # Diese Boxen enthalten die Artikel-Links
-    bordered_sections = soup.find_all("td", style=lambda x: x and "border" in x and "#969da7" in x)
+    index = DocumentIndex(soup, predicates={"cfr_box": is_cfr_bordered_box})
+    bordered_sections = index.category("cfr_box")
     
     logger.info(f"CFR Daily Brief Parser - {len(bordered_sections)} graue Boxen gefunden")
     
@@ -2087,7 +2396,7 @@ def parse_cfr_daily_brief(msg):
         url = ""
         
         # Suche nach dem ersten großen Link
-        links = section.find_all("a", href=True)
+        links = [link for link in index.inside(section, "a") if link.get("href")]
         for link in links:
             # Überspringe Bild-Links
             if link.find("img"):
@@ -2135,38 +2444,26 @@ def parse_cfr_daily_brief(msg):
         seen_titles.add(title)
         
         # China-Relevanz prüfen - NUR im Titel, NICHT in Beschreibung
-        china_keywords = [
-            "china", "chinese", "xi jinping", "xi ", "beijing", "taiwan",
-            "hong kong", "hongkong", "us-china", "sino-", "prc", "yuan",
-            "renminbi", "shanghai", "ccp", "communist party", "cpc"
-        ]
-        
         # Prüfe NUR den Titel
-        is_china_relevant = any(keyword in title.lower() for keyword in china_keywords)
+        hits = THINKTANK_MATCHER.match(title)
+        is_china_relevant = "cfr_china" in hits
         
         # Spezielle Ausnahme: "Council Special Report" ist manchmal relevant
         # wenn der E-Mail-Betreff China erwähnt
         if not is_china_relevant and "council special report" in title.lower():
             # Prüfe ob Betreff China-relevant ist
-            if any(kw in subject.lower() for kw in ["china", "beijing", "taiwan", "hong kong", "xi"]):
+            if "cfr_subject_china" in THINKTANK_MATCHER.match(subject):
                 is_china_relevant = True
         
         # Spezielle Ausnahmen für zu breite Matches
         # "Asia" alleine ist zu breit, außer es ist explizit "Asia-Pacific" oder mit China-Kontext
         if not is_china_relevant and "asia" in title.lower():
             # Nur relevant wenn es auch China/Taiwan/Hong Kong im Titel erwähnt
-            if any(kw in title.lower() for kw in ["china", "chinese", "taiwan", "hong kong", "beijing", "shanghai"]):
+            if "cfr_asia_china" in hits:
                 is_china_relevant = True
         
         # Filtere zu breite Artikel raus
-        too_broad = [
-            "all about the united nations",
-            "what to know about the united nations",
-            "what to know about palestinian",
-            "major moments in un history"
-        ]
-        
-        if any(broad in title.lower() for broad in too_broad):
+        if "cfr_too_broad" in hits:
             is_china_relevant = False
         
         if not is_china_relevant:
@@ -2177,7 +2474,7 @@ def parse_cfr_daily_brief(msg):
         final_url = resolve_tracking_url(url)
         
         # Formatiere Artikel
-        formatted_article = f"• [{title}]({final_url})"
+        formatted_article = make_article("CFR_Daily", title, final_url)
         
         articles.append(formatted_article)
         logger.info(f"CFR Daily Brief - Artikel hinzugefügt: {title[:50]}...")
@@ -2214,13 +2511,7 @@ def fetch_cfr_daily_brief(mail, email_user, email_password, days=None):
         
         logger.info(f"CFR Daily Brief - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            articles = parse_cfr_daily_brief(msg)
+        for articles in parse_emails(mail, email_ids, parse_cfr_daily_brief, "CFR Daily Brief"):
             all_articles.extend(articles)
         
         logger.info(f"CFR Daily Brief: {len(all_articles)} Artikel gefunden")
@@ -2238,6 +2529,7 @@ def fetch_cfr_daily_brief(mail, email_user, email_password, days=None):
 # CFR EYES ON ASIA (ASIA STUDIES PROGRAM) PARSER
 # ============================================================================
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_cfr_eyes_on_asia(msg):
     """
     Parser für CFR Eyes on Asia Newsletter (Asia Studies Program).
@@ -2254,15 +2546,7 @@ def parse_cfr_eyes_on_asia(msg):
     logger.info(f"CFR Eyes on Asia - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CFR Eyes on Asia gefunden")
@@ -2357,14 +2641,7 @@ def parse_cfr_eyes_on_asia(msg):
         seen_titles.add(title)
         
         # China-Relevanz prüfen
-        china_keywords = [
-            "china", "chinese", "xi jinping", "xi ", "beijing", "taiwan",
-            "hong kong", "hongkong", "us-china", "sino-", "prc", "yuan",
-            "renminbi", "shanghai", "ccp", "communist party", "cpc", "asia-pacific",
-            "apec", "asean"
-        ]
-        
-        is_china_relevant = any(keyword in title.lower() for keyword in china_keywords)
+        is_china_relevant = "cfr_eyes_on_asia_china" in THINKTANK_MATCHER.match(title)
         
         if not is_china_relevant:
             logger.info(f"CFR Eyes on Asia - Nicht China-relevant: {title[:50]}...")
@@ -2374,7 +2651,7 @@ def parse_cfr_eyes_on_asia(msg):
         final_url = resolve_tracking_url(url)
         
         # Formatiere Artikel
-        formatted_article = f"• [{title}]({final_url})"
+        formatted_article = make_article("CFR_Asia", title, final_url)
         
         articles.append(formatted_article)
         logger.info(f"CFR Eyes on Asia - Artikel hinzugefügt: {title[:50]}...")
@@ -2411,13 +2688,7 @@ def fetch_cfr_eyes_on_asia(mail, email_user, email_password, days=None):
         
         logger.info(f"CFR Eyes on Asia - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            articles = parse_cfr_eyes_on_asia(msg)
+        for articles in parse_emails(mail, email_ids, parse_cfr_eyes_on_asia, "CFR Eyes on Asia"):
             all_articles.extend(articles)
         
         logger.info(f"CFR Eyes on Asia: {len(all_articles)} Artikel gefunden")
@@ -2435,6 +2706,7 @@ def fetch_cfr_eyes_on_asia(mail, email_user, email_password, days=None):
 # ASPI (ASIA SOCIETY POLICY INSTITUTE) - CHINA 5 PARSER
 # ============================================================================
 
+@cached_parser(depends_on=[resolve_tracking_url])
 def parse_aspi_china5(msg):
     """
     Parser für ASPI China 5 Newsletter.
@@ -2451,25 +2723,18 @@ def parse_aspi_china5(msg):
     logger.info(f"ASPI China 5 - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in ASPI China 5 gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
     
     # Finde alle H2 Tags (die Titel der 5 Stories)
     # Pattern: "1. [Title]", "2. [Title]", etc.
-    all_h2 = soup.find_all("h2")
+    all_h2 = index.category("h2")
     
     for h2 in all_h2:
         title_text = h2.get_text(strip=True)
@@ -2480,7 +2745,6 @@ def parse_aspi_china5(msg):
         
         # Extrahiere Nummer und Titel
         # Pattern: "1. Title" oder "1.Title" oder "1. Title"
-        import re
         match = re.match(r'^(\d+)\.\s*(.+)$', title_text)
         
         if not match:
@@ -2499,19 +2763,15 @@ def parse_aspi_china5(msg):
         # Wenn kein Link im H2, suche im Text danach
         if not link_tag:
             # Suche "For More" Link in der Section
-            next_sibling = h2.find_next_sibling()
-            counter = 0
             final_url = "#"
             
             # Durchsuche die nächsten Siblings für "For More" Link
-            while next_sibling and counter < 10:
-                if next_sibling.name and "for more" in next_sibling.get_text().lower():
-                    for_more_link = next_sibling.find("a", href=True)
+            for next_sibling in index.next_siblings(h2, limit=10):
+                if "for more" in next_sibling.get_text().lower():
+                    for_more_link = index.first_inside(next_sibling, "a", lambda a: a.get("href") is not None)
                     if for_more_link:
                         final_url = for_more_link.get("href", "#")
                         break
-                next_sibling = next_sibling.find_next_sibling()
-                counter += 1
         else:
             final_url = link_tag.get("href", "#")
         
@@ -2519,7 +2779,7 @@ def parse_aspi_china5(msg):
         final_url = resolve_tracking_url(final_url)
         
         # Formatiere Artikel
-        formatted_article = f"• [{title}]({final_url})"
+        formatted_article = make_article("ASPI", title, final_url)
         
         articles.append(formatted_article)
         logger.info(f"ASPI China 5 - Section {section_num} hinzugefügt: {title[:50]}...")
@@ -2557,13 +2817,7 @@ def fetch_aspi_china5(mail, email_user, email_password, days=None):
         
         logger.info(f"ASPI China 5 - {len(email_ids)} E-Mails gefunden")
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            articles = parse_aspi_china5(msg)
+        for articles in parse_emails(mail, email_ids, parse_aspi_china5, "ASPI China 5"):
             all_articles.extend(articles)
         
         logger.info(f"ASPI China 5: {len(all_articles)} Artikel gefunden")
@@ -2581,6 +2835,7 @@ def fetch_aspi_china5(mail, email_user, email_password, days=None):
 # CHATHAM HOUSE PARSER
 # ============================================================================
 
+@cached_parser(depends_on=[resolve_tracking_url, THINKTANK_MATCHER])
 def parse_chatham_house(msg):
     """
     Parser für Chatham House Newsletter.
@@ -2597,25 +2852,18 @@ def parse_chatham_house(msg):
     logger.info(f"Chatham House - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in Chatham House gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
     
     # Finde alle H1-ähnlichen Tags (echte H1 + P mit class="h1")
-    all_h1 = soup.find_all("h1")
-    all_h1 += soup.find_all("p", class_="h1")  # Chatham House nutzt <p class="h1">
+    all_h1 = index.category("h1")
+    all_h1 += [tag for tag in index.category("p") if "h1" in (tag.get("class") or [])]  # Chatham House nutzt <p class="h1">
     
     for h1 in all_h1:
         title_text = h1.get_text(strip=True)
@@ -2624,13 +2872,7 @@ def parse_chatham_house(msg):
             continue
         
         # China-Relevanz prüfen
-        china_keywords = [
-            "china", "chinese", "xi jinping", "xi ", "beijing", "taiwan",
-            "hong kong", "hongkong", "renminbi", "yuan", "shanghai", 
-            "ccp", "communist party", "cpc", "prc", "south china sea"
-        ]
-        
-        is_china_relevant = any(keyword in title_text.lower() for keyword in china_keywords)
+        is_china_relevant = "chatham_china" in THINKTANK_MATCHER.match(title_text)
         
         if not is_china_relevant:
             logger.info(f"Chatham House - Nicht China-relevant: {title_text[:50]}...")
@@ -2639,14 +2881,14 @@ def parse_chatham_house(msg):
         # Finde den zugehörigen Link
         # Suche nach "Read the expert comment" / "Read the research paper"
         parent = h1.find_parent()
-        if not parent:
+        if not parent or parent is soup:
             continue
         
         next_link = None
         
-        # Suche in den nächsten Siblings nach Link mit "Read"
-        for sibling in parent.find_all_next(limit=20):
-            link_tag = sibling.find("a", href=True)
+        # Suche in den nächsten 20 Elementen nach Link mit "Read"
+        for sibling in index.following(parent, 20):
+            link_tag = index.first_inside(sibling, "a", lambda a: a.get("href") is not None)
             if link_tag:
                 link_text = link_tag.get_text(strip=True).lower()
                 if "read" in link_text and ("comment" in link_text or "paper" in link_text or "release" in link_text):
@@ -2660,7 +2902,7 @@ def parse_chatham_house(msg):
         final_url = resolve_tracking_url(next_link)
         
         # Formatiere Artikel
-        formatted_article = f"• [{title_text}]({final_url})"
+        formatted_article = make_article("Chatham House", title_text, final_url)
         
         articles.append(formatted_article)
         logger.info(f"Chatham House - Artikel hinzugefügt: {title_text[:50]}...")
@@ -2700,19 +2942,12 @@ def fetch_chatham_house(mail, email_user, email_password, days=None):
         # Deduplizierung innerhalb Chatham House (da gleiche Artikel in mehreren Newslettern)
         seen_chatham_titles = set()
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            articles = parse_chatham_house(msg)
+        for articles in parse_emails(mail, email_ids, parse_chatham_house, "Chatham House"):
             
             # Dedupliziere nach TITEL (Tracking-URLs sind unterschiedlich)
             for article in articles:
-                title_match = re.search(r'\[([^\]]+)\]', article)
-                if title_match:
-                    title = title_match.group(1).lower().strip()
+                if article.title:
+                    title = title_key(article)
                     if title not in seen_chatham_titles:
                         all_articles.append(article)
                         seen_chatham_titles.add(title)
@@ -2734,6 +2969,7 @@ def fetch_chatham_house(mail, email_user, email_password, days=None):
 # LOWY INSTITUTE (THE INTERPRETER) PARSER
 # ============================================================================
 
+@cached_parser(depends_on=[THINKTANK_MATCHER])
 def parse_lowy_interpreter(msg):
     """
     Parser für Lowy Institute "The Interpreter" Newsletter.
@@ -2750,15 +2986,7 @@ def parse_lowy_interpreter(msg):
     logger.info(f"Lowy Institute - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in Lowy Institute gefunden")
@@ -2766,13 +2994,6 @@ def parse_lowy_interpreter(msg):
     
     soup = BeautifulSoup(html_content, "lxml")
     
-    # China-Relevanz Keywords
-    china_keywords = [
-        "china", "chinese", "xi jinping", "xi ", "beijing", "taiwan",
-        "hong kong", "hongkong", "shanghai", "prc", "south china sea",
-        "indo-pacific", "asia-pacific"
-    ]
-    
     # Finde alle Links in der E-Mail
     all_links = soup.find_all("a", href=True)
     
@@ -2794,7 +3015,7 @@ def parse_lowy_interpreter(msg):
             continue
         
         # China-Relevanz prüfen
-        is_china_relevant = any(keyword in title.lower() for keyword in china_keywords)
+        is_china_relevant = "lowy_china" in THINKTANK_MATCHER.match(title)
         
         if not is_china_relevant:
             logger.info(f"Lowy - Nicht China-relevant: {title[:50]}...")
@@ -2804,7 +3025,7 @@ def parse_lowy_interpreter(msg):
         final_url = href
         
         # Formatiere Artikel
-        formatted_article = f"• [{title}]({final_url})"
+        formatted_article = make_article("Lowy", title, final_url)
         
         articles.append(formatted_article)
         logger.info(f"Lowy - Artikel hinzugefügt: {title[:50]}...")
@@ -2813,41 +3034,7 @@ def parse_lowy_interpreter(msg):
     return articles
 
 
-def score_thinktank_article(title, content=""):
-    """
-    Bewertet einen Think Tank-Artikel auf China-Relevanz.
-    Generische Version für alle Think Tanks.
-    """
-    title_lower = title.lower()
-    content_lower = content.lower()
-    full_text = f"{title_lower} {content_lower}"
-    
-    # MUSS China-Bezug haben
-    china_keywords = [
-        "china", "chinese", "xi jinping", "xi", "beijing", "shanghai",
-        "taiwan", "hong kong", "prc", "ccp", "communist party",
-        "sino-", "u.s.-china", "us-china", "asia-pacific", "indo-pacific"
-    ]
-    
-    if not any(kw in full_text for kw in china_keywords):
-        return 0
-    
-    score = 5  # Basis-Score für China-Erwähnung
-    
-    # Wichtige Themen
-    important_topics = [
-        "technology", "trade", "security", "military", "defense",
-        "economy", "tariff", "semiconductor", "ai", "geopolitics",
-        "south china sea", "strait", "policy", "investment", "fdi"
-    ]
-    
-    for topic in important_topics:
-        if topic in full_text:
-            score += 2
-    
-    return max(score, 0)
-
-
+@cached_parser(depends_on=[THINKTANK_MATCHER])
 def parse_hinrich_foundation(msg):
     """
     Parser für Hinrich Foundation Newsletter.
@@ -2864,24 +3051,17 @@ def parse_hinrich_foundation(msg):
     logger.info(f"Hinrich Foundation - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in Hinrich Foundation E-Mail gefunden")
         return articles
     
     soup = BeautifulSoup(html_content, "lxml")
+    index = DocumentIndex(soup)
     
     # STRATEGIE 1: Finde alle <h1>, <h2>, <h3> Tags (Hinrich nutzt verschiedene)
-    for heading in soup.find_all(['h1', 'h2', 'h3']):
+    for heading in index.category(HEADING_TAGS):
         title = heading.get_text(strip=True)
         
         # Skip zu kurze oder leere Titel
@@ -2894,26 +3074,19 @@ def parse_hinrich_foundation(msg):
         
         # Sammle Beschreibungstext nach dem Heading (für besseren China-Check)
         description = ""
-        next_elem = heading.find_next(['p', 'h1', 'h2', 'h3'])
+        next_elem = index.first_after(heading, ('p',) + HEADING_TAGS)
         if next_elem and next_elem.name == 'p':
             description = next_elem.get_text(strip=True)[:300]  # Max 300 Zeichen
         
         # Finde den zugehörigen Link
         link_tag = None
-        current = heading
         
-        # Suche in den nächsten 15 Elementen nach einem relevanten Link
-        for _ in range(15):
-            current = current.find_next(['a', 'h1', 'h2', 'h3'])
-            if not current:
-                break
-            
-            # Stoppe bei nächstem Heading (neuer Artikel beginnt)
-            if current.name in ['h1', 'h2', 'h3']:
-                break
-            
+        # Suche in den nächsten 15 Links bis zum nächsten Heading (neuer Artikel beginnt)
+        next_heading = index.first_after(heading, HEADING_TAGS)
+        until = index.position(next_heading) - 1 if next_heading else None
+        for current in index.after(heading, 'a', until=until, limit=15):
             # Prüfe ob es ein relevanter Link ist
-            if current.name == 'a' and current.get('href'):
+            if current.get('href'):
                 href = current.get('href')
                 link_text = current.get_text(strip=True).upper()
                 
@@ -2935,19 +3108,10 @@ def parse_hinrich_foundation(msg):
                 continue
             
             # China-Check (Titel ODER Beschreibung)
-            china_keywords = [
-                "china", "chinese", "xi jinping", "xi", "beijing", "shanghai",
-                "taiwan", "hong kong", "prc", "ccp", "communist party",
-                "sino-", "u.s.-china", "us-china"
-            ]
-            
-            title_lower = title.lower()
-            desc_lower = description.lower()
-            content = f"{title_lower} {desc_lower}"
-            has_china = any(kw in content for kw in china_keywords)
+            has_china = "hinrich_china" in THINKTANK_MATCHER.match(title, description)
             
             if has_china:
-                articles.append(f"• [{title}]({href})")
+                articles.append(make_article("Hinrich", title, href))
                 seen_titles.add(title)
                 logger.info(f"Hinrich - Artikel hinzugefügt: {title[:60]}...")
             else:
@@ -3006,21 +3170,14 @@ def fetch_hinrich_foundation(mail, email_user, email_password, days=None):
         # Deduplizierung nach TITEL
         seen_titles = set()
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            parsed_articles = parse_hinrich_foundation(msg)
+        for parsed_articles in parse_emails(mail, email_ids, parse_hinrich_foundation, "Hinrich Foundation"):
             
             # Deduplizierung: Nur neue Artikel hinzufügen
             for article in parsed_articles:
-                # Extrahiere Titel aus Markdown-Link
-                title_match = article.split('[')[1].split(']')[0] if '[' in article and ']' in article else article
-                if title_match not in seen_titles:
+                title = title_key(article)
+                if title not in seen_titles:
                     all_articles.append(article)
-                    seen_titles.add(title_match)
+                    seen_titles.add(title)
         
         logger.info(f"Hinrich Foundation - FINAL: {len(all_articles)} Artikel (nach Dedup)")
         return all_articles, len(email_ids)
@@ -3030,6 +3187,7 @@ def fetch_hinrich_foundation(mail, email_user, email_password, days=None):
         return [], 0
 
 
+@cached_parser(depends_on=[THINKTANK_MATCHER])
 def parse_crea_energy(msg):
     """
     Parser für CREA (Centre for Research on Energy and Clean Air).
@@ -3048,15 +3206,7 @@ def parse_crea_energy(msg):
     logger.info(f"CREA - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CREA E-Mail gefunden")
@@ -3064,12 +3214,6 @@ def parse_crea_energy(msg):
     
     soup = BeautifulSoup(html_content, "lxml")
     
-    # Nicht-China-Keywords (andere Länder/Regionen)
-    non_china_keywords = [
-        'india', 'indian', 'indonesia', 'indonesian', 'europe', 'european', 'eu ', 
-        'russia', 'russian', 'south africa', 'brazil', 'turkish', 'turkey'
-    ]
-    
     for link in soup.find_all('a', href=True):
         href = link.get('href')
         title = link.get_text(strip=True)
@@ -3111,14 +3255,15 @@ def parse_crea_energy(msg):
         # z.B. "India power sector..." → Skip
         # z.B. "Indonesia coal..." → Skip
         first_words = ' '.join(title_lower.split()[:3])  # Erste 3 Wörter
-        if any(keyword in first_words for keyword in non_china_keywords):
+        non_china = THINKTANK_MATCHER.match(first_words).get("crea_non_china")
+        if non_china:
             # Prüfe ob China auch prominent ist (in ersten 5 Wörtern)
             first_five = ' '.join(title_lower.split()[:5])
             if 'china' not in first_five:
-                logger.info(f"CREA - Übersprungen (hauptsächlich {keyword}): {title[:60]}...")
+                logger.info(f"CREA - Übersprungen (hauptsächlich {', '.join(sorted(non_china))}): {title[:60]}...")
                 continue
         
-        articles.append(f"• [{title}]({href})")
+        articles.append(make_article("CREA", title, href))
         logger.info(f"CREA - Artikel hinzugefügt: {title[:60]}...")
     
     logger.info(f"CREA Parser - {len(articles)} Artikel extrahiert")
@@ -3138,15 +3283,7 @@ def parse_crea_energy(msg):
     logger.info(f"CREA - Betreff: {subject}")
     
     # HTML-Inhalt finden
-    html_content = None
-    for part in msg.walk():
-        if part.get_content_type() == "text/html":
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                html_content = part.get_payload(decode=True).decode(charset)
-            except UnicodeDecodeError:
-                html_content = part.get_payload(decode=True).decode("windows-1252", errors="replace")
-            break
+    html_content = get_html_content(msg)
     
     if not html_content:
         logger.warning("Keine HTML-Inhalte in CREA E-Mail gefunden")
@@ -3208,7 +3345,7 @@ def parse_crea_energy(msg):
             logger.debug(f"CREA DEBUG - Skip chinesische Version: {title[:40]}...")
             continue
         
-        articles.append(f"• [{title}]({href})")
+        articles.append(make_article("CREA", title, href))
         logger.info(f"CREA - Artikel hinzugefügt: {title[:60]}...")
     
     logger.info(f"CREA DEBUG - Links verarbeitet: {links_processed}")
@@ -3270,21 +3407,14 @@ def fetch_crea_energy(mail, email_user, email_password, days=None):
         # Deduplizierung nach TITEL
         seen_titles = set()
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            parsed_articles = parse_crea_energy(msg)
+        for parsed_articles in parse_emails(mail, email_ids, parse_crea_energy, "CREA"):
             
             # Deduplizierung: Nur neue Artikel hinzufügen
             for article in parsed_articles:
-                # Extrahiere Titel aus Markdown-Link
-                title_match = article.split('[')[1].split(']')[0] if '[' in article and ']' in article else article
-                if title_match not in seen_titles:
+                title = title_key(article)
+                if title not in seen_titles:
                     all_articles.append(article)
-                    seen_titles.add(title_match)
+                    seen_titles.add(title)
         
         logger.info(f"CREA - FINAL: {len(all_articles)} Artikel (nach Dedup)")
         return all_articles, len(email_ids)
@@ -3325,19 +3455,12 @@ def fetch_lowy_interpreter(mail, email_user, email_password, days=None):
         # Deduplizierung nach TITEL (Tracking-URLs sind unterschiedlich)
         seen_lowy_titles = set()
         
-        for email_id in email_ids:
-            result, msg_data = mail.fetch(email_id, "(RFC822)")
-            if result != "OK":
-                continue
-            
-            msg = email.message_from_bytes(msg_data[0][1])
-            articles = parse_lowy_interpreter(msg)
+        for articles in parse_emails(mail, email_ids, parse_lowy_interpreter, "Lowy Interpreter"):
             
             # Dedupliziere nach Titel
             for article in articles:
-                title_match = re.search(r'\[([^\]]+)\]', article)
-                if title_match:
-                    title = title_match.group(1).lower().strip()
+                if article.title:
+                    title = title_key(article)
                     if title not in seen_lowy_titles:
                         all_articles.append(article)
                         seen_lowy_titles.add(title)
@@ -3357,81 +3480,6 @@ def fetch_lowy_interpreter(mail, email_user, email_password, days=None):
 
 # ============================================================================
 
-def deduplicate_csis_articles(*article_lists):
-    """
-    Entfernt Duplikate aus allen CSIS Newsletter-Listen.
-    Behält die erste Instanz jedes Artikels.
-    """
-    newsletter_names = [
-        "Geopolitics",
-        "Freeman Chair",
-        "Trustee Chair",
-        "Japan Chair",
-        "China Power",
-        "Korea Chair",
-        "GHPC",
-        "Aerospace"
-    ]
-    
-    seen_urls = set()
-    deduplicated_lists = []
-    
-    for idx, article_list in enumerate(article_lists):
-        newsletter_name = newsletter_names[idx] if idx < len(newsletter_names) else f"Liste {idx+1}"
-        
-        logger.info(f"CSIS Dedup - {newsletter_name}: {len(article_list)} Artikel VOR Deduplizierung")
-        
-        deduplicated = []
-        
-        for article in article_list:
-            # URL aus Markdown-Link extrahieren
-            url_match = re.search(r'\((https?://[^\)]+)\)', article)
-            
-            if url_match:
-                url = url_match.group(1)
-                # Normalisiere URL (entferne Query-Parameter)
-                normalized_url = url.split('?')[0]
-                
-                if normalized_url not in seen_urls:
-                    deduplicated.append(article)
-                    seen_urls.add(normalized_url)
-                    logger.debug(f"CSIS Dedup - {newsletter_name}: Behalte {article[:50]}...")
-                else:
-                    logger.info(f"CSIS Dedup - {newsletter_name}: ❌ Duplikat entfernt: {article[:60]}...")
-            else:
-                # Kein URL gefunden, behalte Artikel
-                deduplicated.append(article)
-                logger.debug(f"CSIS Dedup - {newsletter_name}: Kein URL gefunden, behalte: {article[:50]}...")
-        
-        logger.info(f"CSIS Dedup - {newsletter_name}: {len(deduplicated)} Artikel NACH Deduplizierung")
-        deduplicated_lists.append(deduplicated)
-    
-    total_before = sum(len(lst) for lst in article_lists)
-    total_after = sum(len(lst) for lst in deduplicated_lists)
-    logger.info(f"CSIS Dedup - GESAMT: {total_before} → {total_after} Artikel ({total_before - total_after} Duplikate entfernt)")
-    
-    return tuple(deduplicated_lists)
-
-def normalize_url(url):
-    """
-    Normalisiert URLs für bessere Duplikatserkennung.
-    - Entfernt Query-Parameter (?...)
-    - Folgt Brookings/CSIS Tracking-Redirects zum finalen Artikel
-    """
-    # Entferne Query-Parameter
-    base_url = url.split('?')[0]
-    
-    # Für Brookings connect.brookings.edu Links: Extrahiere Titel aus URL
-    # Diese haben Format: connect.brookings.edu/e3t/Ctc/.../[TRACKING_PARAMS]
-    # Wir können nicht automatisch resolven, also verwenden wir nur den Domain + Path
-    if "connect.brookings.edu" in base_url:
-        # Tracking-URLs sind eindeutig pro Newsletter, aber nicht pro Artikel
-        # Wir müssen den finalen Zielartikel identifizieren
-        # Leider können wir das nicht aus der URL extrahieren
-        return base_url
-    
-    return base_url
-
 # ============================================================================
 # DYNAMIC BRIEFING GENERATION (JSON-gesteuert)
 # ============================================================================
@@ -3454,7 +3502,18 @@ def load_thinktank_order():
         return []
 
 
-def build_dynamic_briefing(think_tank_data_dict):
+def briefing_header(focus_entities=None, trends=None):
+    """Überschrift sowie "Im Fokus"- und "Im Trend"-Zeile (für beide Ansichten)."""
+    header = ["## Think Tanks Briefing", ""]
+    if focus_entities:
+        header.append("Im Fokus: " + " · ".join(f"{entity} ({count})" for entity, count in focus_entities[:FOCUS_ENTITY_LIMIT]))
+        header.append("")
+    if trends:
+        header.append("Im Trend: " + " · ".join(name for name, heat in trends[:TRENDING_LIMIT]))
+        header.append("")
+    return header
+
+def build_dynamic_briefing(think_tank_data_dict, focus_entities=None, trends=None):
     """
     Baut Briefing dynamisch basierend auf thinktanks.json Order.
     
@@ -3466,13 +3525,13 @@ def build_dynamic_briefing(think_tank_data_dict):
             "Brookings": brookings_articles,
             ...
         }
+        focus_entities: Optional [(Entität, Anzahl)] für die "Im Fokus"-Zeile
+        trends: Optional [(Begriff, Heat)] für die "Im Trend"-Zeile
     
     Returns:
-        List of briefing lines
+        List of briefing lines (Überschriften als Strings, Artikel als Article)
     """
-    briefing = []
-    briefing.append("## Think Tanks Briefing")
-    briefing.append("")
+    briefing = briefing_header(focus_entities, trends)
     
     # Lade Reihenfolge aus JSON
     thinktanks_order = load_thinktank_order()
@@ -3546,392 +3605,164 @@ def build_dynamic_briefing(think_tank_data_dict):
     
     return briefing
 
-def normalize_url(url):
+def build_topic_briefing(topics, focus_entities=None, trends=None):
     """
-    Normalisiert URLs für Deduplizierung.
-    
-    Spezialbehandlung für Mailchimp/list-manage Tracking-Links:
-    - Behält den 'id' Parameter (identifiziert den Artikel)
-    - Entfernt 'u' und 'e' Parameter (User-IDs, nicht relevant)
-    
-    Für alle anderen URLs:
-    - Entfernt alle Query-Parameter
-    
-    Beispiele:
-    - Mailchimp: https://...list-manage.com/track/click?u=XXX&id=abc123&e=YYY
-      → https://...list-manage.com/track/click?id=abc123
-    - Normal: https://example.com/article?utm_source=newsletter
-      → https://example.com/article
+    Briefing nach Themen statt nach Think Tank (BRIEFING_VIEW = "topic").
+    topics: Ergebnis von cluster_topics(); hinter jedem Artikel steht seine Quelle.
+
+    Returns:
+        List of briefing lines (Überschriften als Strings, Artikel als Article)
+    """
+    briefing = briefing_header(focus_entities, trends)
+    if not topics:
+        briefing.append("• Keine relevanten Artikel gefunden.")
+        return briefing
+    for label, items in topics:
+        briefing.append(f"### {label or 'Weitere Themen'}")
+        for section, article in items:
+            article.extras = {**(article.extras or {}), "via": section.replace("_", " ")}
+            briefing.append(article)
+        briefing.append("")
+    return briefing
+
+def thinktank_priorities():
     """
-    # Spezialbehandlung für list-manage (Mailchimp) Links
-    if 'list-manage' in url.lower():
-        import urllib.parse
-        parsed = urllib.parse.urlparse(url)
-        params = urllib.parse.parse_qs(parsed.query)
-        
-        # Behalte NUR den 'id' Parameter (identifiziert den Artikel)
-        if 'id' in params:
-            article_id = params['id'][0]
-            # Baue URL mit nur dem id Parameter
-            base_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            return f"{base_url}?id={article_id}"
-        else:
-            # Kein id Parameter? Dann komplette URL behalten
-            return url
-    
-    # Für alle anderen URLs: Entferne Query-Parameter
-    return url.split('?')[0]
+    Rang je Abschnitt aus dem order-Feld von thinktanks.json: {Abkürzung/Name: order}.
+    Abschnitte wie "CSIS_Freeman" oder "CFR_Daily" erben den Rang ihres Think Tanks.
+    """
+    priorities = {}
+    for tt in load_thinktank_order():
+        order = tt.get("order", 999)
+        for key in (tt.get("abbreviation"), tt.get("think_tank")):
+            if key:
+                priorities.setdefault(key, order)
+    return priorities
 
+def section_priority(section, priorities):
+    if section in priorities:
+        return priorities[section]
+    return priorities.get(section.split("_", 1)[0], 999)
 
-def deduplicate_all_thinktanks(merics_articles, brookings_articles, piie_articles, cfr_daily_articles, cfr_asia_articles, aspi_china5_articles, chatham_articles, lowy_articles, hinrich_articles, crea_articles, *csis_articles):
+# Tracking-Link → Ziel-URL (persistent, aufgelöst wird nur bei Titel-Kollisionen)
+TRACKING_LINKS = TrackingResolver(TRACKING_LINKS_FILE)
+
+def tracking_destination(article, resolve=False):
     """
-    Globale Deduplizierung über ALLE Think Tanks hinweg.
-    Entfernt Duplikate zwischen MERICS, Brookings, PIIE, CFR (Daily + Eyes on Asia), ASPI (China 5), Chatham House, Lowy Institute, Hinrich Foundation, CREA und CSIS.
-    
-    Args:
-        merics_articles: MERICS Artikel-Liste
-        brookings_articles: Brookings Artikel-Liste
-        piie_articles: PIIE Artikel-Liste
-        cfr_daily_articles: CFR Daily Brief Artikel-Liste
-        cfr_asia_articles: CFR Eyes on Asia Artikel-Liste
-        aspi_china5_articles: ASPI China 5 Artikel-Liste
-        chatham_articles: Chatham House Artikel-Liste
-        lowy_articles: Lowy Institute Artikel-Liste
-        hinrich_articles: Hinrich Foundation Artikel-Liste
-        crea_articles: CREA (Energy & Clean Air) Artikel-Liste
-        *csis_articles: Variable Anzahl CSIS Newsletter-Listen
-    
-    Returns:
-        Tuple: (merics_dedup, brookings_dedup, piie_dedup, cfr_daily_dedup, cfr_asia_dedup, aspi_china5_dedup, chatham_dedup, lowy_dedup, hinrich_dedup, crea_dedup, *csis_dedup)
+    Setzt die kanonische URL eines Artikels mit Tracking-Link auf die Ziel-URL,
+    sobald diese bekannt ist (resolve=True: bei Bedarf auflösen).
+    Rückgabe: True, wenn die Ziel-URL jetzt feststeht.
+    """
+    if not article.has_web_url():
+        return False
+    if not is_tracking_url(article.url):
+        return True
+    destination = TRACKING_LINKS.destination(article.url) if resolve else TRACKING_LINKS.known(article.url)
+    if destination is None:
+        return False
+    article.canonical_url = destination
+    return True
+
+def same_destination(article, other):
+    """
+    Führen zwei Artikel (deren Titel kollidieren) auf dieselbe Seite?
+    Tracking-Links werden nur hier lazy aufgelöst. None: nicht entscheidbar
+    (kein Tracking-Link beteiligt oder Auflösung fehlgeschlagen).
+    """
+    if not (is_tracking_url(article.url) or is_tracking_url(other.url)):
+        return None
+    if not (tracking_destination(article, resolve=True) and tracking_destination(other, resolve=True)):
+        return None
+    return article.canonical_url == other.canonical_url
+
+def deduplicate_thinktanks(sections, near_threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Globale Deduplizierung über beliebig viele Quellen in einem Durchlauf.
+
+    sections: {Abschnitt: [Article]} (z.B. "MERICS", "CSIS_Geopolitics").
+    Abschnitte werden nach dem order-Feld in thinktanks.json abgearbeitet
+    (Abschnitte desselben Think Tanks in Dict-Reihenfolge); ein Artikel ist
+    Duplikat, wenn seine kanonische URL oder sein normalisierter Titel schon
+    bei einer höher priorisierten Quelle vorkam. Zwei Hash-Indizes, Aufwand
+    linear in der Gesamtzahl der Artikel.
+
+    Zusätzlich werden fast gleiche Titel (Jaccard ≥ near_threshold über
+    MinHash/LSH, siehe near_duplicates.py) verworfen; None schaltet das ab.
+
+    Tracking-Links zählen mit ihrer Ziel-URL, sofern die Zuordnung bekannt
+    ist. Kollidieren zwei Titel und ist ein Tracking-Link beteiligt, wird
+    aufgelöst: gleiche Ziel-URL → Duplikat, verschiedene → beide behalten.
+
+    Returns: {Abschnitt: [Article]} in der Reihenfolge von sections.
     """
     logger.info("=" * 60)
     logger.info("STARTE GLOBALE THINK TANK DEDUPLIZIERUNG")
     logger.info("=" * 60)
-    
-    seen_urls = set()
-    seen_titles = set()  # NEU: Deduplizierung nach Titeln für Brookings
-    
-    # DEBUG: Tracking für energyandcleanair.org URLs
-    energyandcleanair_urls = {}  # URL -> Think Tank Name
-    
-    # MERICS deduplizieren (kommt zuerst, hat Priorität)
-    merics_dedup = []
-    for article in merics_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            # DEBUG: Tracke energyandcleanair.org URLs
-            if 'energyandcleanair.org' in url:
-                energyandcleanair_urls[url] = "MERICS"
-                logger.info(f"DEBUG - MERICS hat energyandcleanair.org URL: {url}")
-            
-            if url not in seen_urls and title not in seen_titles:
-                merics_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                logger.info(f"Global Dedup - MERICS: ❌ Duplikat: {article[:60]}...")
-        else:
-            merics_dedup.append(article)
-    
-    logger.info(f"MERICS: {len(merics_articles)} → {len(merics_dedup)} ({len(merics_articles)-len(merics_dedup)} Duplikate)")
-    
-    # Brookings deduplizieren (WICHTIG: auch nach Titel!)
-    brookings_dedup = []
-    for article in brookings_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            # Prüfe SOWOHL URL als AUCH Titel
-            if url not in seen_urls and title not in seen_titles:
-                brookings_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - Brookings: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            brookings_dedup.append(article)
-    
-    logger.info(f"Brookings: {len(brookings_articles)} → {len(brookings_dedup)} ({len(brookings_articles)-len(brookings_dedup)} Duplikate)")
-    
-    # PIIE deduplizieren
-    piie_dedup = []
-    for article in piie_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            if url not in seen_urls and title not in seen_titles:
-                piie_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - PIIE: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            piie_dedup.append(article)
-    
-    logger.info(f"PIIE: {len(piie_articles)} → {len(piie_dedup)} ({len(piie_articles)-len(piie_dedup)} Duplikate)")
-    
-    # CFR Daily Brief deduplizieren
-    cfr_daily_dedup = []
-    for article in cfr_daily_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            if url not in seen_urls and title not in seen_titles:
-                cfr_daily_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - CFR Daily: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            cfr_daily_dedup.append(article)
-    
-    logger.info(f"CFR Daily: {len(cfr_daily_articles)} → {len(cfr_daily_dedup)} ({len(cfr_daily_articles)-len(cfr_daily_dedup)} Duplikate)")
-    
-    # CFR Eyes on Asia deduplizieren
-    cfr_asia_dedup = []
-    for article in cfr_asia_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            if url not in seen_urls and title not in seen_titles:
-                cfr_asia_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - CFR Eyes on Asia: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            cfr_asia_dedup.append(article)
-    
-    logger.info(f"CFR Eyes on Asia: {len(cfr_asia_articles)} → {len(cfr_asia_dedup)} ({len(cfr_asia_articles)-len(cfr_asia_dedup)} Duplikate)")
-    
-    # ASPI China 5 deduplizieren
-    aspi_china5_dedup = []
-    for article in aspi_china5_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            if url not in seen_urls and title not in seen_titles:
-                aspi_china5_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - ASPI China 5: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            aspi_china5_dedup.append(article)
-    
-    logger.info(f"ASPI China 5: {len(aspi_china5_articles)} → {len(aspi_china5_dedup)} ({len(aspi_china5_articles)-len(aspi_china5_dedup)} Duplikate)")
-    
-    # Chatham House deduplizieren
-    chatham_dedup = []
-    for article in chatham_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            if url not in seen_urls and title not in seen_titles:
-                chatham_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - Chatham House: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            chatham_dedup.append(article)
-    
-    logger.info(f"Chatham House: {len(chatham_articles)} → {len(chatham_dedup)} ({len(chatham_articles)-len(chatham_dedup)} Duplikate)")
-    
-    # Lowy Institute deduplizieren
-    lowy_dedup = []
-    for article in lowy_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            if url not in seen_urls and title not in seen_titles:
-                lowy_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - Lowy Institute: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            lowy_dedup.append(article)
-    
-    logger.info(f"Lowy Institute: {len(lowy_articles)} → {len(lowy_dedup)} ({len(lowy_articles)-len(lowy_dedup)} Duplikate)")
-    
-    # Hinrich Foundation deduplizieren
-    hinrich_dedup = []
-    for article in hinrich_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            if url not in seen_urls and title not in seen_titles:
-                hinrich_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                logger.info(f"Global Dedup - Hinrich Foundation: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            hinrich_dedup.append(article)
-    
-    logger.info(f"Hinrich Foundation: {len(hinrich_articles)} → {len(hinrich_dedup)} ({len(hinrich_articles)-len(hinrich_dedup)} Duplikate)")
-    
-    # CREA deduplizieren MIT DETAILLIERTEM DEBUG
-    logger.info("=" * 60)
-    logger.info("DEBUG: CREA DEDUPLIZIERUNG STARTET")
-    logger.info(f"DEBUG: CREA hat {len(crea_articles)} Artikel")
-    logger.info(f"DEBUG: seen_urls enthält aktuell {len(seen_urls)} URLs")
-    logger.info(f"DEBUG: seen_titles enthält aktuell {len(seen_titles)} Titel")
-    
-    # DEBUG: Zeige ALLE energyandcleanair.org URLs die bereits in seen_urls sind
-    energyandcleanair_in_seen = [url for url in seen_urls if 'energyandcleanair.org' in url]
-    if energyandcleanair_in_seen:
-        logger.info("=" * 60)
-        logger.info(f"⚠️  WARNUNG: {len(energyandcleanair_in_seen)} energyandcleanair.org URLs bereits in seen_urls!")
-        logger.info("Diese URLs wurden von Think Tanks VOR CREA hinzugefügt:")
-        for url in energyandcleanair_in_seen:
-            # Tracke welcher Think Tank diese URL hat
-            found_in = []
-            for tt_name, tt_articles in [
-                ("MERICS", merics_dedup), ("Brookings", brookings_dedup), 
-                ("PIIE", piie_dedup), ("CFR Daily", cfr_daily_dedup), 
-                ("CFR Asia", cfr_asia_dedup), ("ASPI", aspi_china5_dedup),
-                ("Chatham", chatham_dedup), ("Lowy", lowy_dedup), 
-                ("Hinrich", hinrich_dedup)
-            ]:
-                for article in tt_articles:
-                    if url in article:
-                        found_in.append(tt_name)
-                        break
-            logger.info(f"  - {url}")
-            if found_in:
-                logger.info(f"    └─ Gefunden in: {', '.join(found_in)}")
-            else:
-                logger.info(f"    └─ Herkunft unbekannt (CSIS?)")
-        logger.info("=" * 60)
-    else:
-        logger.info("✅ Keine energyandcleanair.org URLs in seen_urls (gut!)")
-    logger.info("=" * 60)
-    
-    crea_dedup = []
-    for article in crea_articles:
-        url_match = re.search(r'\((https?://[^\)]+)\)', article)
-        title_match = re.search(r'\[([^\]]+)\]', article)
-        
-        if url_match:
-            url = normalize_url(url_match.group(1))
-            title = title_match.group(1).lower().strip() if title_match else ""
-            
-            logger.info(f"DEBUG CREA - Prüfe Artikel: {title[:60]}...")
-            logger.info(f"DEBUG CREA - URL: {url}")
-            logger.info(f"DEBUG CREA - URL in seen_urls? {url in seen_urls}")
-            logger.info(f"DEBUG CREA - Title in seen_titles? {title in seen_titles}")
-            
-            if url not in seen_urls and title not in seen_titles:
-                crea_dedup.append(article)
-                seen_urls.add(url)
-                if title:
-                    seen_titles.add(title)
-                logger.info(f"DEBUG CREA - ✅ AKZEPTIERT")
-            else:
-                reason = "URL" if url in seen_urls else "Titel"
-                # WICHTIG: Zeige WELCHER Think Tank diese URL/Titel bereits hat!
-                if url in seen_urls:
-                    logger.info(f"DEBUG CREA - ❌ URL BLOCKIERT: {url}")
-                    logger.info(f"DEBUG CREA - Diese URL wurde bereits von einem Think Tank VOR CREA hinzugefügt!")
-                if title in seen_titles:
-                    logger.info(f"DEBUG CREA - ❌ TITEL BLOCKIERT: {title}")
-                logger.info(f"Global Dedup - CREA: ❌ Duplikat ({reason}): {article[:60]}...")
-        else:
-            crea_dedup.append(article)
-            logger.info(f"DEBUG CREA - ✅ AKZEPTIERT (keine URL extrahiert): {article[:60]}...")
-    
-    logger.info("=" * 60)
-    logger.info(f"DEBUG: CREA DEDUPLIZIERUNG ABGESCHLOSSEN")
-    logger.info(f"CREA: {len(crea_articles)} → {len(crea_dedup)} ({len(crea_articles)-len(crea_dedup)} Duplikate)")
-    logger.info("=" * 60)
-    
-    # CSIS deduplizieren (alle Newsletter)
-    csis_names = [
-        "CSIS Geopolitics", "CSIS Freeman", "CSIS Trustee", "CSIS Japan",
-        "CSIS China Power", "CSIS Korea", "CSIS GHPC", "CSIS Aerospace"
-    ]
-    
-    csis_dedup_lists = []
-    for idx, csis_list in enumerate(csis_articles):
-        name = csis_names[idx] if idx < len(csis_names) else f"CSIS {idx+1}"
-        dedup = []
-        
-        for article in csis_list:
-            url_match = re.search(r'\((https?://[^\)]+)\)', article)
-            if url_match:
-                url = normalize_url(url_match.group(1))
-                if url not in seen_urls:
-                    dedup.append(article)
-                    seen_urls.add(url)
+
+    priorities = thinktank_priorities()
+    seen_urls = {}    # kanonische (Ziel-)URL → Abschnitt, der sie zuerst hatte
+    seen_titles = {}  # normalisierter Titel → (Abschnitt, Article)
+    near_index = NearDuplicateIndex(near_threshold) if near_threshold is not None else None
+    near_duplicates = 0
+    deduplicated = {}
+    total_before = 0
+
+    for section in sorted(sections, key=lambda section: section_priority(section, priorities)):
+        articles = sections[section]
+        total_before += len(articles)
+        kept = []
+        for article in articles:
+            tracking_destination(article)
+            url = article.canonical_url if article.has_web_url() else None
+            title = title_key(article)
+            if url and url in seen_urls:
+                logger.info(f"Global Dedup - {section}: ❌ Duplikat (URL, schon in {seen_urls[url]}): {article.title[:60]}...")
+                continue
+
+            # Titel-Kollision (exakt oder fast gleich)?
+            collision = None
+            if title and title in seen_titles:
+                first_section, first = seen_titles[title]
+                collision = ("Titel", first_section, first, False)
+            elif near_index is not None:
+                near = near_index.find(article.title)
+                if near:
+                    similarity, (first_section, first) = near
+                    collision = (f"Fast-Duplikat, Jaccard {similarity:.2f}", first_section, first, True)
+            if collision:
+                reason, first_section, first, near_hit = collision
+                same = same_destination(article, first)
+                url = article.canonical_url if article.has_web_url() else None
+                if same is False and not (url and url in seen_urls):
+                    logger.info(f"Global Dedup - {section}: ✅ {reason} mit {first_section}, aber andere Ziel-URL - behalten: "
+                                f"{article.title[:60]}")
                 else:
-                    logger.info(f"Global Dedup - {name}: ❌ Duplikat: {article[:60]}...")
-            else:
-                dedup.append(article)
-        
-        logger.info(f"{name}: {len(csis_list)} → {len(dedup)} ({len(csis_list)-len(dedup)} Duplikate)")
-        csis_dedup_lists.append(dedup)
-    
+                    if same:
+                        reason = f"{reason}, gleiche Ziel-URL"
+                    logger.info(f"Global Dedup - {section}: ❌ Duplikat ({reason}, schon in {first_section}): "
+                                f"{article.title[:60]} ≈ {first.title[:60]}")
+                    near_duplicates += near_hit
+                    continue
+
+            if near_index is not None:
+                near_index.add(article.title, (section, article))
+            kept.append(article)
+            if url:
+                seen_urls[url] = section
+            if title:
+                seen_titles.setdefault(title, (section, article))
+        if articles:
+            logger.info(f"{section}: {len(articles)} → {len(kept)} ({len(articles)-len(kept)} Duplikate)")
+        deduplicated[section] = kept
+
+    total_after = sum(len(articles) for articles in deduplicated.values())
     logger.info("=" * 60)
-    logger.info("GLOBALE DEDUPLIZIERUNG ABGESCHLOSSEN")
+    logger.info(f"GLOBALE DEDUPLIZIERUNG ABGESCHLOSSEN: {total_before} → {total_after} Artikel")
+    if near_index is not None:
+        logger.info(f"Fast-Duplikate: {near_duplicates} verworfen (Schwelle {near_threshold}, "
+                    f"LSH {near_index.bands}×{near_index.rows}, {near_index.comparisons} Titel-Vergleiche)")
     logger.info("=" * 60)
-    
-    return (merics_dedup, brookings_dedup, piie_dedup, cfr_daily_dedup, cfr_asia_dedup, aspi_china5_dedup, chatham_dedup, lowy_dedup, hinrich_dedup, crea_dedup, *csis_dedup_lists)
+
+    return {section: deduplicated[section] for section in sections}
 
 def main():
     logger.info("Starte Think Tanks Skript (MERICS + CSIS + Brookings)")
@@ -4015,68 +3846,59 @@ def main():
         # CREA (nutzt GLOBAL_THINKTANK_DAYS)
         crea_articles, crea_count = fetch_crea_energy(mail, email_user, email_password)
         
-        # GLOBALE Deduplizierung über ALLE Think Tanks
-        logger.info("Starte GLOBALE Think Tank Deduplizierung...")
-        merics_articles, brookings_articles, piie_articles, cfr_daily_articles, cfr_asia_articles, aspi_china5_articles, chatham_articles, lowy_articles, hinrich_articles, crea_articles, csis_geo_articles, csis_freeman_articles, csis_trustee_articles, csis_japan_articles, chinapower_articles, korea_chair_articles, ghpc_articles, aerospace_articles = deduplicate_all_thinktanks(
-            merics_articles,
-            brookings_articles,
-            piie_articles,
-            cfr_daily_articles,
-            cfr_asia_articles,
-            aspi_china5_articles,
-            chatham_articles,
-            lowy_articles,
-            hinrich_articles,
-            crea_articles,
-            csis_geo_articles,
-            csis_freeman_articles,
-            csis_trustee_articles,
-            csis_japan_articles,
-            chinapower_articles,
-            korea_chair_articles,
-            ghpc_articles,
-            aerospace_articles
-        )
-        logger.info("Globale Deduplizierung abgeschlossen")
+        # GLOBALE Deduplizierung über ALLE Think Tanks (Priorität laut thinktanks.json)
+        think_tank_data = deduplicate_thinktanks({
+            "CREA": crea_articles,
+            "PIIE": piie_articles,
+            "MERICS": merics_articles,
+            "Brookings": brookings_articles,
+            "Hinrich": hinrich_articles,
+            "ASPI Policy": [],  # Noch kein Parser
+            "Lowy": lowy_articles,
+            "Chatham House": chatham_articles,
+            "CFR_Daily": cfr_daily_articles,
+            "CFR_Asia": cfr_asia_articles,
+            "CSIS_Geopolitics": csis_geo_articles,
+            "CSIS_Freeman": csis_freeman_articles,
+            "CSIS_Trustee": csis_trustee_articles,
+            "CSIS_Japan": csis_japan_articles,
+            "CSIS_ChinaPower": chinapower_articles,
+            "CSIS_Korea": korea_chair_articles,
+            "CSIS_GHPC": ghpc_articles,
+            "CSIS_Aerospace": aerospace_articles,
+            "ASPI": aspi_china5_articles,
+            "Atlantic Council": []  # Noch keine Daten
+        })
         
     finally:
         mail.logout()
         logger.info("IMAP-Logout erfolgreich")
-    
-    # Briefing erstellen
-    briefing = []
-    # Build Think Tank Data Dict für Dynamic Briefing
-    think_tank_data = {
-        "CREA": crea_articles,
-        "PIIE": piie_articles,
-        "MERICS": merics_articles,
-        "Brookings": brookings_articles,
-        "Hinrich": hinrich_articles,
-        "ASPI Policy": [],  # Noch kein Parser
-        "Lowy": lowy_articles,
-        "Chatham House": chatham_articles,
-        "CFR_Daily": cfr_daily_articles,
-        "CFR_Asia": cfr_asia_articles,
-        "CSIS_Geopolitics": csis_geo_articles,
-        "CSIS_Freeman": csis_freeman_articles,
-        "CSIS_Trustee": csis_trustee_articles,
-        "CSIS_Japan": csis_japan_articles,
-        "CSIS_ChinaPower": chinapower_articles,
-        "CSIS_Korea": korea_chair_articles,
-        "CSIS_GHPC": ghpc_articles,
-        "CSIS_Aerospace": aerospace_articles,
-        "ASPI": aspi_china5_articles,
-        "Atlantic Council": []  # Noch keine Daten
-    }
-    
-    # Generiere dynamisches Briefing basierend auf thinktanks.json
-    briefing = build_dynamic_briefing(think_tank_data)
+        save_parse_cache()
+        save_decoding_profiles()
+        TRACKING_LINKS.save()
+        BODY_FINGERPRINTS.save()
+        url_memo = canonicalize_url.cache_info()
+        logger.info(f"URL-Kanonisierung: {url_memo.hits} Treffer / {url_memo.misses} berechnet (Memo {url_memo.currsize}/{url_memo.maxsize})")
+    
+    # Schon in früheren Briefings versendete Artikel weglassen bzw. kennzeichnen
+    think_tank_data = filter_seen_articles(think_tank_data)
+
+    # Artikel des Tages in den BM25-Index aufnehmen, bewerten und auf das Briefing-Budget kürzen
+    relevance_scores = index_thinktank_articles(think_tank_data)
+    think_tank_data = select_briefing_articles(think_tank_data, relevance_scores)
+
+    # Entitäten taggen (Tagesindex Entität → Artikel)
+    entity_counts = index_article_entities(think_tank_data)
+    trends = update_trending(think_tank_data)
+
+    # Generiere dynamisches Briefing: nach Think Tank (Reihenfolge aus thinktanks.json) oder nach Thema
+    if BRIEFING_VIEW == "topic":
+        briefing = build_topic_briefing(cluster_topics(think_tank_data, relevance_scores), entity_counts, trends)
+    else:
+        briefing = build_dynamic_briefing(think_tank_data, entity_counts, trends)
 
-    # Konvertiere zu HTML
-    html_lines = []
-    for line in briefing:
-        html_line = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', r'<a href="\2">\1</a>', line)
-        html_lines.append(html_line)
+    # Konvertiere zu HTML (Artikel werden erst hier gerendert, Titel/URLs escaped)
+    html_lines = [line.to_html() if isinstance(line, Article) else line for line in briefing]
     
     # HTML zusammenbauen
     html_content = ""
@@ -4095,14 +3917,17 @@ def main():
                 html_content += "<br>\n"
     
     # E-Mail senden
-    send_email("Think Tanks Briefing", html_content, email_user, email_password)
-    logger.info("E-Mail erfolgreich versendet")
+    if send_email("Think Tanks Briefing", html_content, email_user, email_password):
+        logger.info("E-Mail erfolgreich versendet")
+        mark_sent_articles(think_tank_data)
+    else:
+        logger.warning("E-Mail nicht versendet - Artikel werden nicht als versendet gemerkt")
     
     # Vorschau auf Konsole
     print("\n" + "="*50)
     print("VORSCHAU DER E-MAIL:")
     print("="*50)
-    print("\n".join(briefing))
+    print("\n".join(line.to_markdown() if isinstance(line, Article) else line for line in briefing))
     print("="*50 + "\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+"""
+Einheitliche Normalisierung von Artikeltiteln für Anzeige und Deduplizierung.
+
+clean() liefert den Anzeigetitel: Unicode NFKC (Vollbreite-Zeichen,
+Ligaturen), Leerraum zusammengefasst, quellenspezifische und globale
+Präfixe/Suffixe entfernt (z.B. "MERICS China Essentials: "). Die Präfixe
+stehen in config/title_prefixes.json und werden pro Quelle einmal zu einer
+Regex in Trie-Form kompiliert (Suffixe als Trie über die umgedrehten
+Zeichenketten) – ein Treffer kostet einen Regex-Aufruf statt einer Schleife.
+
+key() ist der Vergleichsschlüssel: clean() plus casefold und
+Satzzeichen-Faltung ("China’s" == "China's" == "Chinas", "US–China" ==
+"US-China" == "us china"). Beide Ergebnisse werden pro Rohtitel gecacht.
+"""
+import functools
+import hashlib
+import json
+import re
+import unicodedata
+
+from keyword_matcher import trie_pattern
+
+TITLE_CACHE_SIZE = 8192
+GLOBAL_SOURCE = "*"
+
+_WHITESPACE = re.compile(r"\s+")
+_APOSTROPHES = str.maketrans("", "", "'’‘‛`´")
+
+
+def _collapse(text):
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def _fold_punctuation(text):
+    text = text.translate(_APOSTROPHES)
+    return "".join(" " if unicodedata.category(char).startswith("P") else char for char in text)
+
+
+class TitleNormalizer:
+    """
+    path: JSON {Quelle: {"prefixes": [...], "suffixes": [...]}}, "*" gilt für alle Quellen.
+    version ändert sich mit der Konfiguration (für Parser-Cache-Versionen).
+    """
+
+    def __init__(self, path=None, cache_size=TITLE_CACHE_SIZE):
+        self.path = path
+        config = {}
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                config = {source: rules for source, rules in json.load(f).items() if not source.startswith("_")}
+        self.version = hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self._prefixes = {}
+        self._suffixes = {}
+        for source, rules in config.items():
+            prefixes = [_collapse(prefix) + (" " if prefix.endswith(" ") else "") for prefix in rules.get("prefixes", [])]
+            suffixes = [(" " if suffix.startswith(" ") else "") + _collapse(suffix) for suffix in rules.get("suffixes", [])]
+            if prefixes:
+                self._prefixes[source] = re.compile(trie_pattern(prefixes))
+            if suffixes:
+                self._suffixes[source] = re.compile(trie_pattern([suffix[::-1] for suffix in suffixes]))
+        self.clean = functools.lru_cache(maxsize=cache_size)(self._clean)
+        self.key = functools.lru_cache(maxsize=cache_size)(self._key)
+
+    @staticmethod
+    def _strip(text, pattern):
+        if pattern is None:
+            return text
+        match = pattern.match(text)
+        return text[match.end():] if match and match.end() < len(text) else text
+
+    def _strip_affixes(self, title, source):
+        for scope in (source, GLOBAL_SOURCE):
+            title = self._strip(title, self._prefixes.get(scope))
+        for scope in (source, GLOBAL_SOURCE):
+            title = self._strip(title[::-1], self._suffixes.get(scope))[::-1]
+        return title.strip()
+
+    def _clean(self, title, source=None):
+        """Anzeigetitel (NFKC, Leerraum, Präfixe/Suffixe der Quelle und globale)."""
+        return self._strip_affixes(_collapse(title), source)
+
+    def _key(self, title, source=None):
+        """Vergleichsschlüssel für Deduplizierung und Versand-Gedächtnis."""
+        return " ".join(_fold_punctuation(self.clean(title, source).casefold()).split())
@@ -0,0 +1,174 @@
+"""
+Themen-Cluster der Artikel eines Tages (optionale Ansicht "nach Thema").
+
+Jeder Titel wird zu einem dünn besetzten TF-IDF-Vektor (Terme wie im
+BM25-Index, IDF aus der Historie des Index, L2-normiert). Geclustert wird in
+einem Durchlauf nach dem Leader-Verfahren: Jeder Artikel geht – in
+Relevanz-Reihenfolge – in den ähnlichsten Cluster (Kosinus zum Zentroid über
+einer Schwelle) oder eröffnet einen neuen. Die Skalarprodukte laufen über einen
+invertierten Index Term → Cluster, berührt werden also nur Cluster mit
+gemeinsamen Termen; für einige hundert Titel sind das Millisekunden.
+
+Beschriftet wird ein Cluster mit den Termen, die im Zentroid am schwersten
+wiegen und in mindestens zwei Titeln vorkommen. Das Ergebnis wird pro
+Artikelmenge (Dokument-IDs) gespeichert; ein erneuter Lauf mit denselben
+Artikeln (z.B. nur das Rendern) clustert nicht noch einmal.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+
+from bm25_index import document_id, terms
+from keyword_matcher import tokenize
+from trending import TREND_STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+TOPIC_CLUSTER_FORMAT = 1
+TOPIC_SIMILARITY = 0.3   # Kosinus zum Zentroid, ab dem ein Titel in einen Cluster geht
+TOPIC_LABEL_TERMS = 3    # so viele Terme stehen höchstens im Cluster-Namen
+TOPIC_MIN_SIZE = 2       # kleinere Cluster landen unter "Weitere Themen"
+
+
+def title_terms(title):
+    """[(Term, Schreibweise)] eines Titels ohne Funktionswörter und Kürzel (≤ 2 Zeichen)."""
+    return [
+        (term, token)
+        for token, term in zip(tokenize(title)[0], terms(title))
+        if len(term) > 2 and term not in TREND_STOPWORDS
+    ]
+
+
+def tfidf_vector(title, idf):
+    """Dünn besetzter, L2-normierter TF-IDF-Vektor {Term: Gewicht}."""
+    vector = {}
+    for term, _ in title_terms(title):
+        vector[term] = vector.get(term, 0.0) + 1.0
+    for term in vector:
+        vector[term] *= idf(term)
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+class TopicClusterer:
+    """
+    path: JSON-Datei für das zuletzt berechnete Clustering (None = kein Cache).
+    idf: Funktion Term → IDF (Standard: 1.0, also reine Term-Häufigkeit).
+    cluster() nimmt Titel in Relevanz-Reihenfolge und liefert [(Name, [Indizes])],
+    größte Cluster zuerst; die Indizes verweisen auf die übergebenen Titel.
+    """
+
+    def __init__(self, path=None, idf=None, threshold=TOPIC_SIMILARITY,
+                 label_terms=TOPIC_LABEL_TERMS, min_size=TOPIC_MIN_SIZE):
+        self.path = path
+        self.idf = idf or (lambda term: 1.0)
+        self.threshold = threshold
+        self.label_terms = label_terms
+        self.min_size = min_size
+
+    # --- Cache --------------------------------------------------------------
+    def _signature(self, doc_ids):
+        settings = f"{TOPIC_CLUSTER_FORMAT}|{self.threshold}|{self.label_terms}|{self.min_size}"
+        return hashlib.sha1((settings + "|" + "|".join(doc_ids)).encode("utf-8")).hexdigest()[:16]
+
+    def _load(self, signature):
+        if not self.path:
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Themen-Cluster-Cache unlesbar: {str(e)}")
+            return None
+        if data.get("format") != TOPIC_CLUSTER_FORMAT or data.get("signature") != signature:
+            return None
+        return [(cluster["label"], cluster["members"]) for cluster in data.get("clusters", [])]
+
+    def _save(self, signature, clusters):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format": TOPIC_CLUSTER_FORMAT,
+                    "signature": signature,
+                    "clusters": [{"label": label, "members": members} for label, members in clusters],
+                }, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern der Themen-Cluster: {str(e)}")
+
+    # --- Clustering ---------------------------------------------------------
+    def cluster(self, titles):
+        doc_ids = [document_id(title) for title in titles]
+        signature = self._signature(doc_ids)
+        clusters = self._load(signature)
+        if clusters is not None:
+            logger.info(f"Themen-Cluster aus dem Cache: {len(clusters)} Cluster")
+            return clusters
+        clusters = self._cluster(titles)
+        self._save(signature, clusters)
+        return clusters
+
+    def _cluster(self, titles):
+        centroids = []   # {Term: Summe der Gewichte}
+        norms = []
+        members = []
+        postings = {}    # Term → Cluster mit diesem Term im Zentroid
+        unclustered = []
+
+        for index, title in enumerate(titles):
+            vector = tfidf_vector(title, self.idf)
+            if not vector:
+                unclustered.append(index)
+                continue
+            dots = {}
+            for term, weight in vector.items():
+                for cluster in postings.get(term, ()):
+                    dots[cluster] = dots.get(cluster, 0.0) + weight * centroids[cluster][term]
+            best, best_similarity = None, self.threshold
+            for cluster, dot in dots.items():
+                similarity = dot / norms[cluster]
+                if similarity >= best_similarity:
+                    best, best_similarity = cluster, similarity
+            if best is None:
+                best = len(centroids)
+                centroids.append({})
+                norms.append(0.0)
+                members.append([])
+            centroid = centroids[best]
+            for term, weight in vector.items():
+                if term not in centroid:
+                    postings.setdefault(term, []).append(best)
+                centroid[term] = centroid.get(term, 0.0) + weight
+            norms[best] = math.sqrt(sum(weight * weight for weight in centroid.values()))
+            members[best].append(index)
+
+        clusters = []
+        for cluster, indices in enumerate(members):
+            if len(indices) < self.min_size:
+                unclustered.extend(indices)
+                continue
+            clusters.append((self._label([titles[i] for i in indices], centroids[cluster]), indices))
+        clusters.sort(key=lambda item: len(item[1]), reverse=True)
+        if unclustered:
+            clusters.append((None, sorted(unclustered)))
+        return clusters
+
+    def _label(self, titles, centroid):
+        """Cluster-Name aus den schwersten gemeinsamen Termen (Schreibweise wie im Titel)."""
+        counts = {}
+        spellings = {}
+        for title in titles:
+            for term, token in set(title_terms(title)):
+                counts[term] = counts.get(term, 0) + 1
+                spellings.setdefault(term, token)
+        shared = [term for term in centroid if counts.get(term, 0) >= 2] or list(centroid)
+        top = sorted(shared, key=lambda term: (-centroid[term], term))[:self.label_terms]
+        return " · ".join(spellings.get(term, term).capitalize() for term in top)
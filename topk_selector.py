@@ -0,0 +1,97 @@
+"""
+Streaming-Top-K über mehrere Abschnitte (Quellen/Newsletter) mit Briefing-Budget.
+
+Artikel werden beim Entstehen angeboten; der Selector hält pro Abschnitt und
+global je einen Min-Heap der besten Einträge. Wer die aktuelle Schwelle nicht
+schlägt, wird sofort verworfen – accepts() lässt sich deshalb VOR teuren
+Schritten (URL auflösen, rendern) aufrufen. Bei gleichem Score bleibt der
+früher angebotene Artikel.
+"""
+import heapq
+import itertools
+
+
+class TopKSelector:
+    """
+    limit: höchstens so viele Artikel insgesamt (None = unbegrenzt).
+    section_limit: höchstens so viele pro Abschnitt (None = unbegrenzt);
+    section_limits überschreibt das für einzelne Abschnitte.
+    Scores müssen nur vergleichbar sein (Zahl oder Tupel).
+    """
+
+    def __init__(self, limit=None, section_limit=None, section_limits=None):
+        self.limit = limit
+        self.section_limit = section_limit
+        self.section_limits = dict(section_limits or {})
+        self._global = []         # Min-Heap über alle Einträge
+        self._sections = {}       # Abschnitt → Min-Heap
+        self._size = 0            # lebende Einträge global
+        self._section_sizes = {}  # lebende Einträge pro Abschnitt
+        self._counter = itertools.count()
+        self.offered = 0
+        self.discarded = 0
+
+    def _limit_for(self, section):
+        return self.section_limits.get(section, self.section_limit)
+
+    @staticmethod
+    def _prune(heap):
+        # Verdrängte Einträge werden lazy aus dem jeweils anderen Heap entfernt
+        while heap and not heap[0][4]:
+            heapq.heappop(heap)
+
+    def _beats(self, score, heap, size, limit):
+        if limit is None or size < limit:
+            return True
+        self._prune(heap)
+        return limit > 0 and score > heap[0][0]
+
+    def accepts(self, section, score):
+        """Würde ein Artikel mit diesem Score jetzt aufgenommen?"""
+        return (self._beats(score, self._sections.get(section, []), self._section_sizes.get(section, 0),
+                            self._limit_for(section))
+                and self._beats(score, self._global, self._size, self.limit))
+
+    def _evict(self, heap):
+        """Entfernt den schwächsten lebenden Eintrag eines Heaps (global und im Abschnitt)."""
+        self._prune(heap)
+        entry = heapq.heappop(heap)
+        entry[4] = False
+        self._size -= 1
+        self._section_sizes[entry[2]] -= 1
+        self.discarded += 1
+
+    def offer(self, section, score, item):
+        """Bietet einen Artikel an; True, wenn er (vorerst) im Top-K ist."""
+        self.offered += 1
+        if not self.accepts(section, score):
+            self.discarded += 1
+            return False
+        # [Score, -Reihenfolge, Abschnitt, Artikel, lebt]: bei Gleichstand fliegt der spätere zuerst
+        entry = [score, -next(self._counter), section, item, True]
+        section_heap = self._sections.setdefault(section, [])
+        heapq.heappush(section_heap, entry)
+        heapq.heappush(self._global, entry)
+        self._size += 1
+        self._section_sizes[section] = self._section_sizes.get(section, 0) + 1
+        section_limit = self._limit_for(section)
+        if section_limit is not None and self._section_sizes[section] > section_limit:
+            self._evict(section_heap)
+        if self.limit is not None and self._size > self.limit:
+            self._evict(self._global)
+        return entry[4]
+
+    def _live(self):
+        return [entry for entry in self._global if entry[4]]
+
+    def ranked(self):
+        """Alle ausgewählten Artikel, bester zuerst: [(Abschnitt, Score, Artikel)]."""
+        entries = sorted(self._live(), key=lambda entry: (entry[0], entry[1]), reverse=True)
+        return [(entry[2], entry[0], entry[3]) for entry in entries]
+
+    def by_section(self):
+        """Ausgewählte Artikel je Abschnitt in Angebots-Reihenfolge: {Abschnitt: [Artikel]}."""
+        sections = {}
+        for entry in sorted(self._live(), key=lambda entry: entry[1], reverse=True):
+            sections.setdefault(entry[2], []).append(entry[3])
+        return sections
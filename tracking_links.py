@@ -0,0 +1,147 @@
+"""
+Tracking-Links (Brookings connect.brookings.edu, HubSpot, Mailchimp, ...) → Ziel-URL.
+
+Tracking-Links sind pro Newsletter-Versand eindeutig; derselbe Artikel hat in
+zwei Newslettern zwei verschiedene Links und ist über die URL allein nicht
+als Duplikat zu erkennen. TrackingResolver hält eine persistente Zuordnung
+Tracking-Link → kanonische Ziel-URL. Aufgelöst (HTTP-Redirects verfolgt)
+wird nur auf Anfrage – die Deduplizierung fragt erst, wenn zwei Kandidaten
+über den Titel kollidieren; alle anderen Links bleiben unaufgelöst.
+"""
+import json
+import logging
+import os
+import urllib.parse
+from datetime import datetime, timedelta
+
+import requests
+
+from url_canonicalizer import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+TRACKING_LINKS_FORMAT = 2  # 2: Schlüssel mit vollständiger Query (link_key)
+TRACKING_LINK_DAYS = 90      # so lange bleibt eine Zuordnung gespeichert
+TRACKING_TIMEOUT = 5
+# Hosts (oder Domain-Suffixe) von Klick-Tracking-Diensten der Newsletter
+TRACKING_HOSTS = (
+    "connect.brookings.edu",
+    "hubspotlinks.com",
+    "hubspotemail.net",
+    "list-manage.com",
+    "link.cfr.org",
+    "clicks.mlsend.com",
+    "pardot.csis.org",
+    "mkt.dynamics.com",
+)
+
+
+def _host(url):
+    return url.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0].lower()
+
+
+def is_tracking_url(url):
+    host = _host(url)
+    return any(host == domain or host.endswith("." + domain) for domain in TRACKING_HOSTS)
+
+
+def link_key(url):
+    """
+    Schlüssel eines Tracking-Links in der Zuordnung: kanonische URL plus die
+    VOLLSTÄNDIGE Query. canonicalize_url() verwirft Query-Parameter, bei
+    manchen Diensten (Dynamics: msdynmkt_target) steht das Ziel aber nur dort.
+    """
+    url = url.strip()
+    query = urllib.parse.urlsplit(url).query
+    return canonicalize_url(url) + ("?" + query if query else "")
+
+
+def follow_redirects(url):
+    """Ziel-URL nach allen Redirects (None bei Fehler); HEAD zuerst, GET falls der Server HEAD ablehnt."""
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=TRACKING_TIMEOUT)
+        if response.status_code >= 400:
+            response = requests.get(url, allow_redirects=True, timeout=TRACKING_TIMEOUT, stream=True)
+            response.close()
+        if response.status_code >= 400:
+            return None
+        return response.url
+    except Exception as e:
+        logger.warning(f"Tracking-Link nicht auflösbar {url[:80]}: {str(e)}")
+        return None
+
+
+class TrackingResolver:
+    """
+    Persistente Zuordnung als JSON: {link_key(Tracking-Link): [kanonische Ziel-URL, Tag]}.
+    resolve: Funktion URL → Ziel-URL oder None (Standard: follow_redirects).
+    """
+
+    def __init__(self, path=None, resolve=follow_redirects, days=TRACKING_LINK_DAYS):
+        self.path = path
+        self.resolve = resolve
+        self.days = days
+        self.links = {}
+        self._failed = set()  # in diesem Lauf nicht auflösbar, nicht erneut versuchen
+        self._dirty = False
+        self.hits = 0
+        self.resolved = 0
+        self.load()
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Tracking-Link-Zuordnung unlesbar, starte leer: {str(e)}")
+            return
+        if data.get("format") == TRACKING_LINKS_FORMAT:
+            self.links = data.get("links", {})
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.days)).strftime("%Y-%m-%d")
+        self.links = {link: entry for link, entry in self.links.items() if entry[1] >= cutoff}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": TRACKING_LINKS_FORMAT, "links": self.links}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            logger.info(f"Tracking-Links: {self.resolved} aufgelöst, {self.hits} aus der Zuordnung, {len(self.links)} gespeichert")
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern der Tracking-Link-Zuordnung: {str(e)}")
+
+    def known(self, url):
+        """Bereits bekannte Ziel-URL eines Tracking-Links (ohne Netzwerkzugriff), sonst None."""
+        entry = self.links.get(link_key(url))
+        if entry is None:
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def destination(self, url):
+        """Kanonische Ziel-URL eines Tracking-Links; löst bei Bedarf auf. None, wenn nicht auflösbar."""
+        key = link_key(url)
+        entry = self.links.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[0]
+        if key in self._failed:
+            return None
+        final_url = self.resolve(url)
+        if not final_url:
+            self._failed.add(key)
+            return None
+        destination = canonicalize_url(final_url)
+        self.links[key] = [destination, datetime.now().strftime("%Y-%m-%d")]
+        self.resolved += 1
+        self._dirty = True
+        logger.info(f"Tracking-Link aufgelöst: {url[:60]} → {destination[:80]}")
+        return destination
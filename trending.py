@@ -0,0 +1,169 @@
+"""
+Trend-Erkennung über zeitlich abklingende Zähler für Terme und Entitäten.
+
+Jeder Schlüssel ("term:tariff", "entity:PBoC") hat zwei exponentiell
+abklingende Zähler – einen schnellen (Halbwertszeit Tage) und einen langsamen
+(Wochen). Das Abklingen wird erst beim nächsten Zugriff nachgeholt, ein Lauf
+berührt also nur die Schlüssel seiner neuen Artikel: O(neue Artikel), egal wie
+lang die Historie ist. "Heiß" ist ein Schlüssel, dessen kurzfristige Rate
+deutlich über seiner langfristigen liegt.
+"""
+import json
+import logging
+import math
+import os
+import time
+
+from bm25_index import document_id, terms
+from keyword_matcher import tokenize
+
+logger = logging.getLogger(__name__)
+
+TRENDING_FORMAT = 1
+TREND_HALF_LIVES = (2.0, 14.0)  # Tage: schneller / langsamer Zähler
+TREND_MIN_RECENT = 2.0          # so viele (abgeklungene) Nennungen braucht ein Trend mindestens
+TREND_PRIOR = 0.1               # Nennungen/Tag, dämpft Schlüssel ohne Vorgeschichte
+TREND_PRUNE_BELOW = 0.05        # Schlüssel mit kleinerem langsamen Zähler werden entfernt
+TREND_SEEN_DAYS = 30            # so lange wird ein Artikel nicht erneut gezählt
+TREND_STOPWORDS = {
+    "a", "about", "after", "against", "amid", "an", "and", "are", "as", "at", "be", "between", "by",
+    "can", "could", "does", "for", "from", "has", "have", "how", "in", "into", "is", "it", "its",
+    "new", "not", "of", "on", "or", "over", "say", "than", "that", "the", "their", "this", "to",
+    "under", "up", "us", "what", "when", "where", "which", "who", "why", "will", "with", "would",
+}
+
+
+def _decay(value, days, half_life):
+    return value * math.pow(0.5, days / half_life) if days > 0 else value
+
+
+class TrendingCounters:
+    """
+    Kompakter Speicher als JSON: {Schlüssel: [schnell, langsam, Stand (Tage seit Epoche)]},
+    die zuletzt gesehene Schreibweise je Term (gezählt wird ohne Plural-s) und
+    die IDs bereits gezählter Artikel (damit dieselbe Schlagzeile an mehreren
+    Tagen nur einmal zählt).
+    """
+
+    def __init__(self, path=None, half_lives=TREND_HALF_LIVES):
+        self.path = path
+        self.half_lives = tuple(half_lives)
+        self.counters = {}
+        self.labels = {}
+        self.seen = {}
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def now():
+        return time.time() / 86400
+
+    # --- Datei --------------------------------------------------------------
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Trend-Zähler unlesbar, starte leer: {str(e)}")
+            return
+        if data.get("format") != TRENDING_FORMAT or tuple(data.get("half_lives", ())) != self.half_lives:
+            logger.info("Trend-Zähler mit anderem Format/anderen Halbwertszeiten, starte leer")
+            return
+        self.counters = data.get("counters", {})
+        self.labels = data.get("labels", {})
+        self.seen = data.get("seen", {})
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        now = self.now()
+        slow_half_life = self.half_lives[1]
+        self.counters = {
+            key: counter for key, counter in self.counters.items()
+            if _decay(counter[1], now - counter[2], slow_half_life) >= TREND_PRUNE_BELOW
+        }
+        self.labels = {key: label for key, label in self.labels.items() if key in self.counters}
+        self.seen = {doc_id: day for doc_id, day in self.seen.items() if now - day <= TREND_SEEN_DAYS}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format": TRENDING_FORMAT,
+                    "half_lives": self.half_lives,
+                    "counters": {key: [round(fast, 4), round(slow, 4), round(day, 4)]
+                                 for key, (fast, slow, day) in self.counters.items()},
+                    "labels": self.labels,
+                    "seen": {doc_id: round(day, 2) for doc_id, day in self.seen.items()},
+                }, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Fehler beim Speichern der Trend-Zähler: {str(e)}")
+
+    # --- Zählen -------------------------------------------------------------
+    def increment(self, key, amount=1.0, now=None):
+        now = self.now() if now is None else now
+        fast_half_life, slow_half_life = self.half_lives
+        fast, slow, day = self.counters.get(key, (0.0, 0.0, now))
+        self.counters[key] = [
+            _decay(fast, now - day, fast_half_life) + amount,
+            _decay(slow, now - day, slow_half_life) + amount,
+            now,
+        ]
+        self._dirty = True
+
+    def add_item(self, title, entities=(), now=None):
+        """Zählt die Terme und Entitäten eines Artikels (einmal pro Artikel). Rückgabe: True, wenn neu."""
+        now = self.now() if now is None else now
+        doc_id = document_id(title)
+        if doc_id in self.seen:
+            return False
+        self.seen[doc_id] = now
+        keys = set()
+        for token, term in zip(tokenize(title)[0], terms(title)):
+            if len(term) > 2 and term not in TREND_STOPWORDS:
+                key = f"term:{term}"
+                keys.add(key)
+                if token != term:
+                    self.labels[key] = token
+                else:
+                    self.labels.pop(key, None)
+        keys.update(f"entity:{entity}" for entity in entities)
+        for key in keys:
+            self.increment(key, now=now)
+        return True
+
+    # --- Auswerten ----------------------------------------------------------
+    def heat(self, key, now=None):
+        """Kurzfristige Rate / langfristige Rate (beide in Nennungen pro Tag)."""
+        now = self.now() if now is None else now
+        fast_half_life, slow_half_life = self.half_lives
+        fast, slow, day = self.counters[key]
+        fast = _decay(fast, now - day, fast_half_life)
+        slow = _decay(slow, now - day, slow_half_life)
+        if fast < TREND_MIN_RECENT:
+            return 0.0
+        fast_rate = fast * math.log(2) / fast_half_life
+        slow_rate = slow * math.log(2) / slow_half_life
+        return fast_rate / (slow_rate + TREND_PRIOR)
+
+    def label(self, key):
+        """Anzeigename eines Schlüssels ("term:tariff" → "tariffs", "entity:PBoC" → "PBoC")."""
+        return self.labels.get(key, key.split(":", 1)[1])
+
+    def trending(self, limit=10, prefix=None, min_heat=1.5, now=None):
+        """[(Schlüssel, Heat)] der heißesten Schlüssel, optional nur "term:" oder "entity:"."""
+        now = self.now() if now is None else now
+        scored = [
+            (key, self.heat(key, now))
+            for key in self.counters
+            if prefix is None or key.startswith(prefix)
+        ]
+        scored = [(key, heat) for key, heat in scored if heat >= min_heat]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
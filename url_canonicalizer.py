@@ -0,0 +1,60 @@
+"""
+Einheitliche URL-Kanonisierung für die Deduplizierung (thinktanks.py, nikkei_test.py).
+
+Regeln:
+- Schema und Host klein, Standard-Ports (:80/:443) entfernt
+- Fragment (#...) entfernt, Schrägstrich am Pfadende entfernt ("/a/" == "/a")
+- Query-Parameter (utm_*, Mailchimp-u/e, HubSpot-_hsenc, ...) werden verworfen;
+  nur bei Hosts, deren Query den Artikel identifiziert, bleiben genau diese
+  Parameter (Mailchimp "id", YouTube "v", Dynamics "msdynmkt_target") in fester Reihenfolge erhalten
+
+Dieselben URLs werden pro Lauf viele Male kanonisiert (Parser, Fetcher,
+Deduplizierung, Versand-Gedächtnis) – das Ergebnis wird in einem begrenzten
+LRU-Memo gehalten.
+"""
+import functools
+import urllib.parse
+
+CANONICAL_URL_CACHE_SIZE = 4096
+
+# Host (oder Domain-Suffix) → Query-Parameter, die den Artikel identifizieren
+QUERY_IDENTITY_PARAMS = {
+    "list-manage.com": ("id",),   # Mailchimp: id = Artikel, u/e = Empfänger
+    "youtube.com": ("v",),
+    "mkt.dynamics.com": ("msdynmkt_target",),  # Dynamics-Tracking: Ziel nur im Query
+}
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _identity_params(host):
+    for domain, params in QUERY_IDENTITY_PARAMS.items():
+        if host == domain or host.endswith("." + domain):
+            return params
+    return ()
+
+
+@functools.lru_cache(maxsize=CANONICAL_URL_CACHE_SIZE)
+def canonicalize_url(url):
+    """Kanonische Form einer URL; Nicht-HTTP-Werte (mailto:, leere Strings) bleiben unverändert."""
+    url = url.strip()
+    try:
+        parsed = urllib.parse.urlsplit(url)
+        port = parsed.port
+    except ValueError:
+        return url
+    scheme = parsed.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parsed.hostname:
+        return url
+
+    host = parsed.hostname.lower()
+    netloc = host if port is None or port == _DEFAULT_PORTS[scheme] else f"{host}:{port}"
+    path = parsed.path.rstrip("/")
+
+    query = ""
+    keep = _identity_params(host)
+    if keep and parsed.query:
+        params = urllib.parse.parse_qs(parsed.query)
+        query = urllib.parse.urlencode([(name, params[name][0]) for name in keep if name in params])
+
+    return urllib.parse.urlunsplit((scheme, netloc, path, query, ""))